@@ -0,0 +1,73 @@
+"""
+Compares the text normalizer used for VTEX products with the previous
+DataProcessor.clean_text implementation on VTEX-like titles and descriptions.
+
+Usage: python contrib/benchmark_text_normalizer.py [iterations]
+"""
+
+import os
+import re
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from marketplace.services.vtex.utils.text_normalizer import (  # noqa: E402
+    normalize_text,
+    normalize_texts,
+)
+
+
+def legacy_clean_text(text: str) -> str:
+    text = re.sub(r"<[^>]*>", "", text)
+    text = text.replace('"', "").replace("'", " ")
+    text = re.sub(r"\r\n|\r|\n", "\n", text)
+    text = re.sub(r"[ \t]+", " ", text.strip())
+    text = text.replace("•", "")
+    text = re.sub(r"\.(?=[^\s\n])", ". ", text)
+    return text
+
+
+TITLES = [
+    "Arroz Branco Tipo 1 Camil 5Kg",
+    "Refrigerante Coca-Cola Original 2L",
+    "Geladeira Frost Free Brastemp 375 Litros Inox 220V",
+    "Sabão Em Pó Omo Lavagem Perfeita 1,6Kg",
+]
+
+DESCRIPTIONS = [
+    "<p>O <strong>Arroz Branco Tipo 1</strong> é ideal para o dia a dia.</p>"
+    "<ul><li>• Grãos selecionados</li><li>• Rende mais</li></ul>"
+    "<p>Modo de preparo:\r\nRefogue o arroz.Adicione água fervente.</p>",
+    "Refrigerante sabor cola.\r\nContém cafeína.NÃO CONTÉM GLÚTEN.",
+    "<div><h3>Características</h3><p>Capacidade total: 375 litros."
+    "<br>Tecnologia Frost Free, que dispensa o degelo.</p>"
+    '<p>Painel "Eletrônico" com controle de temperatura.</p>'
+    "<table><tr><td>Voltagem</td><td>220V</td></tr></table></div>",
+    "Omo Lavagem Perfeita remove as manchas já na primeira lavagem.   "
+    "Use a medida certa.\tNão misture com outros produtos.",
+]
+
+TEXTS = (TITLES + DESCRIPTIONS) * 250
+
+
+def main(iterations: int):
+    assert [legacy_clean_text(text) for text in TEXTS] == normalize_texts(TEXTS)
+
+    legacy = timeit.timeit(
+        lambda: [legacy_clean_text(text) for text in TEXTS], number=iterations
+    )
+    single = timeit.timeit(
+        lambda: [normalize_text(text) for text in TEXTS], number=iterations
+    )
+    batch = timeit.timeit(lambda: normalize_texts(TEXTS), number=iterations)
+
+    total = len(TEXTS) * iterations
+    print(f"{total} texts")
+    print(f"legacy clean_text: {legacy:.3f}s")
+    print(f"normalize_text:    {single:.3f}s ({legacy / single:.2f}x)")
+    print(f"normalize_texts:   {batch:.3f}s ({legacy / batch:.2f}x)")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 20)
@@ -0,0 +1,106 @@
+import logging
+import uuid
+
+from typing import Optional
+
+from django.conf import settings
+from django.core.cache import cache
+
+
+logger = logging.getLogger(__name__)
+
+
+class ProjectAuthorizationCache:
+    """
+    Caches the role of a user in a project, read by the permission checks of
+    every API request.
+
+    Roles are kept in the shared Django cache and memoized in the request, so
+    the checks of a request don't reach the cache more than once per project.
+
+    Role keys carry a version of the user and project, bumped when an
+    authorization is saved or deleted. A request that read the role before
+    the change and writes it to the cache afterwards writes it under the old
+    version, which is no longer read.
+    """
+
+    KEY = "project-authorization-role:{user_id}:{project_uuid}:{version}"
+    VERSION_KEY = "project-authorization-version:{user_id}:{project_uuid}"
+
+    # Stored for users without an authorization in the project
+    NO_AUTHORIZATION = -1
+
+    @classmethod
+    def get_role(cls, user, project_uuid) -> Optional[int]:
+        """Returns the role of the user in the project, or None without one."""
+        project_uuid = cls._normalize(project_uuid)
+        if project_uuid is None:
+            return None
+
+        version_key = cls.VERSION_KEY.format(user_id=user.pk, project_uuid=project_uuid)
+        version = cls._get(version_key, default=0)
+        key = cls.KEY.format(
+            user_id=user.pk, project_uuid=project_uuid, version=version
+        )
+        role = cls._get(key) if version is not None else None
+        if role is None:
+            authorization = user.authorizations.filter(project_uuid=project_uuid)
+            role = authorization.values_list("role", flat=True).first()
+            if role is None:
+                role = cls.NO_AUTHORIZATION
+            # Without the version, the role can't be cached safely
+            if version is not None:
+                cls._set(key, role)
+
+        return None if role == cls.NO_AUTHORIZATION else role
+
+    @classmethod
+    def get_request_role(cls, request, project_uuid) -> Optional[int]:
+        """Same as `get_role`, memoized for the lifetime of the request."""
+        roles = getattr(request, "_project_roles", None)
+        if roles is None:
+            roles = request._project_roles = {}
+
+        project_uuid = cls._normalize(project_uuid)
+        if project_uuid not in roles:
+            roles[project_uuid] = cls.get_role(request.user, project_uuid)
+        return roles[project_uuid]
+
+    @classmethod
+    def invalidate(cls, user_id: int, project_uuid):
+        project_uuid = cls._normalize(project_uuid)
+        if project_uuid is None:
+            return
+
+        # Version keys don't expire, an expired version would make the roles
+        # cached under its first values readable again
+        key = cls.VERSION_KEY.format(user_id=user_id, project_uuid=project_uuid)
+        try:
+            if not cache.add(key, 1, timeout=None):
+                cache.incr(key)
+        except Exception as e:
+            logger.warning(f"Error invalidating {key}: {e}")
+
+    @staticmethod
+    def _normalize(project_uuid) -> Optional[str]:
+        if not project_uuid:
+            return None
+        try:
+            return str(uuid.UUID(str(project_uuid)))
+        except ValueError:
+            return None
+
+    @staticmethod
+    def _get(key, default=None):
+        try:
+            return cache.get(key, default)
+        except Exception as e:
+            logger.warning(f"Error reading {key} from cache: {e}")
+            return None
+
+    @staticmethod
+    def _set(key, role):
+        try:
+            cache.set(key, role, timeout=settings.PROJECT_AUTHORIZATION_CACHE_TTL)
+        except Exception as e:
+            logger.warning(f"Error writing {key} to cache: {e}")
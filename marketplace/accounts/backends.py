@@ -1,22 +1,97 @@
 import json
+import threading
+import time
+
+from typing import Callable, Optional
+
+import requests
 
 from django.contrib.auth.models import Permission
 from django.contrib.contenttypes.models import ContentType
 from django.contrib.auth import get_user_model
+from django.core.exceptions import SuspiciousOperation
+from django.utils.encoding import force_bytes, smart_str
 from django_redis import get_redis_connection
 from django.conf import settings
 
+from josepy.errors import Error as JoseError
+from josepy.jws import JWS, Header
 from mozilla_django_oidc.auth import OIDCAuthenticationBackend
 
 
 User = get_user_model()
 
 
-class WeniOIDCAuthenticationBackend(OIDCAuthenticationBackend):  # pragma: no cover
+class JWKSCache:
+    """
+    Keeps the signing keys of the OIDC provider in process, by key id.
+
+    Keys are fetched again when they expire or when a token is signed with an
+    unknown key id, which happens when the provider rotates its keys. Unknown
+    key ids refetch the keys at most once every `min_refresh_interval` seconds.
+    """
+
+    min_refresh_interval = 60
+
+    def __init__(self):
+        self._keys = {}
+        self._expires_at = 0
+        self._refreshed_at = None
+        self._lock = threading.Lock()
+
+    def get_key(self, kid: Optional[str], fetch: Callable[[], dict], ttl: int):
+        with self._lock:
+            now = time.monotonic()
+            expired = now >= self._expires_at
+            if not expired and kid in self._keys:
+                return self._keys[kid]
+
+            can_refresh = (
+                expired
+                or self._refreshed_at is None
+                or now - self._refreshed_at >= self.min_refresh_interval
+            )
+            if can_refresh:
+                self._keys = {
+                    jwk.get("kid"): jwk
+                    for jwk in fetch().get("keys", [])
+                    if jwk.get("use", "sig") == "sig"
+                }
+                self._refreshed_at = now
+                self._expires_at = now + ttl
+
+            return self._keys.get(kid)
+
+    def clear(self):
+        with self._lock:
+            self._keys = {}
+            self._expires_at = 0
+            self._refreshed_at = None
+
+
+class WeniOIDCAuthenticationBackend(OIDCAuthenticationBackend):
     cache_token = settings.OIDC_CACHE_TOKEN
     cache_ttl = settings.OIDC_CACHE_TTL
 
+    jwks_cache = JWKSCache()
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.local_token_validation = settings.OIDC_LOCAL_TOKEN_VALIDATION
+        self.jwks_cache_ttl = settings.OIDC_JWKS_CACHE_TTL
+        self.token_issuer = settings.OIDC_TOKEN_ISSUER
+        self.token_audience = settings.OIDC_TOKEN_AUDIENCE
+        self.token_leeway = settings.OIDC_TOKEN_LEEWAY
+
     def get_userinfo(self, access_token, *args):
+        if self.local_token_validation:
+            claims = self.get_access_token_claims(access_token)
+            if claims is not None:
+                return claims
+
+        return self.get_remote_userinfo(access_token, *args)
+
+    def get_remote_userinfo(self, access_token, *args):  # pragma: no cover
         if not self.cache_token:
             return super().get_userinfo(access_token, *args)
 
@@ -31,7 +106,68 @@ class WeniOIDCAuthenticationBackend(OIDCAuthenticationBackend):  # pragma: no co
 
         return userinfo
 
-    def check_module_permission(self, claims, user) -> None:
+    def get_access_token_claims(self, access_token) -> Optional[dict]:
+        """
+        Validates a signed access token against the JWKS of the provider and
+        returns its claims, which are used in place of the userinfo.
+
+        Returns None when the token can't be validated locally, as opaque
+        tokens or tokens without the email used to find the user, for them
+        the userinfo endpoint is requested.
+        """
+        token = force_bytes(access_token)
+        try:
+            header = Header.json_loads(JWS.from_compact(token).signature.protected)
+        except (JoseError, ValueError):
+            return None
+
+        kid = smart_str(header.kid) if header.kid else None
+        key = self.jwks_cache.get_key(kid, self.retrieve_jwks, self.jwks_cache_ttl)
+        if key is None:
+            raise SuspiciousOperation("Could not find a valid JWKS.")
+
+        claims = json.loads(self._verify_jws(token, key).decode("utf-8"))
+        self.verify_access_token_claims(claims)
+
+        if not claims.get("email"):
+            return None
+        return claims
+
+    def verify_access_token_claims(self, claims: dict) -> None:
+        now = time.time()
+
+        expires_at = claims.get("exp")
+        if expires_at is None or now > expires_at + self.token_leeway:
+            raise SuspiciousOperation("Access token expired.")
+
+        not_before = claims.get("nbf")
+        if not_before is not None and now < not_before - self.token_leeway:
+            raise SuspiciousOperation("Access token not yet valid.")
+
+        if self.token_issuer and claims.get("iss") != self.token_issuer:
+            raise SuspiciousOperation("Access token issuer is not valid.")
+
+        if self.token_audience:
+            audience = claims.get("aud") or []
+            if isinstance(audience, str):
+                audience = [audience]
+            if (
+                self.token_audience not in audience
+                and claims.get("azp") != self.token_audience
+            ):
+                raise SuspiciousOperation("Access token audience is not valid.")
+
+    def retrieve_jwks(self) -> dict:  # pragma: no cover
+        response = requests.get(
+            self.OIDC_OP_JWKS_ENDPOINT,
+            verify=self.get_settings("OIDC_VERIFY_SSL", True),
+            timeout=self.get_settings("OIDC_TIMEOUT", None),
+            proxies=self.get_settings("OIDC_PROXY", None),
+        )
+        response.raise_for_status()
+        return response.json()
+
+    def check_module_permission(self, claims, user) -> None:  # pragma: no cover
         if claims.get("can_communicate_internally", False):
             content_type = ContentType.objects.get_for_model(User)
             permission, created = Permission.objects.get_or_create(
@@ -42,7 +178,7 @@ class WeniOIDCAuthenticationBackend(OIDCAuthenticationBackend):  # pragma: no co
             if not user.has_perm("authentication.can_communicate_internally"):
                 user.user_permissions.add(permission)
 
-    def filter_users_by_claims(self, claims):
+    def filter_users_by_claims(self, claims):  # pragma: no cover
         """Return all users matching the specified email."""
         email = claims.get("email")
         if not email:
@@ -51,7 +187,7 @@ class WeniOIDCAuthenticationBackend(OIDCAuthenticationBackend):  # pragma: no co
             first_name="", last_name=""
         )
 
-    def create_user(self, claims):
+    def create_user(self, claims):  # pragma: no cover
         email = claims.get("email")
 
         user, _ = self.UserModel.objects.get_or_create(email=email)
@@ -63,7 +199,7 @@ class WeniOIDCAuthenticationBackend(OIDCAuthenticationBackend):  # pragma: no co
 
         return user
 
-    def update_user(self, user, claims):
+    def update_user(self, user, claims):  # pragma: no cover
         user.email = claims.get("email", "")
         user.save()
 
@@ -1,27 +1,150 @@
+import threading
+import time
+
 import amqp
+from django.conf import settings
 from sentry_sdk import capture_exception
 
-from ..usecases import update_permission
 from marketplace.event_driven.parsers import JSONParser
 from marketplace.event_driven.consumers import EDAConsumer
+from marketplace.event_driven.signals import message_started, message_finished
+from ..usecases import update_permission, update_permissions
 
 
 class UpdatePermissionConsumer(EDAConsumer):
-    def consume(self, message: amqp.Message):  # pragma: no cover
+    """
+    Accumulates the permission events received during `window` seconds, or
+    until `batch_size` of them, and applies them together. Messages are only
+    acked once their batch is applied.
+
+    Batches are applied by a single flusher thread. The events of a user in a
+    project are consumed by the same worker (see `ordering_fields`), so they
+    are buffered, and replayed, in delivery order.
+
+    The broker delivers at most `prefetch_count` unacked events, so a batch
+    is closed once that many are pending, as no more would arrive until it
+    is applied. Its queue is consumed with that prefetch, which defaults to
+    `batch_size`.
+    """
+
+    ordering_fields = ("project", "user")
+
+    def __init__(
+        self, window: float = None, batch_size: int = None, prefetch_count: int = None
+    ):
+        self.window = settings.EDA_PERMISSION_BATCH_WINDOW if window is None else window
+        self.batch_size = (
+            settings.EDA_PERMISSION_BATCH_SIZE if batch_size is None else batch_size
+        )
+        self.prefetch_count = (
+            self.batch_size if prefetch_count is None else prefetch_count
+        )
+        self._condition = threading.Condition()
+        self._pending = []
+        self._flusher = None
+        self._closed = False
+
+    @property
+    def batch_limit(self) -> int:
+        return max(min(self.batch_size, self.prefetch_count), 1)
+
+    def consume(self, message: amqp.Message):
         print(f"[UpdatePermission] - Consuming a message. Body: {message.body}")
         try:
             body = JSONParser.parse(message.body)
+        except Exception as exception:
+            self.reject(message, exception)
+            return
+
+        with self._condition:
+            if self._closed:
+                # The message is redelivered, its connection was closed
+                return
+
+            self._pending.append((message, body))
+            if self._flusher is None:
+                self._flusher = threading.Thread(
+                    target=self._run_flusher, name="update-permission-flusher"
+                )
+                self._flusher.daemon = True
+                self._flusher.start()
+            self._condition.notify()
+
+    def _run_flusher(self):
+        while True:
+            with self._condition:
+                while not self._pending and not self._closed:
+                    self._condition.wait()
+
+                # The window starts with the first event of the batch
+                deadline = time.monotonic() + self.window
+                while len(self._pending) < self.batch_limit and not self._closed:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._condition.wait(remaining)
+
+                if self._closed:
+                    return
+
+            self.flush()
+
+    def close(self):
+        """
+        Stops the flusher thread. Pending events are dropped, they are not
+        acked, so the broker redelivers them on the next connection.
+        """
+        with self._condition:
+            self._closed = True
+            self._pending = []
+            self._condition.notify_all()
+            flusher = self._flusher
+
+        if flusher is not None and flusher is not threading.current_thread():
+            flusher.join()
 
+    def flush(self):
+        with self._condition:
+            pending, self._pending = self._pending, []
+
+        if not pending:
+            return
+
+        message_started.send(sender=self)
+        try:
+            self.apply(pending)
+        finally:
+            message_finished.send(sender=self)
+
+    def apply(self, pending: list):
+        try:
+            update_permissions([body for _, body in pending])
+        except Exception as exception:
+            capture_exception(exception)
+            print(
+                f"[UpdatePermission] - Batch failed, applying one by one: {exception}"
+            )
+            for message, body in pending:
+                self.apply_one(message, body)
+            return
+
+        for message, _ in pending:
+            message.channel.basic_ack(message.delivery_tag)
+
+    def apply_one(self, message: amqp.Message, body: dict):
+        try:
             update_permission(
                 project_uuid=body.get("project"),
                 action=body.get("action"),
                 user_email=body.get("user"),
                 role=body.get("role"),
             )
-
             message.channel.basic_ack(message.delivery_tag)
 
         except Exception as exception:
-            capture_exception(exception)
-            message.channel.basic_reject(message.delivery_tag, requeue=False)
-            print(f"[UpdatePermission] - Message rejected by: {exception}")
+            self.reject(message, exception)
+
+    def reject(self, message: amqp.Message, exception: Exception):
+        capture_exception(exception)
+        message.channel.basic_reject(message.delivery_tag, requeue=False)
+        print(f"[UpdatePermission] - Message rejected by: {exception}")
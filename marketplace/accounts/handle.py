@@ -1,9 +1,20 @@
 from amqp.channel import Channel
+from django.conf import settings
 
 from .consumers import UpdatePermissionConsumer
 
 
 def handle_consumers(channel: Channel) -> None:
+    # Enough unacked events are delivered to fill a batch
+    consumer = UpdatePermissionConsumer(
+        prefetch_count=max(
+            settings.EDA_PREFETCH_COUNT, settings.EDA_PERMISSION_BATCH_SIZE
+        )
+    )
     channel.basic_consume(
-        "integrations.update-permission", callback=UpdatePermissionConsumer().handle
+        "integrations.update-permission",
+        callback=consumer.handle,
+        ordering_key=consumer.ordering_key,
+        prefetch_count=consumer.prefetch_count,
+        on_close=consumer.close,
     )
@@ -1,6 +1,6 @@
 import uuid
 
-from django.db import models
+from django.db import models, transaction
 from django.conf import settings
 from django.db.models.fields import URLField
 from django.utils import timezone
@@ -10,6 +10,7 @@ from django.contrib.auth.models import PermissionsMixin
 from django.contrib.auth.models import UserManager as BaseUserManager
 
 from marketplace.core.models import BaseModel
+from marketplace.accounts.authorization_cache import ProjectAuthorizationCache
 
 
 class UserManager(BaseUserManager):
@@ -100,6 +101,24 @@ class ProjectAuthorization(models.Model):
     def __str__(self) -> str:
         return f"{self.user} - {self.project_uuid}"
 
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        self._invalidate_cached_role()
+
+    def delete(self, *args, **kwargs):
+        result = super().delete(*args, **kwargs)
+        self._invalidate_cached_role()
+        return result
+
+    def _invalidate_cached_role(self):
+        # Invalidated again after commit, as a concurrent request may cache
+        # the previous role before the transaction is committed
+        user_id, project_uuid = self.user_id, self.project_uuid
+        ProjectAuthorizationCache.invalidate(user_id, project_uuid)
+        transaction.on_commit(
+            lambda: ProjectAuthorizationCache.invalidate(user_id, project_uuid)
+        )
+
     def set_role(self, role: int):
         assert role in dict(self.ROLE_CHOICES), f"Role: {role} isn't valid!"
         self.role = role
@@ -2,6 +2,7 @@ from rest_framework import permissions
 from django.contrib.auth.models import AnonymousUser
 from django.conf import settings
 
+from .authorization_cache import ProjectAuthorizationCache
 from .models import ProjectAuthorization
 
 
@@ -9,6 +10,12 @@ WRITE_METHODS = ["POST"]
 MODIFY_METHODS = ["DELETE", "PATCH", "PUT"]
 READ_METHODS = ["GET"]
 
+CONTRIBUTOR_ROLES = (
+    ProjectAuthorization.ROLE_CONTRIBUTOR,
+    ProjectAuthorization.ROLE_ADMIN,
+)
+VIEWER_ROLES = (ProjectAuthorization.ROLE_VIEWER, *CONTRIBUTOR_ROLES)
+
 
 def is_crm_user(user):
     if not settings.ALLOW_CRM_ACCESS:
@@ -36,37 +43,28 @@ class ProjectManagePermission(permissions.IsAuthenticated):
             if project_uuid is None:
                 return False
 
-            try:
-                authorization = request.user.authorizations.get(
-                    project_uuid=project_uuid
-                )
-            except ProjectAuthorization.DoesNotExist:
+            role = ProjectAuthorizationCache.get_request_role(request, project_uuid)
+            if role is None:
                 if request.user.has_perm("accounts.can_communicate_internally"):
                     return True
                 return False
 
-            return authorization.is_contributor or authorization.is_admin
+            return role in CONTRIBUTOR_ROLES
 
         return True
 
     def has_object_permission(self, request, view, obj):
         if request.method not in WRITE_METHODS:
-            try:
-                project_uuid = self._get_project_uuid_from_object(obj)
-                authorization = request.user.authorizations.get(
-                    project_uuid=project_uuid
-                )
-                is_admin = authorization.is_admin
-                is_contributor = authorization.is_contributor
-                is_viewer = authorization.is_viewer
-            except ProjectAuthorization.DoesNotExist:
+            project_uuid = self._get_project_uuid_from_object(obj)
+            role = ProjectAuthorizationCache.get_request_role(request, project_uuid)
+            if role is None:
                 return False
 
             if request.method in MODIFY_METHODS:
-                return is_contributor or is_admin
+                return role in CONTRIBUTOR_ROLES
 
             if request.method in READ_METHODS:
-                return is_viewer or is_contributor or is_admin
+                return role in VIEWER_ROLES
 
         return True
 
@@ -85,17 +83,8 @@ class ProjectViewPermission(permissions.BasePermission):
     def has_object_permission(self, request, view, obj) -> bool:
         if isinstance(request.user, AnonymousUser):
             return False
-        try:
-            authorization = request.user.authorizations.get(
-                project_uuid=obj.project_uuid
-            )
-        except ProjectAuthorization.DoesNotExist:
-            return False
-        return (
-            authorization.is_viewer
-            or authorization.is_contributor
-            or authorization.is_admin
-        )
+        role = ProjectAuthorizationCache.get_request_role(request, obj.project_uuid)
+        return role in VIEWER_ROLES
 
 
 class IsCRMUser(permissions.IsAuthenticated):
@@ -0,0 +1,104 @@
+import uuid
+
+from unittest.mock import Mock, patch
+
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+
+from marketplace.accounts.authorization_cache import ProjectAuthorizationCache
+from marketplace.accounts.models import ProjectAuthorization, User
+
+
+@override_settings(
+    CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+)
+class ProjectAuthorizationCacheTestCase(TestCase):
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        self.user = User.objects.create_user(email="user@marketplace.ai")
+        self.project_uuid = str(uuid.uuid4())
+        self.authorization = self.user.authorizations.create(
+            project_uuid=self.project_uuid, role=ProjectAuthorization.ROLE_VIEWER
+        )
+
+    def test_role_is_cached(self):
+        with self.assertNumQueries(1):
+            role = ProjectAuthorizationCache.get_role(self.user, self.project_uuid)
+        self.assertEqual(role, ProjectAuthorization.ROLE_VIEWER)
+
+        with self.assertNumQueries(0):
+            role = ProjectAuthorizationCache.get_role(self.user, self.project_uuid)
+        self.assertEqual(role, ProjectAuthorization.ROLE_VIEWER)
+
+    def test_missing_authorization_is_cached(self):
+        project_uuid = str(uuid.uuid4())
+        self.assertIsNone(ProjectAuthorizationCache.get_role(self.user, project_uuid))
+
+        with self.assertNumQueries(0):
+            self.assertIsNone(
+                ProjectAuthorizationCache.get_role(self.user, project_uuid)
+            )
+
+    def test_invalid_project_uuid_has_no_role(self):
+        with self.assertNumQueries(0):
+            self.assertIsNone(ProjectAuthorizationCache.get_role(self.user, "invalid"))
+            self.assertIsNone(ProjectAuthorizationCache.get_role(self.user, None))
+
+    def test_saving_the_authorization_invalidates_the_role(self):
+        ProjectAuthorizationCache.get_role(self.user, self.project_uuid)
+
+        self.authorization.set_role(ProjectAuthorization.ROLE_ADMIN)
+
+        self.assertEqual(
+            ProjectAuthorizationCache.get_role(self.user, self.project_uuid),
+            ProjectAuthorization.ROLE_ADMIN,
+        )
+
+    def test_deleting_the_authorization_invalidates_the_role(self):
+        ProjectAuthorizationCache.get_role(self.user, self.project_uuid)
+
+        self.authorization.delete()
+
+        self.assertIsNone(
+            ProjectAuthorizationCache.get_role(self.user, self.project_uuid)
+        )
+
+    def test_role_read_before_a_change_is_not_cached_after_it(self):
+        stale_read = ProjectAuthorization.objects.filter(pk=self.authorization.pk)
+        stale_role = stale_read.values_list("role", flat=True).first()
+
+        self.authorization.set_role(ProjectAuthorization.ROLE_ADMIN)
+        # A request that read the role before the change caches it afterwards
+        cache.set(
+            ProjectAuthorizationCache.KEY.format(
+                user_id=self.user.pk, project_uuid=self.project_uuid, version=0
+            ),
+            stale_role,
+        )
+
+        self.assertEqual(
+            ProjectAuthorizationCache.get_role(self.user, self.project_uuid),
+            ProjectAuthorization.ROLE_ADMIN,
+        )
+
+    def test_role_is_not_cached_when_the_version_is_unreadable(self):
+        with patch.object(ProjectAuthorizationCache, "_set") as mock_set, patch(
+            "marketplace.accounts.authorization_cache.cache.get",
+            side_effect=ConnectionError("unavailable"),
+        ):
+            role = ProjectAuthorizationCache.get_role(self.user, self.project_uuid)
+
+        self.assertEqual(role, ProjectAuthorization.ROLE_VIEWER)
+        mock_set.assert_not_called()
+
+    def test_role_is_memoized_in_the_request(self):
+        request = Mock(spec=["user"], user=self.user)
+
+        with self.assertNumQueries(1):
+            for _ in range(3):
+                role = ProjectAuthorizationCache.get_request_role(
+                    request, uuid.UUID(self.project_uuid)
+                )
+                cache.clear()
+        self.assertEqual(role, ProjectAuthorization.ROLE_VIEWER)
@@ -0,0 +1,145 @@
+import json
+import time
+
+from unittest.mock import Mock, patch
+
+from cryptography.hazmat.primitives.asymmetric import rsa
+from django.core.exceptions import SuspiciousOperation
+from django.test import SimpleTestCase, override_settings
+from josepy import RS256
+from josepy.jwk import JWKRSA
+from josepy.jws import JWS
+
+from marketplace.accounts.backends import JWKSCache, WeniOIDCAuthenticationBackend
+
+
+def generate_key(kid: str) -> JWKRSA:
+    private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    return JWKRSA(key=private_key), dict(
+        JWKRSA(key=private_key.public_key()).to_json(), kid=kid
+    )
+
+
+def sign(key: JWKRSA, kid: str, claims: dict) -> str:
+    payload = json.dumps(claims).encode()
+    jws = JWS.sign(
+        payload, key=key, alg=RS256, kid=kid, protect=frozenset(["alg", "kid"])
+    )
+    return jws.to_compact().decode()
+
+
+@override_settings(
+    OIDC_OP_TOKEN_ENDPOINT="https://oidc.test/token",
+    OIDC_OP_USER_ENDPOINT="https://oidc.test/userinfo",
+    OIDC_OP_JWKS_ENDPOINT="https://oidc.test/certs",
+    OIDC_RP_CLIENT_ID="marketplace",
+    OIDC_RP_CLIENT_SECRET="secret",
+    OIDC_RP_SIGN_ALGO="RS256",
+    OIDC_LOCAL_TOKEN_VALIDATION=True,
+    OIDC_TOKEN_ISSUER="https://oidc.test",
+    OIDC_TOKEN_AUDIENCE="marketplace",
+)
+class LocalTokenValidationTestCase(SimpleTestCase):
+    def setUp(self):
+        super().setUp()
+        self.private_key, self.public_jwk = generate_key("key-1")
+
+        WeniOIDCAuthenticationBackend.jwks_cache.clear()
+        self.backend = WeniOIDCAuthenticationBackend()
+        self.backend.retrieve_jwks = Mock(return_value={"keys": [self.public_jwk]})
+        self.backend.get_remote_userinfo = Mock(return_value={"email": "remote@x.ai"})
+
+        self.claims = {
+            "email": "user@marketplace.ai",
+            "given_name": "User",
+            "iss": "https://oidc.test",
+            "azp": "marketplace",
+            "exp": int(time.time()) + 300,
+        }
+
+    def test_valid_token_is_validated_locally(self):
+        token = sign(self.private_key, "key-1", self.claims)
+
+        for _ in range(3):
+            self.assertEqual(self.backend.get_userinfo(token, None, None), self.claims)
+
+        self.backend.retrieve_jwks.assert_called_once()
+        self.backend.get_remote_userinfo.assert_not_called()
+
+    @patch.object(JWKSCache, "min_refresh_interval", 0)
+    def test_rotated_keys_are_fetched_again(self):
+        self.backend.get_userinfo(sign(self.private_key, "key-1", self.claims))
+
+        rotated_key, rotated_jwk = generate_key("key-2")
+        self.backend.retrieve_jwks.return_value = {"keys": [rotated_jwk]}
+
+        token = sign(rotated_key, "key-2", self.claims)
+        self.assertEqual(self.backend.get_userinfo(token), self.claims)
+        self.assertEqual(self.backend.retrieve_jwks.call_count, 2)
+
+    def test_unknown_keys_are_not_fetched_on_every_token(self):
+        unknown_key, _ = generate_key("unknown")
+        token = sign(unknown_key, "unknown", self.claims)
+
+        for _ in range(3):
+            with self.assertRaises(SuspiciousOperation):
+                self.backend.get_userinfo(token)
+
+        self.backend.retrieve_jwks.assert_called_once()
+
+    def test_token_signed_with_another_key_is_rejected(self):
+        other_key, _ = generate_key("key-1")
+        with self.assertRaisesMessage(SuspiciousOperation, "verification failed"):
+            self.backend.get_userinfo(sign(other_key, "key-1", self.claims))
+
+    def test_invalid_claims_are_rejected(self):
+        invalid_claims = [
+            {"exp": int(time.time()) - 60},
+            {"exp": None},
+            {"nbf": int(time.time()) + 60},
+            {"iss": "https://other.test"},
+            {"azp": "other-client"},
+        ]
+        for claims in invalid_claims:
+            with self.subTest(claims=claims):
+                token = sign(self.private_key, "key-1", {**self.claims, **claims})
+                with self.assertRaises(SuspiciousOperation):
+                    self.backend.get_userinfo(token)
+
+    def test_audience_claim_is_accepted(self):
+        claims = {**self.claims, "azp": "other-client", "aud": ["marketplace"]}
+        token = sign(self.private_key, "key-1", claims)
+        self.assertEqual(self.backend.get_userinfo(token), claims)
+
+    def test_tokens_not_validated_locally_use_the_userinfo(self):
+        claims = {**self.claims}
+        del claims["email"]
+
+        for token in ["opaque-token", sign(self.private_key, "key-1", claims)]:
+            with self.subTest(token=token):
+                self.assertEqual(
+                    self.backend.get_userinfo(token), {"email": "remote@x.ai"}
+                )
+
+    @override_settings(OIDC_LOCAL_TOKEN_VALIDATION=False)
+    def test_local_validation_disabled(self):
+        backend = WeniOIDCAuthenticationBackend()
+        backend.get_remote_userinfo = Mock(return_value={"email": "remote@x.ai"})
+
+        token = sign(self.private_key, "key-1", self.claims)
+        self.assertEqual(backend.get_userinfo(token), {"email": "remote@x.ai"})
+
+
+class JWKSCacheTestCase(SimpleTestCase):
+    def test_keys_expire(self):
+        cache = JWKSCache()
+        fetch = Mock(return_value={"keys": [{"kid": "a"}, {"kid": "b", "use": "enc"}]})
+
+        with patch("marketplace.accounts.backends.time.monotonic", return_value=0):
+            self.assertEqual(cache.get_key("a", fetch, ttl=10), {"kid": "a"})
+            self.assertIsNone(cache.get_key("b", fetch, ttl=10))
+        self.assertEqual(fetch.call_count, 1)
+
+        with patch("marketplace.accounts.backends.time.monotonic", return_value=10):
+            cache.get_key("a", fetch, ttl=10)
+        self.assertEqual(fetch.call_count, 2)
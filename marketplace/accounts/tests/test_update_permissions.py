@@ -0,0 +1,227 @@
+import time
+import uuid
+
+from unittest.mock import Mock, patch
+
+from django.core.cache import cache
+from django.test import SimpleTestCase, TestCase, override_settings
+
+from marketplace.accounts.authorization_cache import ProjectAuthorizationCache
+from marketplace.accounts.consumers import UpdatePermissionConsumer
+from marketplace.accounts.models import ProjectAuthorization, User
+from marketplace.accounts.usecases import update_permissions
+
+
+@override_settings(
+    CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+)
+class UpdatePermissionsTestCase(TestCase):
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        self.project_uuid = str(uuid.uuid4())
+        self.user = User.objects.create_user(email="user@marketplace.ai")
+
+    def event(self, action: str, role: int, email="user@marketplace.ai", **kwargs):
+        return dict(
+            project=kwargs.get("project", self.project_uuid),
+            action=action,
+            user=email,
+            role=role,
+        )
+
+    def get_role(self, email: str, project_uuid: str = None):
+        return (
+            ProjectAuthorization.objects.filter(
+                user__email=email, project_uuid=project_uuid or self.project_uuid
+            )
+            .values_list("role", flat=True)
+            .first()
+        )
+
+    def test_events_are_applied_in_order(self):
+        self.user.authorizations.create(
+            project_uuid=self.project_uuid, role=ProjectAuthorization.ROLE_VIEWER
+        )
+        other_project_uuid = str(uuid.uuid4())
+
+        update_permissions(
+            [
+                self.event("update", 3),
+                self.event("create", 2, email="new@marketplace.ai"),
+                self.event("create", 1, email="removed@marketplace.ai"),
+                self.event("delete", 1, email="removed@marketplace.ai"),
+                self.event("create", 4, project=other_project_uuid),
+                self.event("unknown", 1, email="ignored@marketplace.ai"),
+            ]
+        )
+
+        self.assertEqual(
+            self.get_role("user@marketplace.ai"), ProjectAuthorization.ROLE_ADMIN
+        )
+        self.assertEqual(
+            self.get_role("user@marketplace.ai", other_project_uuid),
+            ProjectAuthorization.ROLE_ADMIN,
+        )
+        self.assertEqual(
+            self.get_role("new@marketplace.ai"), ProjectAuthorization.ROLE_CONTRIBUTOR
+        )
+        self.assertIsNone(self.get_role("removed@marketplace.ai"))
+        self.assertTrue(User.objects.filter(email="removed@marketplace.ai").exists())
+        self.assertFalse(User.objects.filter(email="ignored@marketplace.ai").exists())
+
+    def test_delete_only_matches_the_role(self):
+        self.user.authorizations.create(
+            project_uuid=self.project_uuid, role=ProjectAuthorization.ROLE_ADMIN
+        )
+
+        update_permissions([self.event("delete", 1)])
+        self.assertEqual(
+            self.get_role("user@marketplace.ai"), ProjectAuthorization.ROLE_ADMIN
+        )
+
+        update_permissions([self.event("delete", ProjectAuthorization.ROLE_ADMIN)])
+        self.assertIsNone(self.get_role("user@marketplace.ai"))
+
+    def test_queries_do_not_grow_with_the_events(self):
+        events = [
+            self.event("create", 1, email=f"user{index}@marketplace.ai")
+            for index in range(50)
+        ]
+
+        with self.assertNumQueries(7):
+            update_permissions(events)
+
+        self.assertEqual(
+            ProjectAuthorization.objects.filter(project_uuid=self.project_uuid).count(),
+            50,
+        )
+
+    def test_cached_roles_are_invalidated(self):
+        self.assertIsNone(
+            ProjectAuthorizationCache.get_role(self.user, self.project_uuid)
+        )
+
+        update_permissions([self.event("create", 2)])
+
+        self.assertEqual(
+            ProjectAuthorizationCache.get_role(self.user, self.project_uuid),
+            ProjectAuthorization.ROLE_CONTRIBUTOR,
+        )
+
+
+class UpdatePermissionConsumerTestCase(SimpleTestCase):
+    def message(self, body: bytes):
+        return Mock(body=body, delivery_tag=id(body))
+
+    def wait_for(self, condition):
+        for _ in range(500):
+            if condition():
+                return
+            time.sleep(0.01)
+        self.fail("Condition not met")
+
+    @patch("marketplace.accounts.consumers.update_permissions.update_permissions")
+    def test_events_are_applied_in_batches(self, mock_update_permissions):
+        consumer = UpdatePermissionConsumer(window=60, batch_size=2)
+        first = self.message(b'{"action": "create", "user": "a@x.ai"}')
+        second = self.message(b'{"action": "create", "user": "b@x.ai"}')
+
+        consumer.handle(first)
+        mock_update_permissions.assert_not_called()
+
+        consumer.handle(second)
+        self.wait_for(lambda: second.channel.basic_ack.called)
+        mock_update_permissions.assert_called_once_with(
+            [
+                {"action": "create", "user": "a@x.ai"},
+                {"action": "create", "user": "b@x.ai"},
+            ]
+        )
+        for message in [first, second]:
+            message.channel.basic_ack.assert_called_once_with(message.delivery_tag)
+
+    @patch("marketplace.accounts.consumers.update_permissions.update_permissions")
+    def test_pending_events_are_applied_after_the_window(self, mock_update_permissions):
+        consumer = UpdatePermissionConsumer(window=0.01, batch_size=10)
+        flusher_threads = set()
+
+        for user in ["a", "b"]:
+            message = self.message(
+                f'{{"action": "create", "user": "{user}@x.ai"}}'.encode()
+            )
+            consumer.handle(message)
+            self.wait_for(lambda: message.channel.basic_ack.called)
+            flusher_threads.add(consumer._flusher)
+
+        self.assertEqual(mock_update_permissions.call_count, 2)
+        # The same thread applies every batch
+        self.assertEqual(len(flusher_threads), 1)
+
+    @patch("marketplace.accounts.consumers.update_permissions.update_permissions")
+    def test_batches_are_closed_when_the_prefetch_is_pending(
+        self, mock_update_permissions
+    ):
+        consumer = UpdatePermissionConsumer(window=60, batch_size=100, prefetch_count=2)
+        messages = [
+            self.message(f'{{"action": "create", "user": "{user}"}}'.encode())
+            for user in "ab"
+        ]
+
+        for message in messages:
+            consumer.handle(message)
+
+        self.wait_for(lambda: messages[-1].channel.basic_ack.called)
+        self.assertEqual(len(mock_update_permissions.call_args.args[0]), 2)
+
+    @patch("marketplace.accounts.consumers.update_permissions.update_permissions")
+    def test_close_stops_the_flusher(self, mock_update_permissions):
+        consumer = UpdatePermissionConsumer(window=60, batch_size=10)
+        message = self.message(b'{"action": "create", "user": "a"}')
+        consumer.handle(message)
+        flusher = consumer._flusher
+
+        consumer.close()
+
+        self.assertFalse(flusher.is_alive())
+        mock_update_permissions.assert_not_called()
+        message.channel.basic_ack.assert_not_called()
+
+        # Messages delivered after the connection is closed are left unacked
+        consumer.handle(self.message(b'{"action": "create", "user": "b"}'))
+        self.assertEqual(consumer._pending, [])
+
+    def test_events_of_a_user_in_a_project_share_the_ordering_key(self):
+        consumer = UpdatePermissionConsumer(window=60, batch_size=10)
+        create = self.message(b'{"action": "create", "project": "p", "user": "a"}')
+        delete = self.message(b'{"action": "delete", "project": "p", "user": "a"}')
+        other = self.message(b'{"action": "create", "project": "q", "user": "a"}')
+
+        self.assertEqual(consumer.ordering_key(create), consumer.ordering_key(delete))
+        self.assertNotEqual(consumer.ordering_key(create), consumer.ordering_key(other))
+        self.assertIsNone(consumer.ordering_key(self.message(b"not json")))
+
+    @patch("marketplace.accounts.consumers.update_permissions.update_permission")
+    @patch("marketplace.accounts.consumers.update_permissions.update_permissions")
+    def test_failed_batches_are_applied_one_by_one(
+        self, mock_update_permissions, mock_update_permission
+    ):
+        mock_update_permissions.side_effect = ValueError("Invalid project")
+        mock_update_permission.side_effect = [None, ValueError("Invalid project")]
+
+        consumer = UpdatePermissionConsumer(window=60, batch_size=3)
+        valid = self.message(b'{"action": "create", "project": "a"}')
+        invalid = self.message(b'{"action": "create", "project": "b"}')
+        not_json = self.message(b"not json")
+
+        for message in [valid, invalid, not_json]:
+            consumer.handle(message)
+        not_json.channel.basic_reject.assert_called_once_with(
+            not_json.delivery_tag, requeue=False
+        )
+
+        consumer.flush()
+        valid.channel.basic_ack.assert_called_once_with(valid.delivery_tag)
+        invalid.channel.basic_reject.assert_called_once_with(
+            invalid.delivery_tag, requeue=False
+        )
@@ -1 +1 @@
-from .permission_update import update_permission
+from .permission_update import update_permission, update_permissions
@@ -1,8 +1,13 @@
-from marketplace.accounts.models import ProjectAuthorization
+import uuid
 
+from typing import Dict, Iterable, List
 
 from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.utils import timezone
 
+from marketplace.accounts.authorization_cache import ProjectAuthorizationCache
+from marketplace.accounts.models import ProjectAuthorization
 from marketplace.projects.models import Project
 
 User = get_user_model()
@@ -15,7 +20,6 @@ def get_or_create_user_by_email(email: str) -> tuple:  # pragma: no cover
 def set_user_project_authorization_role(
     user: User, project: str, role: int
 ):  # pragma: no cover
-
     project_authorization, created = ProjectAuthorization.objects.get_or_create(
         user=user, project_uuid=project
     )
@@ -24,26 +28,24 @@ def set_user_project_authorization_role(
     project_authorization.save(update_fields=["role"])
 
 
-def update_user_permission(role: int, project: str, user: User):  # pragma: no cover
+def get_authorization_role(role: int) -> int:
+    """Maps a role received from Connect to the role of the authorization."""
     if role == 1:
-        set_user_project_authorization_role(
-            user=user, project=project, role=ProjectAuthorization.ROLE_VIEWER
-        )
+        return ProjectAuthorization.ROLE_VIEWER
 
-    elif role == 2 or role == 5:
-        set_user_project_authorization_role(
-            user=user, project=project, role=ProjectAuthorization.ROLE_CONTRIBUTOR
-        )
+    if role == 2 or role == 5:
+        return ProjectAuthorization.ROLE_CONTRIBUTOR
 
-    elif role == 3 or role == 4:
-        set_user_project_authorization_role(
-            user=user, project=project, role=ProjectAuthorization.ROLE_ADMIN
-        )
+    if role == 3 or role == 4:
+        return ProjectAuthorization.ROLE_ADMIN
+
+    return ProjectAuthorization.ROLE_NOT_SETTED
 
-    else:
-        set_user_project_authorization_role(
-            user=user, project=project, role=ProjectAuthorization.ROLE_NOT_SETTED
-        )
+
+def update_user_permission(role: int, project: str, user: User):  # pragma: no cover
+    set_user_project_authorization_role(
+        user=user, project=project, role=get_authorization_role(role)
+    )
 
 
 def delete_permisison(role, project, user):  # pragma: no cover
@@ -66,3 +68,102 @@ def update_permission(
         delete_permisison(role, project_uuid, user)
 
     return project_uuid
+
+
+def get_or_create_users_by_email(emails: Iterable[str]) -> Dict[str, User]:
+    emails = set(emails)
+    users = {user.email: user for user in User.objects.filter(email__in=emails)}
+
+    missing_emails = emails - users.keys()
+    if missing_emails:
+        User.objects.bulk_create(
+            [User(email=email) for email in missing_emails], ignore_conflicts=True
+        )
+        users.update(
+            {user.email: user for user in User.objects.filter(email__in=missing_emails)}
+        )
+
+    return users
+
+
+def update_permissions(events: List[dict]) -> None:
+    """
+    Applies permission events in bulk, with the same result as calling
+    `update_permission` for each one in order.
+
+    Each event has the `project`, `action`, `user` email and `role` of the
+    messages consumed by UpdatePermissionConsumer. The authorizations are
+    written with a few grouped queries in a single transaction.
+    """
+    events = [
+        event
+        for event in events
+        if event.get("action") in ("create", "update", "delete")
+    ]
+    if not events:
+        return
+
+    users = get_or_create_users_by_email(event.get("user") for event in events)
+    keys = [
+        (users[event.get("user")].pk, str(uuid.UUID(str(event.get("project")))))
+        for event in events
+    ]
+
+    with transaction.atomic():
+        authorizations = {
+            (authorization.user_id, str(authorization.project_uuid)): authorization
+            for authorization in ProjectAuthorization.objects.select_for_update().filter(
+                user__in=users.values(),
+                project_uuid__in={project_uuid for _, project_uuid in keys},
+            )
+        }
+
+        roles = {
+            key: authorization.role for key, authorization in authorizations.items()
+        }
+        for key, event in zip(keys, events):
+            if event.get("action") == "delete":
+                # As `delete_permisison`, only the authorization with the role is deleted
+                if key in roles and roles[key] == event.get("role"):
+                    roles[key] = None
+            else:
+                roles[key] = get_authorization_role(event.get("role"))
+
+        now = timezone.now()
+        to_create, to_update, to_delete, changed_keys = [], [], [], []
+        for key in dict.fromkeys(keys):
+            role = roles.get(key)
+            authorization = authorizations.get(key)
+
+            if authorization is None:
+                if role is None:
+                    continue
+                user_id, project_uuid = key
+                to_create.append(
+                    ProjectAuthorization(
+                        user_id=user_id, project_uuid=project_uuid, role=role
+                    )
+                )
+            elif role is None:
+                to_delete.append(authorization.pk)
+            elif authorization.role != role:
+                authorization.role = role
+                authorization.modified_on = now
+                to_update.append(authorization)
+            else:
+                continue
+
+            changed_keys.append(key)
+
+        ProjectAuthorization.objects.bulk_create(to_create)
+        ProjectAuthorization.objects.bulk_update(to_update, ["role", "modified_on"])
+        ProjectAuthorization.objects.filter(pk__in=to_delete).delete()
+
+        # Bulk writes skip the invalidation of the cached roles done on save
+        invalidate_cached_roles(changed_keys)
+        transaction.on_commit(lambda: invalidate_cached_roles(changed_keys))
+
+
+def invalidate_cached_roles(keys: List[tuple]) -> None:
+    for user_id, project_uuid in keys:
+        ProjectAuthorizationCache.invalidate(user_id, project_uuid)
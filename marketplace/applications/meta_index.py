@@ -0,0 +1,111 @@
+import logging
+import threading
+import time
+
+from typing import List, Optional
+
+from django.conf import settings
+from django.core.cache import cache
+
+
+logger = logging.getLogger(__name__)
+
+
+def get_config_waba_id(config: dict) -> Optional[str]:
+    """Returns the WhatsApp Business Account id stored in an app config."""
+    waba_id = config.get("wa_waba_id")
+    if not waba_id and isinstance(config.get("waba"), dict):
+        waba_id = config["waba"].get("id")
+    return str(waba_id) if waba_id else None
+
+
+def get_config_phone_number_id(config: dict) -> Optional[str]:
+    """Returns the WhatsApp phone number id stored in an app config."""
+    phone_number_id = config.get("wa_phone_number_id")
+    if not phone_number_id and isinstance(config.get("phone_number"), dict):
+        phone_number_id = config["phone_number"].get("id")
+    return str(phone_number_id) if phone_number_id else None
+
+
+class AppsByWabaCache:
+    """
+    Caches the ids of the apps linked to a WABA, used to route Meta webhooks.
+
+    Values are kept in the shared Django cache, invalidated when an app linked
+    to the WABA is saved or deleted, and for a few seconds in process, so
+    bursts of webhooks for the same WABA don't reach the cache.
+    """
+
+    KEY = "apps-by-waba:{waba_id}"
+
+    _local = {}
+    _local_lock = threading.Lock()
+    local_maxsize = 1000
+
+    @classmethod
+    def get_app_ids(cls, waba_id: str) -> List[int]:
+        waba_id = str(waba_id)
+        app_ids = cls._get_local(waba_id)
+        if app_ids is not None:
+            return app_ids
+
+        key = cls.KEY.format(waba_id=waba_id)
+        app_ids = cls._get_shared(key)
+        if app_ids is None:
+            from marketplace.applications.models import App
+
+            app_ids = list(
+                App.objects.filter(waba_id=waba_id).values_list("id", flat=True)
+            )
+            cls._set_shared(key, app_ids)
+
+        cls._set_local(waba_id, app_ids)
+        return app_ids
+
+    @classmethod
+    def invalidate(cls, *waba_ids: Optional[str]):
+        for waba_id in {str(waba_id) for waba_id in waba_ids if waba_id}:
+            with cls._local_lock:
+                cls._local.pop(waba_id, None)
+            try:
+                cache.delete(cls.KEY.format(waba_id=waba_id))
+            except Exception as e:
+                logger.warning(f"Error invalidating apps of WABA {waba_id}: {e}")
+
+    @classmethod
+    def clear_local(cls):
+        with cls._local_lock:
+            cls._local.clear()
+
+    @classmethod
+    def _get_local(cls, waba_id):
+        with cls._local_lock:
+            entry = cls._local.get(waba_id)
+        if entry and entry[0] > time.monotonic():
+            return entry[1]
+        return None
+
+    @classmethod
+    def _set_local(cls, waba_id, app_ids):
+        ttl = settings.APPS_BY_WABA_LOCAL_CACHE_TTL
+        if ttl <= 0:
+            return
+        with cls._local_lock:
+            if len(cls._local) >= cls.local_maxsize:
+                cls._local.clear()
+            cls._local[waba_id] = (time.monotonic() + ttl, app_ids)
+
+    @staticmethod
+    def _get_shared(key):
+        try:
+            return cache.get(key)
+        except Exception as e:
+            logger.warning(f"Error reading {key} from cache: {e}")
+            return None
+
+    @staticmethod
+    def _set_shared(key, app_ids):
+        try:
+            cache.set(key, app_ids, timeout=settings.APPS_BY_WABA_CACHE_TTL)
+        except Exception as e:
+            logger.warning(f"Error writing {key} to cache: {e}")
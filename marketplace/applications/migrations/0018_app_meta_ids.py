@@ -0,0 +1,41 @@
+# Generated by Django 3.2.4 on 2026-10-19 16:26
+
+from django.db import migrations, models
+
+from marketplace.applications.meta_index import (
+    get_config_phone_number_id,
+    get_config_waba_id,
+)
+
+
+def fill_meta_ids(apps, schema_editor):
+    App = apps.get_model("applications", "App")
+
+    to_update = []
+    for app in App.objects.exclude(config={}).only("id", "config").iterator():
+        app.waba_id = get_config_waba_id(app.config)
+        app.phone_number_id = get_config_phone_number_id(app.config)
+        if app.waba_id or app.phone_number_id:
+            to_update.append(app)
+
+    App.objects.bulk_update(to_update, ["waba_id", "phone_number_id"], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("applications", "0017_alter_app_platform"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="app",
+            name="phone_number_id",
+            field=models.CharField(blank=True, db_index=True, max_length=50, null=True),
+        ),
+        migrations.AddField(
+            model_name="app",
+            name="waba_id",
+            field=models.CharField(blank=True, db_index=True, max_length=50, null=True),
+        ),
+        migrations.RunPython(fill_meta_ids, migrations.RunPython.noop),
+    ]
@@ -1,11 +1,16 @@
 from typing import TYPE_CHECKING, Generator
 
-from django.db import models
+from django.db import models, transaction
 from django.db.models import Q
 from django.db.models.constraints import UniqueConstraint
 from django.utils.translation import ugettext_lazy as _
 
 from marketplace.core.models import AppTypeBaseModel
+from marketplace.applications.meta_index import (
+    AppsByWabaCache,
+    get_config_phone_number_id,
+    get_config_waba_id,
+)
 
 if TYPE_CHECKING:
     from marketplace.core.types.base import AppType
@@ -35,6 +40,13 @@ class App(AppTypeBaseModel):
     platform = models.CharField(choices=PLATFORM_CHOICES, max_length=2)
     flow_object_uuid = models.UUIDField(null=True, unique=True)
     configured = models.BooleanField(default=False)
+    # Copied from the config on save, so Meta webhooks are routed with an index
+    waba_id = models.CharField(max_length=50, null=True, blank=True, db_index=True)
+    phone_number_id = models.CharField(
+        max_length=50, null=True, blank=True, db_index=True
+    )
+
+    META_ID_FIELDS = ["waba_id", "phone_number_id"]
 
     class Meta:
         verbose_name = _("App")
@@ -43,6 +55,37 @@ class App(AppTypeBaseModel):
     def __str__(self) -> str:
         return self.code
 
+    def save(self, *args, **kwargs):
+        previous_waba_id = self.__dict__.get("waba_id")
+        if "config" in self.__dict__:
+            self.update_meta_ids()
+            update_fields = kwargs.get("update_fields")
+            if update_fields is not None and "config" in update_fields:
+                kwargs["update_fields"] = {*update_fields, *self.META_ID_FIELDS}
+
+        super().save(*args, **kwargs)
+        self._invalidate_apps_by_waba(previous_waba_id, self.waba_id)
+
+    def delete(self, *args, **kwargs):
+        waba_id = self.waba_id
+        result = super().delete(*args, **kwargs)
+        self._invalidate_apps_by_waba(waba_id)
+        return result
+
+    def update_meta_ids(self):
+        """Copies the WABA and phone number ids from the config to their fields."""
+        self.waba_id = get_config_waba_id(self.config)
+        self.phone_number_id = get_config_phone_number_id(self.config)
+
+    @staticmethod
+    def _invalidate_apps_by_waba(*waba_ids):
+        if any(waba_ids):
+            transaction.on_commit(lambda: AppsByWabaCache.invalidate(*waba_ids))
+
+    @classmethod
+    def get_apps_by_waba_id(cls, waba_id: str) -> models.QuerySet:
+        return cls.objects.filter(id__in=AppsByWabaCache.get_app_ids(waba_id))
+
     def __init__(self, *args, **kwargs):
         """Copy some properties from their respective AppType"""
         super().__init__(*args, **kwargs)
@@ -86,6 +129,24 @@ class AppTypeAsset(AppTypeBaseModel):
     def __str__(self) -> str:
         return f"{self.apptype.name} - {(self.code).upper()} - {dict(self.ASSET_TYPE_CHOICES).get(self.asset_type)}"
 
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        self._invalidate_channel_types()
+
+    def delete(self, *args, **kwargs):
+        result = super().delete(*args, **kwargs)
+        self._invalidate_channel_types()
+        return result
+
+    @staticmethod
+    def _invalidate_channel_types():
+        # Generic channel icons are resolved from the assets
+        from marketplace.core.types.channels.generic.channel_types import (
+            ChannelTypesCache,
+        )
+
+        transaction.on_commit(ChannelTypesCache.invalidate)
+
 
 class AppTypeFeatured(AppTypeBaseModel):
     priority = models.PositiveSmallIntegerField(default=0)
@@ -1,9 +1,55 @@
+from typing import List
+
+from django.db.models import Avg, Count
+
 from marketplace.applications.models import App, AppTypeAsset
-from marketplace.interactions.models import Rating
+from marketplace.interactions.models import Comment, Rating
 from rest_framework import serializers
 from marketplace.core.types.base import AppType
 
 
+def get_apptype_aggregates(apptypes: List[AppType], user) -> dict:
+    """
+    Loads with one grouped query each the ratings, comments, integrations and
+    assets of the apptypes, to be passed as the `aggregates` of the
+    AppTypeSerializer context instead of querying them for each apptype.
+    """
+    codes = [apptype.code for apptype in apptypes]
+
+    def count_by_code(queryset):
+        return dict(
+            queryset.filter(code__in=codes)
+            .order_by()
+            .values("code")
+            .annotate(count=Count("id"))
+            .values_list("code", "count")
+        )
+
+    assets = {code: [] for code in codes}
+    for asset in AppTypeAsset.objects.filter(code__in=codes):
+        assets[asset.code].append(asset)
+
+    my_ratings = {}
+    if user.is_authenticated:
+        my_ratings = dict(
+            user.created_ratings.filter(code__in=codes).values_list("code", "rate")
+        )
+
+    return dict(
+        ratings_average=dict(
+            Rating.objects.filter(code__in=codes)
+            .order_by()
+            .values("code")
+            .annotate(average=Avg("rate"))
+            .values_list("code", "average")
+        ),
+        my_ratings=my_ratings,
+        comments_count=count_by_code(Comment.objects),
+        integrations_count=count_by_code(App.objects),
+        assets=assets,
+    )
+
+
 class AppTypeSerializer(serializers.Serializer):
     code = serializers.CharField()
     name = serializers.CharField()
@@ -12,7 +58,7 @@ class AppTypeSerializer(serializers.Serializer):
     category = serializers.ChoiceField(
         choices=AppType.CATEGORY_CHOICES, source="get_category_display"
     )
-    icon = serializers.URLField(source="get_icon_url")
+    icon = serializers.SerializerMethodField()
     bg_color = serializers.CharField()
     config_design = serializers.CharField()
     rating = serializers.SerializerMethodField()
@@ -22,7 +68,27 @@ class AppTypeSerializer(serializers.Serializer):
     can_add = serializers.SerializerMethodField()
     assets = serializers.SerializerMethodField()
 
+    @property
+    def aggregates(self) -> dict:
+        return self.context.get("aggregates")
+
+    def get_icon(self, obj) -> str:
+        if self.aggregates is None:
+            return obj.get_icon_url()
+
+        for asset in self.aggregates["assets"][obj.code]:
+            if asset.asset_type == AppTypeAsset.ASSET_TYPE_ICON:
+                return asset.attachment.url
+
+        return None
+
     def get_assets(self, obj):
+        assets = (
+            obj.assets
+            if self.aggregates is None
+            else self.aggregates["assets"][obj.code]
+        )
+
         return [
             {
                 "type": asset.asset_type,
@@ -31,10 +97,16 @@ class AppTypeSerializer(serializers.Serializer):
                 else asset.attachment.url,
                 "description": asset.description,
             }
-            for asset in obj.assets
+            for asset in assets
         ]
 
     def get_rating(self, obj) -> dict:
+        if self.aggregates is not None:
+            return dict(
+                average=self.aggregates["ratings_average"].get(obj.code),
+                mine=self.aggregates["my_ratings"].get(obj.code),
+            )
+
         rating = dict(average=obj.get_ratings_average(), mine=None)
 
         user = self.context["request"].user
@@ -47,9 +119,15 @@ class AppTypeSerializer(serializers.Serializer):
         return rating
 
     def get_comments_count(self, obj) -> int:
+        if self.aggregates is not None:
+            return self.aggregates["comments_count"].get(obj.code, 0)
+
         return obj.comments.count()
 
     def get_integrations_count(self, obj) -> int:
+        if self.aggregates is not None:
+            return self.aggregates["integrations_count"].get(obj.code, 0)
+
         return obj.apps.count()
 
     def get_metrics(self, obj):
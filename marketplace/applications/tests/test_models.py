@@ -1,12 +1,14 @@
 import uuid
 import urllib
 from typing import Tuple
+from unittest.mock import patch
 
 from django.test import TestCase, override_settings
 from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.db import IntegrityError
 
+from marketplace.applications.meta_index import AppsByWabaCache
 from marketplace.applications.models import App, AppTypeAsset, AppTypeFeatured
 from marketplace.core import types
 
@@ -135,3 +137,72 @@ class TestModelAppTypeFeaturedMethods(TestCase):
     def test_get_apptype_featureds(self):
         apptype = next(self.apptype_featured.get_apptype_featureds())
         self.assertEqual(apptype, types.APPTYPES.get("wwc"))
+
+
+class TestAppMetaIds(TestCase):
+    def setUp(self):
+        super().setUp()
+        AppsByWabaCache.clear_local()
+        self.addCleanup(AppsByWabaCache.clear_local)
+
+        self.user = User.objects.create_superuser(
+            email="admin@marketplace.ai", password="fake@pass#$"
+        )
+
+    def create_app(self, config, code="wpp-cloud"):
+        return App.objects.create(
+            code=code,
+            config=config,
+            project_uuid=uuid.uuid4(),
+            platform=App.PLATFORM_WENI_FLOWS,
+            created_by=self.user,
+        )
+
+    def test_meta_ids_are_copied_from_config(self):
+        cloud_app = self.create_app(
+            {"wa_waba_id": "10", "wa_phone_number_id": "20"}, code="wpp-cloud"
+        )
+        wpp_app = self.create_app(
+            {"waba": {"id": "11"}, "phone_number": {"id": "21"}}, code="wpp"
+        )
+        other_app = self.create_app({"fakekey": "fakevalue"}, code="wwc")
+
+        self.assertEqual((cloud_app.waba_id, cloud_app.phone_number_id), ("10", "20"))
+        self.assertEqual((wpp_app.waba_id, wpp_app.phone_number_id), ("11", "21"))
+        self.assertEqual((other_app.waba_id, other_app.phone_number_id), (None, None))
+
+    def test_meta_ids_follow_config_changes(self):
+        app = self.create_app({"wa_waba_id": "10"})
+
+        app.config["wa_waba_id"] = "30"
+        app.save(update_fields=["config"])
+
+        self.assertTrue(App.objects.filter(waba_id="30", id=app.id).exists())
+
+    @patch("marketplace.applications.meta_index.cache")
+    def test_get_apps_by_waba_id(self, mock_cache):
+        mock_cache.get.return_value = None
+        app = self.create_app({"wa_waba_id": "10"})
+        self.create_app({"wa_waba_id": "11"})
+
+        with self.assertNumQueries(2):
+            apps = list(App.get_apps_by_waba_id("10"))
+
+        self.assertEqual(apps, [app])
+        mock_cache.set.assert_called_once()
+        self.assertEqual(mock_cache.set.call_args.args[1], [app.id])
+
+        # Served from the in-process cache
+        with self.assertNumQueries(1):
+            self.assertEqual(list(App.get_apps_by_waba_id("10")), [app])
+
+    @patch("marketplace.applications.meta_index.cache")
+    def test_cache_is_invalidated_on_save(self, mock_cache):
+        app = self.create_app({"wa_waba_id": "10"})
+
+        with self.captureOnCommitCallbacks(execute=True):
+            app.config["wa_waba_id"] = "30"
+            app.save()
+
+        deleted_keys = {call.args[0] for call in mock_cache.delete.call_args_list}
+        self.assertEqual(deleted_keys, {"apps-by-waba:10", "apps-by-waba:30"})
@@ -6,7 +6,7 @@ from django.test import override_settings
 from rest_framework import status
 
 from marketplace.applications.models import AppTypeAsset, AppTypeFeatured, App
-from marketplace.interactions.models import Rating
+from marketplace.interactions.models import Comment, Rating
 from marketplace.core import types
 from marketplace.applications.views import AppTypeViewSet, MyAppViewSet
 from marketplace.core.tests.base import APIBaseTestCase
@@ -54,6 +54,30 @@ class ListAppTypeViewTestCase(AppTypeViewTestCase):
         response = self.request.get(self.url + "?category=channel")
         self.assertTrue(len(response.json) > 0)
 
+    def test_list_uses_constant_number_of_queries(self):
+        with self.assertNumQueries(7) as context:
+            self.request.get(self.url)
+
+        for code in ["wwc", "tg", "wpp-cloud"]:
+            Rating.objects.create(created_by=self.user, rate=4, code=code)
+            Comment.objects.create(created_by=self.user, content="Nice", code=code)
+            App.objects.create(
+                code=code,
+                config={},
+                project_uuid=uuid.uuid4(),
+                platform=App.PLATFORM_WENI_FLOWS,
+                created_by=self.user,
+            )
+
+        with self.assertNumQueries(len(context.captured_queries)):
+            response = self.request.get(self.url)
+
+        wwc = next(apptype for apptype in response.json if apptype["code"] == "wwc")
+        self.assertEqual(wwc["rating"], {"average": 4.0, "mine": 4})
+        self.assertEqual(wwc["comments_count"], 1)
+        self.assertEqual(wwc["integrations_count"], 1)
+        self.assertEqual(wwc["icon"], self.app_type_asset.attachment.url)
+
 
 class RetrieveAppTypeViewTestCase(AppTypeViewTestCase):
     url = reverse("apptype-detail", kwargs={"pk": "wwc"})
@@ -6,10 +6,14 @@ from rest_framework.decorators import action
 from rest_framework.permissions import IsAuthenticated
 from rest_framework import views
 
-from marketplace.applications.serializers import AppTypeSerializer, MyAppSerializer
+from marketplace.applications.serializers import (
+    AppTypeSerializer,
+    MyAppSerializer,
+    get_apptype_aggregates,
+)
 from marketplace.core import types
 from marketplace.applications.models import App, AppTypeFeatured
-from marketplace.accounts.models import ProjectAuthorization
+from marketplace.accounts.authorization_cache import ProjectAuthorizationCache
 from marketplace.accounts.permissions import is_crm_user
 from marketplace.internal.permissions import CanCommunicateInternally
 
@@ -20,9 +24,14 @@ class AppTypeViewSet(viewsets.ViewSet):
     def get_serializer_context(self):
         return {"request": self.request}
 
-    def get_serializer(self, *args, **kwargs):
-        kwargs["context"] = {"request": self.request}
-        return self.serializer_class(*args, **kwargs)
+    def get_serializer(self, instance, many=False):
+        apptypes = list(instance) if many else [instance]
+        context = self.get_serializer_context()
+        context["aggregates"] = get_apptype_aggregates(apptypes, self.request.user)
+
+        return self.serializer_class(
+            apptypes if many else instance, many=many, context=context
+        )
 
     def list(self, request):
         category = request.query_params.get("category", None)
@@ -80,9 +89,8 @@ class MyAppViewSet(viewsets.ReadOnlyModelViewSet):
         user = self.request.user
 
         if not is_crm_user(user):
-            try:
-                user.authorizations.get(project_uuid=project_uuid)
-            except ProjectAuthorization.DoesNotExist:
+            role = ProjectAuthorizationCache.get_request_role(self.request, project_uuid)
+            if role is None:
                 raise PermissionDenied()
 
         queryset = queryset.filter(project_uuid=project_uuid)
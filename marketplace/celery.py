@@ -4,6 +4,7 @@ import os
 from celery import Celery
 
 from marketplace import settings
+from marketplace.core.json_codec import register_celery_serializer
 
 
 def get_extra_task_paths() -> list:
@@ -16,6 +17,8 @@ def get_extra_task_paths() -> list:
 
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "marketplace.settings")
 
+register_celery_serializer()
+
 app = Celery("marketplace")
 
 app.config_from_object("django.conf:settings", namespace="CELERY")
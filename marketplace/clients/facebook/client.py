@@ -3,10 +3,13 @@ import json
 import requests
 import logging
 
+from typing import Iterator, Optional
+
 from django.conf import settings
 
 from marketplace.clients.base import RequestClient
 from marketplace.clients.decorators import retry_on_exception
+from marketplace.clients.exceptions import CustomAPIException
 from marketplace.interfaces.facebook.interfaces import (
     BusinessMetaRequestsInterface,
     CloudProfileRequestsInterface,
@@ -20,6 +23,11 @@ from marketplace.interfaces.facebook.interfaces import (
 logger = logging.getLogger(__name__)
 
 
+TEMPLATES_PAGE_SIZE = 200
+TEMPLATES_PAGE_MAX_ATTEMPTS = 4
+TEMPLATES_PAGE_RETRY_SLEEP = 2
+
+
 class FacebookAuthorization:
     BASE_URL = f"{settings.WHATSAPP_API_URL}"
 
@@ -410,6 +418,57 @@ class TemplatesRequests(
         )
         return response.json()
 
+    def list_template_messages_pages(
+        self,
+        waba_id: str,
+        page_size: int = TEMPLATES_PAGE_SIZE,
+        after: Optional[str] = None,
+    ) -> Iterator[dict]:
+        """
+        Yields the message templates of the WABA one page at a time, following
+        the Graph API cursors. A page that fails with a transient error is
+        requested again from the last cursor instead of restarting the listing.
+        A response with an error is yielded and ends the listing.
+        """
+        url = f"{self.get_url}/{waba_id}/message_templates"
+
+        while True:
+            params = dict(limit=page_size, access_token=self.access_token)
+            if after:
+                params["after"] = after
+
+            response = self._get_template_messages_page(url, params)
+            yield response
+
+            if response.get("error"):
+                return
+
+            paging = response.get("paging", {})
+            after = paging.get("cursors", {}).get("after")
+            if not (paging.get("next") and after):
+                return
+
+    def _get_template_messages_page(self, url: str, params: dict) -> dict:
+        sleep_time = TEMPLATES_PAGE_RETRY_SLEEP
+        for attempt in range(1, TEMPLATES_PAGE_MAX_ATTEMPTS + 1):
+            try:
+                response = self.make_request(
+                    url, method="GET", headers=self._get_headers(), params=params
+                )
+                return response.json()
+            except CustomAPIException as e:
+                # Connection errors are raised with status code 500
+                transient = e.status_code in (408, 429) or e.status_code >= 500
+                if not transient or attempt == TEMPLATES_PAGE_MAX_ATTEMPTS:
+                    raise
+
+                logger.warning(
+                    f"Error listing templates from cursor {params.get('after')}: {e}. "
+                    f"Retrying in {sleep_time} seconds, attempt {attempt}."
+                )
+                time.sleep(sleep_time)
+                sleep_time *= 2
+
     def get_template_namespace(self, waba_id: str) -> str:
         url = f"{self.get_url}/{waba_id}/message_templates"
         params = dict(
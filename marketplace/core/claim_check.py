@@ -0,0 +1,108 @@
+"""
+Claim checks for large Celery task arguments.
+
+Arguments encoded to CELERY_CLAIM_CHECK_MIN_SIZE bytes or more are compressed
+and kept in Redis for CELERY_CLAIM_CHECK_TTL seconds, the message only carries
+a reference to them. Tasks decorated with `resolve_claim_checks` receive the
+original values, and arguments sent inline keep working, so messages already
+in the queues are still processed.
+"""
+import logging
+import uuid
+import zlib
+
+from functools import wraps
+from typing import Any, Callable
+
+from django.conf import settings
+from django_redis import get_redis_connection
+
+from marketplace.core import json_codec
+
+
+logger = logging.getLogger(__name__)
+
+
+REFERENCE_FIELD = "claim_check"
+KEY = "celery-claim-check:{id}"
+
+
+class ClaimCheckNotFound(Exception):
+    pass
+
+
+def is_reference(value: Any) -> bool:
+    return isinstance(value, dict) and value.keys() == {REFERENCE_FIELD}
+
+
+def store(value: Any) -> Any:
+    """
+    Returns a reference to `value` stored in Redis, or `value` itself when it
+    is small or can't be stored.
+    """
+    data = json_codec.dumps(value)
+    if len(data) < settings.CELERY_CLAIM_CHECK_MIN_SIZE:
+        return value
+
+    key = KEY.format(id=uuid.uuid4().hex)
+    try:
+        get_redis_connection().set(
+            key, zlib.compress(data), ex=settings.CELERY_CLAIM_CHECK_TTL
+        )
+    except Exception as e:
+        logger.warning(f"Error storing {key}, sending the value inline: {e}")
+        return value
+
+    return {REFERENCE_FIELD: key}
+
+
+def fetch(value: Any) -> Any:
+    """Returns the value a reference stands for, other values are returned as is."""
+    if not is_reference(value):
+        return value
+
+    key = value[REFERENCE_FIELD]
+    data = get_redis_connection().get(key)
+    if data is None:
+        raise ClaimCheckNotFound(f"{key} was not found, it expired or was released")
+
+    return json_codec.loads(zlib.decompress(data))
+
+
+def release(value: Any):
+    if not is_reference(value):
+        return
+
+    key = value[REFERENCE_FIELD]
+    try:
+        get_redis_connection().delete(key)
+    except Exception as e:
+        logger.warning(f"Error releasing {key}: {e}")
+
+
+def check_kwargs(kwargs: dict, *names: str) -> dict:
+    """Returns a copy of the task kwargs with the `names` arguments stored."""
+    return {
+        name: store(value) if name in names else value for name, value in kwargs.items()
+    }
+
+
+def resolve_claim_checks(task_function: Callable) -> Callable:
+    """
+    Replaces the references in the kwargs of a task by their values. Stored
+    values are released once the task returns, when it raises they are kept
+    until the TTL, so a retry can still read them.
+    """
+
+    @wraps(task_function)
+    def wrapper(*args, **kwargs):
+        references = [value for value in kwargs.values() if is_reference(value)]
+        resolved = {name: fetch(value) for name, value in kwargs.items()}
+
+        result = task_function(*args, **resolved)
+
+        for reference in references:
+            release(reference)
+        return result
+
+    return wrapper
@@ -0,0 +1,98 @@
+"""
+JSON codec used by Celery, the DRF renderer and parser and the EDA parser.
+
+orjson is used when JSON_CODEC is "orjson", otherwise the standard library.
+Values that aren't native JSON types are converted by the `default` function
+of each caller with both codecs, so the documents produced are the same
+whichever codec is used.
+"""
+import datetime
+import decimal
+import json
+import uuid
+
+from typing import Any, Callable, Optional, Union
+
+import orjson
+
+from django.conf import settings
+
+
+# Datetimes are passed to `default`, as orjson and the callers differ in how
+# dates and UTC offsets are written
+ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+
+
+def use_orjson() -> bool:
+    return settings.JSON_CODEC == "orjson"
+
+
+def dumps(obj: Any, default: Optional[Callable] = None) -> bytes:
+    """Serializes `obj` to compact UTF-8 encoded JSON."""
+    if use_orjson():
+        try:
+            return orjson.dumps(obj, default=default, option=ORJSON_OPTIONS)
+        except orjson.JSONEncodeError:
+            # Values orjson refuses, as integers over 64 bits, are left to
+            # the standard library
+            pass
+
+    return json.dumps(
+        obj, default=default, ensure_ascii=False, separators=(",", ":")
+    ).encode("utf-8")
+
+
+def loads(data: Union[bytes, str]) -> Any:
+    """Deserializes JSON, raises ValueError when it is not valid."""
+    if use_orjson():
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def celery_default(obj):
+    """Converts values as the JSON serializer of kombu does."""
+    reducer = getattr(obj, "__json__", None)
+    if reducer is not None:
+        return reducer()
+
+    if isinstance(obj, datetime.date):
+        if not isinstance(obj, datetime.datetime):
+            obj = datetime.datetime(obj.year, obj.month, obj.day)
+        representation = obj.isoformat()
+        if representation.endswith("+00:00"):
+            representation = representation[:-6] + "Z"
+        return representation
+
+    if isinstance(obj, datetime.time):
+        return obj.isoformat()
+
+    if isinstance(obj, (decimal.Decimal, uuid.UUID)):
+        return str(obj)
+
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def celery_dumps(obj: Any) -> str:
+    return dumps(obj, default=celery_default).decode("utf-8")
+
+
+CELERY_SERIALIZER = "fastjson"
+
+
+def register_celery_serializer():
+    """
+    Registers the codec as a Celery serializer. It writes messages with the
+    content type of the kombu JSON serializer, so they are read by workers
+    using either. Only the encoder is registered, kombu keeps decoding
+    "application/json" messages with its own serializer.
+    """
+    from kombu.serialization import registry
+
+    registry.register(
+        CELERY_SERIALIZER,
+        celery_dumps,
+        None,
+        content_type="application/json",
+        content_encoding="utf-8",
+    )
+    registry.type_to_name["application/json"] = "json"
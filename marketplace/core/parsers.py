@@ -0,0 +1,24 @@
+from django.conf import settings
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+
+from marketplace.core import json_codec
+from marketplace.core.renderers import FastJSONRenderer
+
+
+class FastJSONParser(JSONParser):
+    """Parses JSON request bodies with the JSON codec."""
+
+    renderer_class = FastJSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        parser_context = parser_context or {}
+        encoding = parser_context.get("encoding", settings.DEFAULT_CHARSET)
+
+        try:
+            data = stream.read()
+            if encoding.lower().replace("-", "") != "utf8":
+                data = data.decode(encoding)
+            return json_codec.loads(data)
+        except ValueError as exc:
+            raise ParseError("JSON parse error - %s" % str(exc))
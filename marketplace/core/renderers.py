@@ -0,0 +1,27 @@
+from rest_framework.renderers import JSONRenderer
+
+from marketplace.core import json_codec
+
+
+class FastJSONRenderer(JSONRenderer):
+    """
+    Renders compact JSON with the JSON codec, values are converted as by the
+    DRF encoder. Indented responses, as the browsable API ones, are rendered
+    by JSONRenderer.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+
+        renderer_context = renderer_context or {}
+        indent = self.get_indent(accepted_media_type, renderer_context)
+        if indent is not None or self.ensure_ascii or not self.compact:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        ret = json_codec.dumps(data, default=self.encoder_class().default)
+
+        # Escaped as JSONRenderer does, so the JSON is a strict javascript subset
+        return ret.replace("\u2028".encode(), b"\\u2028").replace(
+            "\u2029".encode(), b"\\u2029"
+        )
@@ -0,0 +1,96 @@
+from unittest.mock import MagicMock, patch
+
+from django.test import SimpleTestCase, override_settings
+
+from marketplace.core import claim_check
+
+
+class FakeRedis:
+    def __init__(self):
+        self.data = {}
+        self.ttls = {}
+
+    def set(self, key, value, ex=None):
+        self.data[key] = value
+        self.ttls[key] = ex
+
+    def get(self, key):
+        return self.data.get(key)
+
+    def delete(self, key):
+        self.data.pop(key, None)
+
+
+@override_settings(CELERY_CLAIM_CHECK_MIN_SIZE=100, CELERY_CLAIM_CHECK_TTL=60)
+class ClaimCheckTestCase(SimpleTestCase):
+    def setUp(self):
+        self.redis = FakeRedis()
+        patcher = patch(
+            "marketplace.core.claim_check.get_redis_connection",
+            return_value=self.redis,
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.batch = [f"seller#{sku}" for sku in range(50)]
+
+    def test_small_values_are_sent_inline(self):
+        self.assertEqual(claim_check.store(["seller#1"]), ["seller#1"])
+        self.assertEqual(self.redis.data, {})
+
+    def test_large_values_are_stored_compressed(self):
+        reference = claim_check.store(self.batch)
+
+        self.assertTrue(claim_check.is_reference(reference))
+        key = reference[claim_check.REFERENCE_FIELD]
+        self.assertEqual(self.redis.ttls[key], 60)
+        self.assertLess(len(self.redis.data[key]), len(str(self.batch)))
+        self.assertEqual(claim_check.fetch(reference), self.batch)
+
+    def test_value_is_sent_inline_when_redis_fails(self):
+        with patch(
+            "marketplace.core.claim_check.get_redis_connection",
+            side_effect=ConnectionError("unavailable"),
+        ):
+            self.assertEqual(claim_check.store(self.batch), self.batch)
+
+    def test_fetch_missing_reference(self):
+        with self.assertRaises(claim_check.ClaimCheckNotFound):
+            claim_check.fetch({claim_check.REFERENCE_FIELD: "missing"})
+
+    def test_check_kwargs_only_stores_named_arguments(self):
+        kwargs = claim_check.check_kwargs(
+            {"app_uuid": "a" * 200, "batch": self.batch}, "batch"
+        )
+
+        self.assertEqual(kwargs["app_uuid"], "a" * 200)
+        self.assertTrue(claim_check.is_reference(kwargs["batch"]))
+
+    def test_task_receives_resolved_values_and_releases_them(self):
+        task = MagicMock(return_value="done")
+        task.__name__ = "task"
+        kwargs = claim_check.check_kwargs({"batch": self.batch}, "batch")
+
+        result = claim_check.resolve_claim_checks(task)("app", **kwargs)
+
+        self.assertEqual(result, "done")
+        task.assert_called_once_with("app", batch=self.batch)
+        self.assertEqual(self.redis.data, {})
+
+    def test_inline_values_are_passed_as_is(self):
+        task = MagicMock()
+        task.__name__ = "task"
+
+        claim_check.resolve_claim_checks(task)(batch=["seller#1"])
+
+        task.assert_called_once_with(batch=["seller#1"])
+
+    def test_values_are_kept_when_task_raises(self):
+        task = MagicMock(side_effect=ValueError("failed"))
+        task.__name__ = "task"
+        kwargs = claim_check.check_kwargs({"batch": self.batch}, "batch")
+
+        with self.assertRaises(ValueError):
+            claim_check.resolve_claim_checks(task)(**kwargs)
+
+        self.assertEqual(claim_check.fetch(kwargs["batch"]), self.batch)
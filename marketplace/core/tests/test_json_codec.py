@@ -0,0 +1,112 @@
+import datetime
+import decimal
+import io
+import json
+import uuid
+
+from django.test import SimpleTestCase, override_settings
+from kombu.serialization import (
+    dumps as kombu_dumps,
+    loads as kombu_loads,
+    registry as kombu_registry,
+)
+from rest_framework.renderers import JSONRenderer
+
+from marketplace.celery import app  # noqa: F401, registers the Celery serializer
+from marketplace.core import json_codec
+from marketplace.core.parsers import FastJSONParser
+from marketplace.core.renderers import FastJSONRenderer
+
+
+UUID = uuid.UUID("5b1b5e52-3d5a-4c2e-9f43-0f3c1bda29a1")
+DATA = {
+    "uuid": UUID,
+    "aware": datetime.datetime(
+        2024, 1, 2, 3, 4, 5, 678901, tzinfo=datetime.timezone.utc
+    ),
+    "naive": datetime.datetime(2024, 1, 2, 3, 4, 5),
+    "date": datetime.date(2024, 1, 2),
+    "time": datetime.time(3, 4, 5),
+    "decimal": decimal.Decimal("10.50"),
+    "nested": [{"text": "ação", "count": 1, "active": True, "empty": None}],
+    1: "integer key",
+}
+
+
+class JSONCodecTestMixin:
+    def test_celery_serializer(self):
+        content_type, content_encoding, payload = kombu_dumps(DATA, "fastjson")
+
+        self.assertEqual(content_type, "application/json")
+        self.assertEqual(
+            json.loads(payload),
+            {
+                "uuid": str(UUID),
+                "aware": "2024-01-02T03:04:05.678901Z",
+                "naive": "2024-01-02T03:04:05",
+                "date": "2024-01-02T00:00:00",
+                "time": "03:04:05",
+                "decimal": "10.50",
+                "nested": [{"text": "ação", "count": 1, "active": True, "empty": None}],
+                "1": "integer key",
+            },
+        )
+        self.assertEqual(
+            kombu_loads(payload, content_type, content_encoding),
+            json.loads(payload),
+        )
+
+    def test_kombu_json_serializer_is_kept(self):
+        content_type, _, payload = kombu_dumps(DATA, "json")
+
+        self.assertEqual(content_type, "application/json")
+        self.assertEqual(kombu_registry.type_to_name[content_type], "json")
+        self.assertNotEqual(kombu_registry._decoders[content_type], json_codec.loads)
+        self.assertEqual(
+            kombu_loads(payload, content_type, "utf-8")["nested"], DATA["nested"]
+        )
+
+    def test_renderer_writes_the_same_json_as_drf(self):
+        data = {**DATA, "separators": "line\u2028paragraph\u2029"}
+
+        self.assertEqual(FastJSONRenderer().render(data), JSONRenderer().render(data))
+        self.assertEqual(FastJSONRenderer().render(None), b"")
+
+    def test_renderer_indents_as_drf(self):
+        context = {"indent": 4}
+        self.assertEqual(
+            FastJSONRenderer().render(DATA, renderer_context=context),
+            JSONRenderer().render(DATA, renderer_context=context),
+        )
+
+    def test_parser(self):
+        stream = io.BytesIO('{"text": "ação", "numbers": [1, 2.5]}'.encode())
+        self.assertEqual(
+            FastJSONParser().parse(stream),
+            {"text": "ação", "numbers": [1, 2.5]},
+        )
+
+        stream = io.BytesIO('{"text": "ação"}'.encode("latin-1"))
+        self.assertEqual(
+            FastJSONParser().parse(stream, parser_context={"encoding": "latin-1"}),
+            {"text": "ação"},
+        )
+
+    def test_large_integers(self):
+        self.assertEqual(json_codec.loads(json_codec.dumps([2**70])), [2**70])
+
+    def test_unsupported_values(self):
+        with self.assertRaises(TypeError):
+            json_codec.dumps({"value": object()}, default=json_codec.celery_default)
+
+
+@override_settings(JSON_CODEC="json")
+class StdlibJSONCodecTestCase(JSONCodecTestMixin, SimpleTestCase):
+    def test_codec(self):
+        self.assertFalse(json_codec.use_orjson())
+
+
+@override_settings(JSON_CODEC="orjson")
+class OrjsonJSONCodecTestCase(JSONCodecTestMixin, SimpleTestCase):
+    def test_codec(self):
+        self.assertTrue(json_codec.use_orjson())
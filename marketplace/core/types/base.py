@@ -103,7 +103,7 @@ class AppType(AbstractAppType):
     def get_icon_url(self) -> str:
         icon_asset = self.get_icon_asset()
         if icon_asset is not None:
-            return self.get_icon_asset().attachment.url
+            return icon_asset.attachment.url
 
     def get_category_display(self) -> str:
         categories = dict(self.CATEGORY_CHOICES)
@@ -120,6 +120,10 @@ class AppType(AbstractAppType):
             *args, **kwargs, code=self.code, platform=self.platform
         )
 
+    def build_app(self, *args, **kwargs) -> App:
+        """Returns an unsaved app of this type, to be created in bulk."""
+        return App(*args, **kwargs, code=self.code, platform=self.platform)
+
     def template_type_setup(self) -> dict:
         raise NotImplementedError(
             f"App: {self.name} cannot be configured from a project template!"
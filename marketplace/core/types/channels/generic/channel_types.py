@@ -0,0 +1,109 @@
+import logging
+
+from typing import Dict, Iterable, Optional, Tuple
+
+from django.conf import settings
+from django.core.cache import cache
+
+from marketplace.flows.client import FlowsClient
+
+
+logger = logging.getLogger(__name__)
+
+
+GENERIC_ICON_CODE = "generic"
+
+
+def get_icon_urls(channel_codes: Iterable[str]) -> Dict[str, Optional[str]]:
+    """
+    Returns the icon url of each channel code in a single query, channels
+    without an asset of their own get the icon of the generic app type.
+    """
+    from marketplace.applications.models import AppTypeAsset
+
+    channel_codes = list(channel_codes)
+    asset_codes = {code.lower() for code in channel_codes} | {GENERIC_ICON_CODE}
+
+    icon_urls = {}
+    for asset in AppTypeAsset.objects.filter(code__in=asset_codes).order_by("pk"):
+        # The first asset of each code is used, as `search_icon` always did
+        icon_urls.setdefault(asset.code, asset.attachment.url)
+
+    generic_icon_url = icon_urls.get(GENERIC_ICON_CODE)
+    return {
+        code: icon_urls.get(code.lower(), generic_icon_url) for code in channel_codes
+    }
+
+
+class ChannelTypesCache:
+    """
+    Caches the channel types listed by Flows and the icon of each of them, so
+    the generic channel endpoints don't request Flows on every call.
+
+    Only successful responses are cached, for GENERIC_CHANNEL_TYPES_CACHE_TTL
+    seconds, and everything is invalidated when an app type asset changes.
+    """
+
+    KEY = "generic-channel-types:{channel_code}"
+    ALL_CHANNELS = "__all__"
+    ICONS_KEY = "generic-channel-icons"
+
+    @classmethod
+    def get(cls, channel_code: str = None) -> Tuple[Optional[dict], int]:
+        """Returns the data and status code of Flows `list_channel_types`."""
+        key = cls._key(channel_code)
+        data = cls._get(key)
+        if data is not None:
+            return data, 200
+
+        response = FlowsClient().list_channel_types(channel_code=channel_code)
+        if response.status_code != 200:
+            return None, response.status_code
+
+        data = response.json()
+        cls._set(key, data)
+        return data, response.status_code
+
+    @classmethod
+    def get_icon_urls(cls, channel_codes: Iterable[str]) -> Dict[str, Optional[str]]:
+        channel_codes = list(channel_codes)
+        icon_urls = cls._get(cls.ICONS_KEY) or {}
+        if all(code in icon_urls for code in channel_codes):
+            return {code: icon_urls[code] for code in channel_codes}
+
+        icon_urls.update(get_icon_urls(channel_codes))
+        cls._set(cls.ICONS_KEY, icon_urls)
+        return {code: icon_urls[code] for code in channel_codes}
+
+    @classmethod
+    def invalidate(cls):
+        keys = [cls._key(None), cls.ICONS_KEY]
+
+        all_channels = cls._get(cls._key(None)) or {}
+        keys.extend(
+            cls._key(code) for code in (all_channels.get("channel_types") or {})
+        )
+
+        try:
+            cache.delete_many(keys)
+        except Exception as e:
+            logger.warning(f"Error invalidating generic channel types: {e}")
+
+    @classmethod
+    def _key(cls, channel_code: Optional[str]) -> str:
+        return cls.KEY.format(channel_code=channel_code or cls.ALL_CHANNELS)
+
+    @staticmethod
+    def _get(key):
+        try:
+            return cache.get(key)
+        except Exception as e:
+            logger.warning(f"Error reading {key} from cache: {e}")
+            return None
+
+    @staticmethod
+    def _set(key, value):
+        try:
+            cache.set(key, value, timeout=settings.GENERIC_CHANNEL_TYPES_CACHE_TTL)
+        except Exception as e:
+            logger.warning(f"Error writing {key} to cache: {e}")
@@ -1,5 +1,6 @@
 import uuid
 
+from django.core.cache import cache
 from django.urls import reverse
 from django.test import override_settings
 from django.test import TestCase
@@ -14,6 +15,7 @@ from marketplace.core.types.channels.generic.views import DetailChannelType
 from marketplace.core.types.channels.generic.views import GetIcons
 from marketplace.core.types.channels.generic.views import GenericAppTypes
 from marketplace.core.types.channels.generic.views import search_icon
+from marketplace.core.types.channels.generic.channel_types import ChannelTypesCache
 
 from marketplace.applications.models import App
 from marketplace.applications.models import AppTypeAsset
@@ -26,6 +28,11 @@ from unittest.mock import Mock
 
 User = get_user_model()
 
+# Channel types are cached, each test starts with an empty cache
+LOCMEM_CACHES = {
+    "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}
+}
+
 
 class FakeRequestsResponse:
     def __init__(self, data, status_code):
@@ -34,6 +41,7 @@ class FakeRequestsResponse:
         self.status_code = status_code
 
 
+@override_settings(CACHES=LOCMEM_CACHES)
 class CreateGenericAppTestCase(APIBaseTestCase):
     url = "/api/v1/apptypes/generic/apps/"
     view_class = GenericChannelViewSet
@@ -45,6 +53,7 @@ class CreateGenericAppTestCase(APIBaseTestCase):
 
     def setUp(self):
         super().setUp()
+        cache.clear()
         project_uuid = str(uuid.uuid4())
         self.body = {"project_uuid": project_uuid}
 
@@ -239,11 +248,13 @@ class ConfigureGenericAppTestCase(APIBaseTestCase):
         self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
 
 
+@override_settings(CACHES=LOCMEM_CACHES)
 class DetailChannelAppTestCase(APIBaseTestCase):
     view_class = DetailChannelType
 
     def setUp(self):
         super().setUp()
+        cache.clear()
         self.url = reverse("channel-type-detail", kwargs={"code_channel": "tg"})
 
     @property
@@ -326,11 +337,13 @@ class DestroyTelegramAppTestCase(APIBaseTestCase):
         self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
 
 
+@override_settings(CACHES=LOCMEM_CACHES)
 class GetIconsTestCase(APIBaseTestCase):
     view_class = GetIcons
 
     def setUp(self):
         super().setUp()
+        cache.clear()
         self.url = reverse("get-icons-list")
 
     @property
@@ -338,8 +351,8 @@ class GetIconsTestCase(APIBaseTestCase):
         return self.view_class.as_view({"get": "list"})
 
     @patch("marketplace.flows.client.FlowsClient.list_channel_types")
-    @patch("marketplace.core.types.channels.generic.views.search_icon")
-    def test_get_icons_success(self, mock_search_icon, mock_list_channels_type):
+    @patch("marketplace.core.types.channels.generic.channel_types.get_icon_urls")
+    def test_get_icons_success(self, mock_get_icon_urls, mock_list_channels_type):
         response_data = {
             "channel_types": {
                 "D3": "http://example.com/icon.png",
@@ -354,11 +367,19 @@ class GetIconsTestCase(APIBaseTestCase):
         mock_response.status_code = 200
         mock_list_channels_type.return_value = mock_response
 
-        mock_search_icon.return_value = "http://example.com/icon.png"
+        mock_get_icon_urls.side_effect = lambda codes: {
+            code: "http://example.com/icon.png" for code in codes
+        }
         response = self.request.get(self.url)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(response.json, response_data["channel_types"])
 
+        # Channel types and icons are served from the cache
+        response = self.request.get(self.url)
+        self.assertEqual(response.json, response_data["channel_types"])
+        mock_list_channels_type.assert_called_once_with(channel_code=None)
+        mock_get_icon_urls.assert_called_once()
+
     @patch("marketplace.flows.client.FlowsClient.list_channel_types")
     @patch("marketplace.core.types.channels.generic.views.search_icon")
     def test_get_icons_fail(self, mock_search_icon, mock_list_channels_type):
@@ -372,11 +393,13 @@ class GetIconsTestCase(APIBaseTestCase):
         self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
 
 
+@override_settings(CACHES=LOCMEM_CACHES)
 class GenericAppTypesTestCase(APIBaseTestCase):
     view_class = GenericAppTypes
 
     def setUp(self):
         super().setUp()
+        cache.clear()
         self.url = reverse("my-apps-list")
 
     @property
@@ -403,6 +426,46 @@ class GenericAppTypesTestCase(APIBaseTestCase):
         self.assertEqual(response.json, response_data["channel_types"])
 
 
+@override_settings(CACHES=LOCMEM_CACHES)
+class ChannelTypesCacheTestCase(TestCase):
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        self.user = User.objects.create_superuser(email="user@marketplace.ai")
+        self.channel_types = {"channel_types": {"TG": {"attributes": {}}}}
+
+    @patch("marketplace.flows.client.FlowsClient.list_channel_types")
+    def test_failed_responses_are_not_cached(self, mock_list_channel_types):
+        mock_list_channel_types.return_value = FakeRequestsResponse(None, 500)
+        self.assertEqual(ChannelTypesCache.get("TG"), (None, 500))
+
+        mock_list_channel_types.return_value = FakeRequestsResponse({"a": 1}, 200)
+        self.assertEqual(ChannelTypesCache.get("TG"), ({"a": 1}, 200))
+        self.assertEqual(ChannelTypesCache.get("TG"), ({"a": 1}, 200))
+        self.assertEqual(mock_list_channel_types.call_count, 2)
+
+    @patch("marketplace.flows.client.FlowsClient.list_channel_types")
+    def test_asset_changes_invalidate_the_cache(self, mock_list_channel_types):
+        mock_list_channel_types.return_value = FakeRequestsResponse(
+            self.channel_types, 200
+        )
+        ChannelTypesCache.get()
+        ChannelTypesCache.get("TG")
+        self.assertEqual(ChannelTypesCache.get_icon_urls(["TG"]), {"TG": None})
+
+        with self.captureOnCommitCallbacks(execute=True):
+            AppTypeAsset.objects.create(
+                code="tg", attachment="example.com/tg.png", created_by=self.user
+            )
+
+        self.assertEqual(
+            ChannelTypesCache.get_icon_urls(["TG"]), {"TG": "/media/example.com/tg.png"}
+        )
+        ChannelTypesCache.get()
+        ChannelTypesCache.get("TG")
+        self.assertEqual(mock_list_channel_types.call_count, 4)
+
+
 class SearchIconTestCase(TestCase):
     def setUp(self):
         super().setUp()
@@ -441,6 +504,11 @@ class SearchIconTestCase(TestCase):
         )
         self.assertEqual(result, expected_url)
 
+    def test_search_icon_uses_a_single_query(self):
+        with self.assertNumQueries(1):
+            result = search_icon("TEST_CODE")
+        self.assertEqual(result, f"{self.path}{self.icon_url}")
+
     def test_search_icon_with_invalid_code_and_missing_generic_asset(self):
         AppTypeAsset.objects.all().delete()
         invalid_code = "invalid_code"
@@ -7,11 +7,9 @@ from rest_framework import viewsets
 from .serializers import GenericChannelSerializer, GenericConfigureSerializer
 
 from marketplace.core.types import views
-from marketplace.flows.client import FlowsClient
-
-from marketplace.applications.models import AppTypeAsset
 
 from . import type as type_
+from .channel_types import ChannelTypesCache, get_icon_urls
 
 from django.conf import settings
 
@@ -36,11 +34,9 @@ class GenericChannelViewSet(views.BaseAppTypeViewSet):
         else:
             raise serializers.ValidationError("Code not be empty.")
 
-        client = FlowsClient()
-        response = client.list_channel_types(channel_code=channel_code)
+        response, status_code = ChannelTypesCache.get(channel_code=channel_code)
 
-        if response.status_code == 200:
-            response = response.json()
+        if status_code == 200:
             if response.get("attributes"):
                 if response.get("attributes").get("claim_blurb"):
                     channel_claim_blurb = str(
@@ -83,14 +79,13 @@ class DetailChannelType(viewsets.ViewSet):
     lookup_field = "code_channel"
 
     def retrieve(self, request, code_channel=None):
-        client = FlowsClient()
-        response = client.list_channel_types(channel_code=code_channel)
-        if response.status_code == 200:
-            return Response(response.json(), status=response.status_code)
+        response, status_code = ChannelTypesCache.get(channel_code=code_channel)
+        if status_code == 200:
+            return Response(response, status=status_code)
 
         return Response(
             {"message": "There was an error in the request"},
-            status=response.status_code,
+            status=status_code,
         )
 
 
@@ -105,19 +100,16 @@ class GetIcons(viewsets.ViewSet):
     """
 
     def list(self, request):
-        client = FlowsClient()
-        response = client.list_channel_types(channel_code=None)
-        if response.status_code == 200:
-            response = response.json()
-            channels_icons = {}
-            for channel in response.get("channel_types").keys():
-                channels_icons[channel] = search_icon(channel)
-
+        response, status_code = ChannelTypesCache.get(channel_code=None)
+        if status_code == 200:
+            channels_icons = ChannelTypesCache.get_icon_urls(
+                response.get("channel_types").keys()
+            )
             return Response(channels_icons)
 
         return Response(
             {"message": "There was an error in the request"},
-            status=response.status_code,
+            status=status_code,
         )
 
 
@@ -135,10 +127,15 @@ class GenericAppTypes(viewsets.ViewSet):
     """
 
     def list(self, request):
-        client = FlowsClient()
-        response = client.list_channel_types(channel_code=None)
-        channel_types = sort_channel_types(response.json().get("channel_types"))
-        return Response(channel_types, status=response.status_code)
+        response, status_code = ChannelTypesCache.get(channel_code=None)
+        if status_code != 200:
+            return Response(
+                {"message": "There was an error in the request"},
+                status=status_code,
+            )
+
+        channel_types = sort_channel_types(response.get("channel_types"))
+        return Response(channel_types, status=status_code)
 
 
 def search_icon(code):
@@ -150,19 +147,7 @@ def search_icon(code):
     Return:
         "exemple.url.com"
     """
-    apptype_asset = AppTypeAsset.objects.filter(code=code.lower())
-    if apptype_asset.exists():
-        apptype_asset = apptype_asset.first()
-        icon_url = apptype_asset.attachment.url
-    else:
-        apptype_asset = AppTypeAsset.objects.filter(code="generic")
-        if apptype_asset.exists():
-            apptype_asset = apptype_asset.first()
-            icon_url = apptype_asset.attachment.url
-        else:
-            icon_url = None
-
-    return icon_url
+    return get_icon_urls([code])[code]
 
 
 def sort_channel_types(channel_types):
@@ -1,5 +1,7 @@
 import json
 
+from typing import List, Union
+
 import requests
 from requests.models import Response
 from django.conf import settings
@@ -8,6 +10,9 @@ from ..whatsapp_base.exceptions import FacebookApiException, UnableProcessProfil
 
 WHATSAPP_VERSION = settings.WHATSAPP_VERSION
 
+# Maximum number of sub-requests accepted by a Graph API batch request
+GRAPH_BATCH_MAX_REQUESTS = 50
+
 
 def _request(url: str, method: str = "GET", *args, **kwargs):
     return requests.request(method.upper(), url, *args, **kwargs)
@@ -116,6 +121,52 @@ class BaseFacebookBaseApi(object):
 
         return response
 
+    def _batch_get(self, relative_urls: List[str]) -> List[Union[dict, Exception]]:
+        """
+        Sends the GET requests in a single Graph API batch request.
+
+        Returns the body of each sub-request in the order of `relative_urls`, or
+        a FacebookApiException for the sub-requests that failed.
+        """
+        if len(relative_urls) > GRAPH_BATCH_MAX_REQUESTS:
+            raise ValueError(
+                f"A batch request accepts up to {GRAPH_BATCH_MAX_REQUESTS} requests"
+            )
+
+        batch = [dict(method="GET", relative_url=url) for url in relative_urls]
+        response = _request(
+            settings.WHATSAPP_API_URL,
+            "POST",
+            headers=self._headers,
+            data=dict(batch=json.dumps(batch), include_headers="false"),
+        )
+
+        content = response.json()
+        if isinstance(content, dict):
+            error = content.get("error") or {}
+            raise FacebookApiException(error.get("message"))
+
+        return [self._get_batch_result(result) for result in content]
+
+    def _get_batch_result(self, result: dict) -> Union[dict, Exception]:
+        # Sub-requests that were not completed in time are returned as null
+        if result is None:
+            return FacebookApiException("The batch request timed out")
+
+        try:
+            body = json.loads(result.get("body") or "{}")
+        except ValueError:
+            return FacebookApiException(f"Invalid response body: {result.get('body')}")
+
+        if not isinstance(body, dict):
+            return FacebookApiException(f"Invalid response body: {body}")
+
+        error = body.get("error")
+        if error is not None:
+            return FacebookApiException(error.get("message"))
+
+        return body
+
 
 class FacebookConversationAPI(object):  # TODO: Use BaseFacebookBaseApi
     def _validate_response(self, response: Response):
@@ -169,6 +220,9 @@ class FacebookWABAApi(BaseFacebookBaseApi):
 
         return response.json()
 
+    def get_wabas(self, waba_ids: List[str]) -> List[Union[dict, Exception]]:
+        return self._batch_get(waba_ids)
+
 
 class FacebookPhoneNumbersAPI(BaseFacebookBaseApi):
     def _get_url(self, endpoint: str) -> str:
@@ -186,6 +240,20 @@ class FacebookPhoneNumbersAPI(BaseFacebookBaseApi):
 
         return response.json()
 
+    def get_phone_numbers_by_ids(
+        self, phone_number_ids: List[str]
+    ) -> List[Union[dict, Exception]]:
+        return self._batch_get(phone_number_ids)
+
+    def get_phone_numbers_by_wabas(
+        self, waba_ids: List[str]
+    ) -> List[Union[list, Exception]]:
+        results = self._batch_get([f"{waba_id}/phone_numbers" for waba_id in waba_ids])
+        return [
+            result if isinstance(result, Exception) else result.get("data", [])
+            for result in results
+        ]
+
 
 class OnPremiseBusinessProfileAPI(BaseOnPremiseAPI):
     _endpoint = "/v1/settings/business/profile"
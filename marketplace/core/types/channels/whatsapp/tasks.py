@@ -1,17 +1,22 @@
 import logging
 
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Callable, Dict, Iterable, List, Tuple
+
 import phonenumbers
 from django.conf import settings
 from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.utils import timezone
 from django_redis import get_redis_connection
 from phonenumbers.phonenumberutil import NumberParseException
 
 from marketplace.celery import app as celery_app
 from marketplace.core.types import APPTYPES
+from marketplace.applications.meta_index import AppsByWabaCache
 from marketplace.applications.models import App
 from marketplace.connect.client import ConnectProjectClient
-from .apis import FacebookWABAApi, FacebookPhoneNumbersAPI
-from ..whatsapp_base.exceptions import FacebookApiException
+from .apis import FacebookWABAApi, FacebookPhoneNumbersAPI, GRAPH_BATCH_MAX_REQUESTS
 
 
 User = get_user_model()
@@ -22,6 +27,17 @@ SYNC_WHATSAPP_LOCK_KEY = "sync-whatsapp-lock"
 SYNC_WHATSAPP_WABA_LOCK_KEY = "sync-whatsapp-waba-lock-app:{app_uuid}"
 SYNC_WHATSAPP_PHONE_NUMBER_LOCK_KEY = "sync-whatsapp-phone-number-lock-app:{app_uuid}"
 
+SYNC_BULK_UPDATE_BATCH_SIZE = 500
+
+
+WHATSAPP_APP_SYNC_FIELDS = [
+    "base_url",
+    "username",
+    "password",
+    "auth_token",
+    "fb_access_token",
+]
+
 
 @celery_app.task(name="sync_whatsapp_apps")
 def sync_whatsapp_apps():
@@ -37,6 +53,21 @@ def sync_whatsapp_apps():
 
     else:
         with redis.lock(SYNC_WHATSAPP_LOCK_KEY):
+            apps_by_channel = {
+                str(app.flow_object_uuid): app
+                for app in App.objects.filter(
+                    flow_object_uuid__in={
+                        channel.get("uuid")
+                        for channel in channels
+                        if channel.get("uuid") is not None
+                    }
+                )
+            }
+            admin_user = User.objects.get_admin_user()
+
+            new_apps = []
+            changed_apps = {}
+
             for channel in channels:
                 channel_config = channel.get("config")
 
@@ -49,13 +80,12 @@ def sync_whatsapp_apps():
                     logger.info("Skipping channel with None UUID.")
                     continue
 
+                flow_channel_uuid = str(channel.get("uuid"))
+
                 if channel.get("is_active") is False:
-                    flow_channel_uuid = channel.get("uuid")
-                    apps_to_delete = App.objects.filter(
-                        flow_object_uuid=flow_channel_uuid
-                    )
-                    if apps_to_delete:
-                        delete_inactive_apps(apps_to_delete, flow_channel_uuid)
+                    app = apps_by_channel.pop(flow_channel_uuid, None)
+                    if app is not None:
+                        delete_inactive_apps([app], flow_channel_uuid)
 
                     logger.info(f"Skipping channel {flow_channel_uuid} is inactive.")
                     continue
@@ -67,11 +97,9 @@ def sync_whatsapp_apps():
                 config = {"title": channel.get("address")}
                 config.update(channel_config)
 
-                apps = App.objects.filter(flow_object_uuid=channel.get("uuid"))
-
-                if apps.exists():
-                    app = apps.first()
+                app = apps_by_channel.get(flow_channel_uuid)
 
+                if app is not None:
                     if app.code != apptype.code:
                         logger.error(
                             f"This app: {app.uuid} has been migrated from {app.code} to wpp "
@@ -79,308 +107,495 @@ def sync_whatsapp_apps():
                         )
                         continue
 
-                    sync_fields = [
-                        "base_url",
-                        "username",
-                        "password",
-                        "auth_token",
-                        "fb_access_token",
-                    ]
                     has_changes = False
 
-                    for field in sync_fields:
+                    for field in WHATSAPP_APP_SYNC_FIELDS:
                         if app.config.get(field) != config.get(field):
                             app.config[field] = config.get(field)
                             has_changes = True
 
                     if has_changes:
-                        app.modified_by = User.objects.get_admin_user()
-                        app.save()
+                        app.modified_by = admin_user
+                        changed_apps[app.pk] = app
 
                 else:
                     try:
-                        app = apptype.create_app(
+                        app = apptype.build_app(
                             project_uuid=channel.get("project_uuid"),
                             flow_object_uuid=channel.get("uuid"),
                             config=config,
-                            created_by=User.objects.get_admin_user(),
-                        )
-
-                        logger.info(
-                            f"A new whatsapp app was created automatically. UUID: {app.uuid}"
+                            created_by=admin_user,
                         )
                     except Exception as e:
                         logger.error(f"An error occurred while creating the app: {e}")
                         continue
 
+                    apps_by_channel[flow_channel_uuid] = app
+                    new_apps.append(app)
 
-@celery_app.task(name="sync_whatsapp_wabas")
-def sync_whatsapp_wabas():
-    apptype = APPTYPES.get("wpp")
-    redis = get_redis_connection()
+            update_whatsapp_apps(list(changed_apps.values()))
+            create_whatsapp_apps(new_apps)
 
-    for app in apptype.apps:
-        key = SYNC_WHATSAPP_WABA_LOCK_KEY.format(app_uuid=str(app.uuid))
 
-        if redis.get(key) is None:
-            config = app.config
-            access_token = config.get("fb_access_token", None)
-            business_id = config.get("fb_business_id", None)
+def update_whatsapp_apps(apps: List[App]):
+    if not apps:
+        return
 
-            if access_token is None:
-                logger.info(
-                    f"Skipping the app because it doesn't contain `fb_access_token`. UUID: {app.uuid}"
-                )
+    modified_on = timezone.now()
+    changed_waba_ids = set()
+    for app in apps:
+        previous_waba_id = app.waba_id
+        app.modified_on = modified_on
+        app.update_meta_ids()
+        if app.waba_id != previous_waba_id:
+            changed_waba_ids.update([previous_waba_id, app.waba_id])
+
+    App.objects.bulk_update(
+        apps,
+        ["config", "modified_by", "modified_on", *App.META_ID_FIELDS],
+        batch_size=SYNC_BULK_UPDATE_BATCH_SIZE,
+    )
+    if changed_waba_ids:
+        transaction.on_commit(lambda: AppsByWabaCache.invalidate(*changed_waba_ids))
+    logger.info(f"{len(apps)} whatsapp apps were updated.")
+
+
+def create_whatsapp_apps(apps: List[App]):
+    for app in apps:
+        app.update_meta_ids()
+
+    try:
+        with transaction.atomic():
+            App.objects.bulk_create(apps, batch_size=SYNC_BULK_UPDATE_BATCH_SIZE)
+            # WABAs looked up before their apps were created have cached no apps
+            waba_ids = {app.waba_id for app in apps if app.waba_id}
+            if waba_ids:
+                transaction.on_commit(lambda: AppsByWabaCache.invalidate(*waba_ids))
+    except Exception as e:
+        # A single invalid channel must not prevent the others from being
+        # created, so they are created one by one to skip only the failing ones
+        logger.warning(f"Unable to create the whatsapp apps in bulk: {e}")
+        for app in apps:
+            try:
+                # The keys of rows inserted before the failure were rolled back
+                app.pk = None
+                with transaction.atomic():
+                    app.save()
+            except Exception as e:
+                logger.error(f"An error occurred while creating the app: {e}")
                 continue
 
-            if business_id is None:
-                logger.info(
-                    f"Skipping the app because it doesn't contain `fb_business_id`. UUID: {app.uuid}"
-                )
-                continue
+            logger.info(
+                f"A new whatsapp app was created automatically. UUID: {app.uuid}"
+            )
+        return
 
-            logger.info(f"Syncing app WABA. UUID: {app.uuid}")
+    for app in apps:
+        logger.info(f"A new whatsapp app was created automatically. UUID: {app.uuid}")
 
-            api = FacebookWABAApi(access_token)
 
-            try:
-                waba = api.get_waba(business_id)
-                app.config["waba"] = waba
-                app.modified_by = User.objects.get_admin_user()
-                app.save()
+def get_apps_to_sync(redis, apps, lock_key: str) -> list:
+    """Returns the apps that were not synced recently, checked with a single query."""
+    apps = list(apps)
+    if not apps:
+        return []
 
-                redis.set(
-                    key, "synced", settings.WHATSAPP_TIME_BETWEEN_SYNC_WABA_IN_HOURS
-                )
-            except FacebookApiException as error:
-                logger.error(
-                    f"An error occurred while trying to sync the app. UUID: {app.uuid}. Error: {error}"
-                )
-                continue
+    synced = redis.mget([lock_key.format(app_uuid=str(app.uuid)) for app in apps])
 
+    apps_to_sync = []
+    for app, app_synced in zip(apps, synced):
+        if app_synced is None:
+            apps_to_sync.append(app)
         else:
             logger.info(
-                f"Skipping the app because it was recently synced. {redis.ttl(key)} seconds left. UUID: {app.uuid}"
+                f"Skipping the app because it was recently synced. UUID: {app.uuid}"
             )
 
+    return apps_to_sync
+
+
+def fetch_in_batches(requests: Iterable[Tuple[str, str]], fetch: Callable) -> dict:
+    """
+    Groups the (access_token, object_id) requests by access token in Graph API
+    batches of up to GRAPH_BATCH_MAX_REQUESTS objects and runs
+    `fetch(access_token, object_ids)` for them, with at most
+    WHATSAPP_SYNC_BATCH_CONCURRENCY batches in flight.
+
+    Returns the result of each (access_token, object_id), which is an exception
+    when the request failed.
+    """
+    object_ids_by_token = {}
+    for access_token, object_id in requests:
+        object_ids_by_token.setdefault(access_token, {})[object_id] = None
+
+    batches = []
+    for access_token, object_ids in object_ids_by_token.items():
+        object_ids = list(object_ids)
+        for start in range(0, len(object_ids), GRAPH_BATCH_MAX_REQUESTS):
+            end = start + GRAPH_BATCH_MAX_REQUESTS
+            batches.append((access_token, object_ids[start:end]))
+
+    results = {}
+    if not batches:
+        return results
+
+    max_workers = min(settings.WHATSAPP_SYNC_BATCH_CONCURRENCY, len(batches))
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {
+            executor.submit(fetch, access_token, object_ids): (access_token, object_ids)
+            for access_token, object_ids in batches
+        }
+        for future in as_completed(futures):
+            access_token, object_ids = futures[future]
+            try:
+                batch_results = future.result()
+            except Exception as error:
+                batch_results = [error] * len(object_ids)
 
-@celery_app.task(name="sync_whatsapp_cloud_wabas")
-def sync_whatsapp_cloud_wabas():
-    apptype = APPTYPES.get("wpp-cloud")
-    redis = get_redis_connection()
+            for object_id, result in zip(object_ids, batch_results):
+                results[(access_token, object_id)] = result
 
-    for app in apptype.apps:
-        key = SYNC_WHATSAPP_WABA_LOCK_KEY.format(app_uuid=str(app.uuid))
+    return results
 
-        if redis.get(key) is None:
-            config = app.config
-            wa_waba_id = config.get("wa_waba_id", None)
 
-            if wa_waba_id is None:
-                logger.info(
-                    f"Skipping the app because it doesn't contain `wa_waba_id`. UUID: {app.uuid}"
-                )
-                continue
+def get_phone_number_config(phone_number: dict) -> dict:
+    consent_status = phone_number.get("cert_status", None)
+    certificate = phone_number.get("certificate", None)
 
-            logger.info(f"Syncing app WABA. UUID: {app.uuid}")
+    config = dict(
+        id=phone_number.get("id", None),
+        display_phone_number=phone_number.get("display_phone_number", None),
+        display_name=phone_number.get("verified_name", None),
+    )
 
-            api = FacebookWABAApi(apptype.get_access_token(app))
+    if consent_status is not None:
+        config["cert_status"] = consent_status
 
-            try:
-                waba = api.get_waba(wa_waba_id)
-                app.config["waba"] = waba
-                app.modified_by = User.objects.get_admin_user()
-                app.save()
+    if certificate is not None:
+        config["certificate"] = certificate
 
-                redis.set(
-                    key, "synced", settings.WHATSAPP_TIME_BETWEEN_SYNC_WABA_IN_HOURS
-                )
-            except FacebookApiException as error:
-                logger.error(
-                    f"An error occurred while trying to sync the app. UUID: {app.uuid}. Error: {error}"
-                )
-                continue
+    return config
 
-        else:
-            logger.info(
-                f"Skipping the app because it was recently synced. {redis.ttl(key)} seconds left. UUID: {app.uuid}"
-            )
 
+def set_app_config(app: App, field: str, value, changed_apps: Dict[App, dict]):
+    if app.config.get(field) != value:
+        app.config[field] = value
+        changed_apps.setdefault(app, {})[field] = value
 
-@celery_app.task(name="sync_whatsapp_phone_numbers")
-def sync_whatsapp_phone_numbers():
-    apptype = APPTYPES.get("wpp")
-    redis = get_redis_connection()
 
-    def config_app_phone_number(app: App, phone_number: dict):
-        phone_number_id = phone_number.get("id", None)
-        display_phone_number = phone_number.get("display_phone_number", None)
-        verified_name = phone_number.get("verified_name", None)
-        consent_status = phone_number.get("cert_status", None)
-        certificate = phone_number.get("certificate", None)
-
-        app.config["phone_number"] = dict(
-            id=phone_number_id,
-            display_phone_number=display_phone_number,
-            display_name=verified_name,
-        )
+def save_synced_apps(
+    redis, lock_key: str, ttl: int, synced_apps, changed_apps: Dict[App, dict]
+):
+    """
+    Writes the synced config fields of the changed apps with bulk queries and
+    marks the synced apps, so they are skipped until the lock key expires.
 
-        if consent_status is not None:
-            app.config["phone_number"]["cert_status"] = consent_status
+    The apps are read again, locked, before writing, so config changes made
+    while they were synced are kept.
+    """
+    if changed_apps:
+        modified_by = User.objects.get_admin_user()
+        modified_on = timezone.now()
+        synced_fields = {app.pk: fields for app, fields in changed_apps.items()}
 
-        if certificate is not None:
-            app.config["phone_number"]["certificate"] = certificate
+        with transaction.atomic():
+            apps = list(
+                App.objects.select_for_update()
+                .filter(pk__in=synced_fields)
+                .order_by("pk")
+            )
+            changed_waba_ids = set()
+
+            for app in apps:
+                previous_waba_id = app.waba_id
+                app.config.update(synced_fields[app.pk])
+                app.modified_by = modified_by
+                app.modified_on = modified_on
+                app.update_meta_ids()
+                if app.waba_id != previous_waba_id:
+                    changed_waba_ids.update([previous_waba_id, app.waba_id])
+
+            App.objects.bulk_update(
+                apps,
+                ["config", "modified_by", "modified_on", *App.META_ID_FIELDS],
+                batch_size=SYNC_BULK_UPDATE_BATCH_SIZE,
+            )
+            if changed_waba_ids:
+                transaction.on_commit(
+                    lambda: AppsByWabaCache.invalidate(*changed_waba_ids)
+                )
 
-        app.save()
+    if synced_apps:
+        pipeline = redis.pipeline()
+        for app in synced_apps:
+            pipeline.set(lock_key.format(app_uuid=str(app.uuid)), "synced", ttl)
+        pipeline.execute()
 
-    error_counts = {}
 
-    for app in apptype.apps:
-        key = SYNC_WHATSAPP_PHONE_NUMBER_LOCK_KEY.format(app_uuid=str(app.uuid))
+def count_error(error_counts: dict, error: Exception):
+    error_message = str(error)
+    error_counts[error_message] = error_counts.get(error_message, 0) + 1
 
-        if redis.get(key) is None:
-            config = app.config
-            access_token = config.get("fb_access_token", None)
-            business_id = config.get("fb_business_id", None)
 
-            if access_token is None:
-                logger.info(
-                    f"Skipping the app because it doesn't contain `fb_access_token`. UUID: {app.uuid}"
-                )
-                continue
+def log_error_counts(error_counts: dict):
+    if error_counts:
+        total_errors = sum(error_counts.values())
+        logger.error(
+            f"Sync phone numbers task failed with {total_errors}.",
+            extra={"erros": error_counts},
+        )
 
-            if business_id is None:
-                logger.info(
-                    f"Skipping the app because it doesn't contain `fb_business_id`. UUID: {app.uuid}"
-                )
-                continue
 
-            logger.info(f"Syncing app phone number. UUID: {app.uuid}")
+def sync_apps_wabas(redis, apps_waba_requests: List[Tuple[App, str, str]]):
+    """Fetches the WABA of each (app, access_token, waba_id) and saves the changes."""
+    results = fetch_in_batches(
+        [(access_token, waba_id) for _, access_token, waba_id in apps_waba_requests],
+        lambda access_token, waba_ids: FacebookWABAApi(access_token).get_wabas(
+            waba_ids
+        ),
+    )
+
+    synced_apps = []
+    changed_apps = {}
+    for app, access_token, waba_id in apps_waba_requests:
+        waba = results.get((access_token, waba_id))
+        if isinstance(waba, Exception):
+            logger.error(
+                f"An error occurred while trying to sync the app. UUID: {app.uuid}. Error: {waba}"
+            )
+            continue
 
-            api = FacebookPhoneNumbersAPI(access_token)
+        set_app_config(app, "waba", waba, changed_apps)
+        synced_apps.append(app)
 
-            phone_number_id = config.get("phone_number", {}).get("id", None)
+    save_synced_apps(
+        redis,
+        SYNC_WHATSAPP_WABA_LOCK_KEY,
+        settings.WHATSAPP_TIME_BETWEEN_SYNC_WABA_IN_HOURS,
+        synced_apps,
+        changed_apps,
+    )
 
-            try:
-                if phone_number_id is not None:
-                    phone_number = api.get_phone_number(phone_number_id)
-                    config_app_phone_number(app, phone_number)
 
-                else:
-                    try:
-                        app_phone_number = phonenumbers.parse(config.get("title", None))
-                    except NumberParseException:
-                        logger.info(
-                            f"Skipping the app because it doesn't contain `title`. UUID: {app.uuid}"
-                        )
-                        continue
+@celery_app.task(name="sync_whatsapp_wabas")
+def sync_whatsapp_wabas():
+    apptype = APPTYPES.get("wpp")
+    redis = get_redis_connection()
 
-                    phone_numbers = api.get_phone_numbers(business_id)
+    apps_waba_requests = []
+    for app in get_apps_to_sync(redis, apptype.apps, SYNC_WHATSAPP_WABA_LOCK_KEY):
+        config = app.config
+        access_token = config.get("fb_access_token", None)
+        business_id = config.get("fb_business_id", None)
 
-                    for phone_number in phone_numbers:
-                        display_phone_number = phone_number.get("display_phone_number")
+        if access_token is None:
+            logger.info(
+                f"Skipping the app because it doesn't contain `fb_access_token`. UUID: {app.uuid}"
+            )
+            continue
 
-                        if phonenumbers.parse(display_phone_number) == app_phone_number:
-                            config_app_phone_number(app, phone_number)
+        if business_id is None:
+            logger.info(
+                f"Skipping the app because it doesn't contain `fb_business_id`. UUID: {app.uuid}"
+            )
+            continue
 
-                redis.set(
-                    key,
-                    "synced",
-                    settings.WHATSAPP_TIME_BETWEEN_SYNC_PHONE_NUMBERS_IN_HOURS,
-                )
-            except FacebookApiException as error:
-                error_message = str(error)
-                if error_message in error_counts:
-                    error_counts[error_message] += 1
-                else:
-                    error_counts[error_message] = 1
-                logger.info(
-                    f"An error occurred while trying to sync the app phone number. UUID: {app.uuid}. Error: {error}"
-                )
+        logger.info(f"Syncing app WABA. UUID: {app.uuid}")
+        apps_waba_requests.append((app, access_token, business_id))
 
-        else:
+    sync_apps_wabas(redis, apps_waba_requests)
+
+
+@celery_app.task(name="sync_whatsapp_cloud_wabas")
+def sync_whatsapp_cloud_wabas():
+    apptype = APPTYPES.get("wpp-cloud")
+    redis = get_redis_connection()
+
+    apps_waba_requests = []
+    for app in get_apps_to_sync(redis, apptype.apps, SYNC_WHATSAPP_WABA_LOCK_KEY):
+        wa_waba_id = app.config.get("wa_waba_id", None)
+
+        if wa_waba_id is None:
             logger.info(
-                f"Skipping the app because it was recently synced. {redis.ttl(key)} seconds left. UUID: {app.uuid}"
+                f"Skipping the app because it doesn't contain `wa_waba_id`. UUID: {app.uuid}"
             )
+            continue
 
-    if error_counts:
-        total_errors = sum(error_counts.values())
-        logger.error(
-            f"Sync phone numbers task failed with {total_errors}",
-            extra={"erros": error_counts},
-        )
+        logger.info(f"Syncing app WABA. UUID: {app.uuid}")
+        apps_waba_requests.append((app, apptype.get_access_token(app), wa_waba_id))
 
+    sync_apps_wabas(redis, apps_waba_requests)
 
-@celery_app.task(name="sync_whatsapp_cloud_phone_numbers")
-def sync_whatsapp_cloud_phone_numbers():
-    apptype = APPTYPES.get("wpp-cloud")
+
+@celery_app.task(name="sync_whatsapp_phone_numbers")
+def sync_whatsapp_phone_numbers():
+    apptype = APPTYPES.get("wpp")
     redis = get_redis_connection()
 
     error_counts = {}
+    by_id_requests = []
+    by_waba_requests = []
+
+    for app in get_apps_to_sync(
+        redis, apptype.apps, SYNC_WHATSAPP_PHONE_NUMBER_LOCK_KEY
+    ):
+        config = app.config
+        access_token = config.get("fb_access_token", None)
+        business_id = config.get("fb_business_id", None)
+
+        if access_token is None:
+            logger.info(
+                f"Skipping the app because it doesn't contain `fb_access_token`. UUID: {app.uuid}"
+            )
+            continue
+
+        if business_id is None:
+            logger.info(
+                f"Skipping the app because it doesn't contain `fb_business_id`. UUID: {app.uuid}"
+            )
+            continue
+
+        logger.info(f"Syncing app phone number. UUID: {app.uuid}")
+
+        phone_number_id = config.get("phone_number", {}).get("id", None)
 
-    for app in apptype.apps:
-        key = SYNC_WHATSAPP_PHONE_NUMBER_LOCK_KEY.format(app_uuid=str(app.uuid))
+        if phone_number_id is not None:
+            by_id_requests.append((app, access_token, phone_number_id))
+            continue
+
+        try:
+            app_phone_number = phonenumbers.parse(config.get("title", None))
+        except NumberParseException:
+            logger.info(
+                f"Skipping the app because it doesn't contain `title`. UUID: {app.uuid}"
+            )
+            continue
 
-        if redis.get(key) is None:
-            phone_number_id = app.config.get("wa_phone_number_id", None)
+        by_waba_requests.append((app, access_token, business_id, app_phone_number))
+
+    phone_numbers = fetch_in_batches(
+        [(access_token, object_id) for _, access_token, object_id in by_id_requests],
+        lambda access_token, ids: FacebookPhoneNumbersAPI(
+            access_token
+        ).get_phone_numbers_by_ids(ids),
+    )
+    waba_phone_numbers = fetch_in_batches(
+        [(access_token, waba_id) for _, access_token, waba_id, _ in by_waba_requests],
+        lambda access_token, waba_ids: FacebookPhoneNumbersAPI(
+            access_token
+        ).get_phone_numbers_by_wabas(waba_ids),
+    )
+
+    synced_apps = []
+    changed_apps = {}
+
+    for app, access_token, phone_number_id in by_id_requests:
+        phone_number = phone_numbers.get((access_token, phone_number_id))
+        if isinstance(phone_number, Exception):
+            count_error(error_counts, phone_number)
+            logger.info(
+                f"An error occurred while trying to sync the app phone number. UUID: {app.uuid}. Error: {phone_number}"
+            )
+            continue
 
-            if phone_number_id is None:
-                logger.info(
-                    f"Skipping the app because it doesn't contain `wa_phone_number_id`. UUID: {app.uuid}"
+        set_app_config(
+            app, "phone_number", get_phone_number_config(phone_number), changed_apps
+        )
+        synced_apps.append(app)
+
+    for app, access_token, business_id, app_phone_number in by_waba_requests:
+        waba_numbers = waba_phone_numbers.get((access_token, business_id))
+        if isinstance(waba_numbers, Exception):
+            count_error(error_counts, waba_numbers)
+            logger.info(
+                f"An error occurred while trying to sync the app phone number. UUID: {app.uuid}. Error: {waba_numbers}"
+            )
+            continue
+
+        for phone_number in waba_numbers:
+            try:
+                display_phone_number = phonenumbers.parse(
+                    phone_number.get("display_phone_number")
                 )
+            except NumberParseException:
                 continue
 
-            try:
-                api = FacebookPhoneNumbersAPI(apptype.get_access_token(app))
-                phone_number = api.get_phone_number(phone_number_id)
-
-                phone_number_id = phone_number.get("id", None)
-                display_phone_number = phone_number.get("display_phone_number", None)
-                verified_name = phone_number.get("verified_name", None)
-                consent_status = phone_number.get("cert_status", None)
-                certificate = phone_number.get("certificate", None)
-
-                app.config["phone_number"] = dict(
-                    id=phone_number_id,
-                    display_phone_number=display_phone_number,
-                    display_name=verified_name,
+            if display_phone_number == app_phone_number:
+                set_app_config(
+                    app,
+                    "phone_number",
+                    get_phone_number_config(phone_number),
+                    changed_apps,
                 )
+                break
 
-                if consent_status is not None:
-                    app.config["phone_number"]["cert_status"] = consent_status
+        synced_apps.append(app)
 
-                if certificate is not None:
-                    app.config["phone_number"]["certificate"] = certificate
+    save_synced_apps(
+        redis,
+        SYNC_WHATSAPP_PHONE_NUMBER_LOCK_KEY,
+        settings.WHATSAPP_TIME_BETWEEN_SYNC_PHONE_NUMBERS_IN_HOURS,
+        synced_apps,
+        changed_apps,
+    )
+    log_error_counts(error_counts)
 
-                app.modified_by = User.objects.get_admin_user()
 
-                app.save()
-                redis.set(
-                    key,
-                    "synced",
-                    settings.WHATSAPP_TIME_BETWEEN_SYNC_PHONE_NUMBERS_IN_HOURS,
-                )
+@celery_app.task(name="sync_whatsapp_cloud_phone_numbers")
+def sync_whatsapp_cloud_phone_numbers():
+    apptype = APPTYPES.get("wpp-cloud")
+    redis = get_redis_connection()
 
-            except Exception as e:
-                error_message = str(e)
-                if error_message in error_counts:
-                    error_counts[error_message] += 1
-                else:
-                    error_counts[error_message] = 1
-                logger.info(f"sync_whatsapp_cloud_phone_numbers:{e}")
-                continue
+    error_counts = {}
+    requests = []
 
-        else:
+    for app in get_apps_to_sync(
+        redis, apptype.apps, SYNC_WHATSAPP_PHONE_NUMBER_LOCK_KEY
+    ):
+        phone_number_id = app.config.get("wa_phone_number_id", None)
+
+        if phone_number_id is None:
             logger.info(
-                f"Skipping the app because it was recently synced. {redis.ttl(key)} seconds left. UUID: {app.uuid}"
+                f"Skipping the app because it doesn't contain `wa_phone_number_id`. UUID: {app.uuid}"
             )
+            continue
 
-    if error_counts:
-        total_errors = sum(error_counts.values())
-        logger.error(
-            f"Sync phone numbers task failed with {total_errors}.",
-            extra={"erros": error_counts},
+        try:
+            requests.append((app, apptype.get_access_token(app), phone_number_id))
+        except Exception as e:
+            count_error(error_counts, e)
+            logger.info(f"sync_whatsapp_cloud_phone_numbers:{e}")
+
+    phone_numbers = fetch_in_batches(
+        [(access_token, object_id) for _, access_token, object_id in requests],
+        lambda access_token, ids: FacebookPhoneNumbersAPI(
+            access_token
+        ).get_phone_numbers_by_ids(ids),
+    )
+
+    synced_apps = []
+    changed_apps = {}
+
+    for app, access_token, phone_number_id in requests:
+        phone_number = phone_numbers.get((access_token, phone_number_id))
+        if isinstance(phone_number, Exception):
+            count_error(error_counts, phone_number)
+            logger.info(f"sync_whatsapp_cloud_phone_numbers:{phone_number}")
+            continue
+
+        set_app_config(
+            app, "phone_number", get_phone_number_config(phone_number), changed_apps
         )
+        synced_apps.append(app)
+
+    save_synced_apps(
+        redis,
+        SYNC_WHATSAPP_PHONE_NUMBER_LOCK_KEY,
+        settings.WHATSAPP_TIME_BETWEEN_SYNC_PHONE_NUMBERS_IN_HOURS,
+        synced_apps,
+        changed_apps,
+    )
+    log_error_counts(error_counts)
 
 
 def delete_inactive_apps(apps, flow_object_uuid):
@@ -1,3 +1,5 @@
+import json
+
 from typing import TYPE_CHECKING
 from unittest.mock import patch
 
@@ -7,7 +9,7 @@ if TYPE_CHECKING:
 from django.test import TestCase
 
 from marketplace.core.tests import FakeRequestsResponse
-from ..apis import FacebookConversationAPI
+from ..apis import FacebookConversationAPI, FacebookWABAApi, FacebookPhoneNumbersAPI
 from marketplace.core.types.channels.whatsapp_base.exceptions import (
     FacebookApiException,
 )
@@ -40,3 +42,58 @@ class FacebookConversationAPITestCase(TestCase):
         fields = self.api._get_fields("123", "321")
         self.assertIn("start(123)", fields)
         self.assertIn("end(321)", fields)
+
+
+class FacebookGraphBatchTestCase(TestCase):
+    @patch("requests.request")
+    def test_get_wabas_sends_a_single_batch_request(self, mock: "MagicMock"):
+        mock.return_value = FakeRequestsResponse(
+            [
+                {"code": 200, "body": json.dumps({"id": "1", "name": "WABA"})},
+                {
+                    "code": 400,
+                    "body": json.dumps({"error": {"message": "Invalid WABA"}}),
+                },
+                None,
+            ]
+        )
+
+        wabas = FacebookWABAApi("token").get_wabas(["1", "2", "3"])
+
+        self.assertEqual(mock.call_count, 1)
+        method, _ = mock.call_args.args
+        self.assertEqual(method, "POST")
+        batch = json.loads(mock.call_args.kwargs["data"]["batch"])
+        self.assertEqual(
+            [request["relative_url"] for request in batch], ["1", "2", "3"]
+        )
+
+        self.assertEqual(wabas[0], {"id": "1", "name": "WABA"})
+        self.assertIsInstance(wabas[1], FacebookApiException)
+        self.assertEqual(str(wabas[1]), "Invalid WABA")
+        self.assertIsInstance(wabas[2], FacebookApiException)
+
+    @patch("requests.request")
+    def test_batch_request_error_is_raised(self, mock: "MagicMock"):
+        mock.return_value = FakeRequestsResponse({"error": {"message": "Bad token"}})
+
+        with self.assertRaisesMessage(FacebookApiException, "Bad token"):
+            FacebookWABAApi("token").get_wabas(["1"])
+
+    def test_batch_request_accepts_up_to_50_requests(self):
+        with self.assertRaises(ValueError):
+            FacebookWABAApi("token").get_wabas([str(index) for index in range(51)])
+
+    @patch("requests.request")
+    def test_get_phone_numbers_by_wabas(self, mock: "MagicMock"):
+        mock.return_value = FakeRequestsResponse(
+            [{"code": 200, "body": json.dumps({"data": [{"id": "10"}]})}]
+        )
+
+        phone_numbers = FacebookPhoneNumbersAPI("token").get_phone_numbers_by_wabas(
+            ["1"]
+        )
+
+        batch = json.loads(mock.call_args.kwargs["data"]["batch"])
+        self.assertEqual(batch[0]["relative_url"], "1/phone_numbers")
+        self.assertEqual(phone_numbers, [[{"id": "10"}]])
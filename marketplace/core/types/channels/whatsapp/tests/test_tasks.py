@@ -15,6 +15,12 @@ from marketplace.core.types.channels.whatsapp.tasks import sync_whatsapp_phone_n
 from marketplace.core.types.channels.whatsapp.tasks import (
     sync_whatsapp_cloud_phone_numbers,
 )
+from marketplace.core.types.channels.whatsapp.tasks import fetch_in_batches
+from marketplace.core.types.channels.whatsapp.tasks import (
+    SYNC_WHATSAPP_WABA_LOCK_KEY,
+    save_synced_apps,
+    set_app_config,
+)
 
 from marketplace.applications.models import App
 
@@ -35,6 +41,7 @@ class SyncWhatsAppAppsTaskTestCase(TestCase):
     def setUp(self) -> None:
         self.redis_mock = MagicMock()
         self.redis_mock.get.return_value = None
+        self.redis_mock.mget.side_effect = lambda keys: [None] * len(keys)
 
         lock_mock = MagicMock()
         lock_mock.__enter__.return_value = None
@@ -213,7 +220,7 @@ class SyncWhatsAppAppsTaskTestCase(TestCase):
 
         list_channel_mock.return_value = channel_value
 
-        apptype_mock.return_value.create_app.side_effect = Exception()
+        apptype_mock.return_value.build_app.side_effect = Exception()
         mock_redis.return_value = self.redis_mock
 
         sync_whatsapp_apps()
@@ -312,11 +319,101 @@ class SyncWhatsAppAppsTaskTestCase(TestCase):
             f"The channel {flow_object_uuid} does not have a project_uuid."
         )
 
+    @patch("marketplace.core.types.channels.whatsapp.tasks.get_redis_connection")
+    @patch("marketplace.connect.client.ConnectProjectClient.list_channels")
+    def test_sync_uses_constant_number_of_queries(
+        self, list_channel_mock: "MagicMock", mock_redis
+    ) -> None:
+        channels = [
+            self._get_mock_value(str(uuid4()), str(uuid4()))[0] for _ in range(10)
+        ]
+        channels += self._get_mock_value(
+            self.wpp_app.project_uuid,
+            self.wpp_app.flow_object_uuid,
+            config={"auth_token": "54321"},
+        )
+        list_channel_mock.return_value = channels
+        mock_redis.return_value = self.redis_mock
+
+        # Apps lookup, admin user, update and the insert in its transaction
+        with self.assertNumQueries(6):
+            sync_whatsapp_apps()
+
+        self.assertEqual(
+            App.objects.filter(
+                flow_object_uuid__in=[channel["uuid"] for channel in channels]
+            ).count(),
+            11,
+        )
+        app = App.objects.get(uuid=self.wpp_app.uuid)
+        self.assertEqual(app.config.get("auth_token"), "54321")
+
+    @patch("marketplace.core.types.channels.whatsapp.tasks.get_redis_connection")
+    @patch("marketplace.connect.client.ConnectProjectClient.list_channels")
+    def test_unchanged_apps_are_not_written(
+        self, list_channel_mock: "MagicMock", mock_redis
+    ) -> None:
+        list_channel_mock.return_value = self._get_mock_value(
+            self.wpp_app.project_uuid,
+            self.wpp_app.flow_object_uuid,
+            config={"auth_token": "12345"},
+        )
+        mock_redis.return_value = self.redis_mock
+
+        with patch.object(App.objects, "bulk_update") as bulk_update_mock:
+            sync_whatsapp_apps()
+
+        bulk_update_mock.assert_not_called()
+
+    @patch("marketplace.core.types.channels.whatsapp.tasks.AppsByWabaCache")
+    @patch("marketplace.core.types.channels.whatsapp.tasks.get_redis_connection")
+    @patch("marketplace.connect.client.ConnectProjectClient.list_channels")
+    def test_apps_by_waba_cache_is_invalidated_for_new_apps(
+        self, list_channel_mock: "MagicMock", mock_redis, apps_by_waba_cache_mock
+    ) -> None:
+        list_channel_mock.return_value = self._get_mock_value(
+            str(uuid4()), str(uuid4()), config={"waba": {"id": "10"}}
+        )
+        mock_redis.return_value = self.redis_mock
+
+        with self.captureOnCommitCallbacks(execute=True):
+            sync_whatsapp_apps()
+
+        apps_by_waba_cache_mock.invalidate.assert_called_once_with("10")
+
+    @patch("marketplace.core.types.channels.whatsapp.tasks.AppsByWabaCache")
+    @patch("marketplace.core.types.channels.whatsapp.tasks.get_redis_connection")
+    @patch("marketplace.connect.client.ConnectProjectClient.list_channels")
+    def test_apps_by_waba_cache_is_invalidated_for_updated_apps(
+        self, list_channel_mock: "MagicMock", mock_redis, apps_by_waba_cache_mock
+    ) -> None:
+        # The WABA id column was not filled when the app was written
+        self.wpp_app.config["waba"] = {"id": "10"}
+        App.objects.filter(pk=self.wpp_app.pk).update(
+            config=self.wpp_app.config, waba_id=None
+        )
+        list_channel_mock.return_value = self._get_mock_value(
+            self.wpp_app.project_uuid,
+            self.wpp_app.flow_object_uuid,
+            config={"auth_token": "54321"},
+        )
+        mock_redis.return_value = self.redis_mock
+
+        with self.captureOnCommitCallbacks(execute=True):
+            sync_whatsapp_apps()
+
+        apps_by_waba_cache_mock.invalidate.assert_called_once()
+        self.assertEqual(
+            set(apps_by_waba_cache_mock.invalidate.call_args.args), {None, "10"}
+        )
+        self.assertEqual(App.objects.get(pk=self.wpp_app.pk).waba_id, "10")
+
 
 class SyncWhatsappCloudWabaViewTestCase(TestCase):
     def setUp(self) -> None:
         self.redis_mock = MagicMock()
         self.redis_mock.get.return_value = None
+        self.redis_mock.mget.side_effect = lambda keys: [None] * len(keys)
 
         lock_mock = MagicMock()
         lock_mock.__enter__.return_value = None
@@ -364,7 +461,9 @@ class SyncWhatsappCloudWabaViewTestCase(TestCase):
 
         apptypes_mock.get.return_value = MagicMock(apps=[app])
 
-        facebook_waba_api_mock.return_value = MagicMock(get_waba=lambda x: "0123456789")
+        facebook_waba_api_mock.return_value = MagicMock(
+            get_wabas=lambda ids: [{"id": id} for id in ids]
+        )
         sync_whatsapp_cloud_wabas()
         self.assertNotEqual(before_config, app.config)
 
@@ -388,8 +487,8 @@ class SyncWhatsappCloudWabaViewTestCase(TestCase):
         before_config = app.config.copy()
 
         apptypes_mock.get.return_value = MagicMock(apps=[app])
-        facebook_waba_api_mock.return_value.get_waba.side_effect = FacebookApiException(
-            "Something wrong"
+        facebook_waba_api_mock.return_value.get_wabas.side_effect = (
+            FacebookApiException("Something wrong")
         )
 
         sync_whatsapp_cloud_wabas()
@@ -404,6 +503,7 @@ class SyncWhatsappCloudWabaViewTestCase(TestCase):
     ):
         redis = redis_mock.return_value
         redis.ttl.return_value = timedelta(hours=1).seconds
+        redis.mget.side_effect = lambda keys: ["synced"] * len(keys)
 
         data = {"wa_waba_id": "0123456789", "waba": "0123456789"}
         wpp_cloud_type = self.type
@@ -418,7 +518,9 @@ class SyncWhatsappCloudWabaViewTestCase(TestCase):
         redis.set(key, "synced", timedelta(minutes=30).seconds)
 
         apptypes_mock.get.return_value = MagicMock(apps=[app])
-        facebook_waba_api_mock.return_value = MagicMock(get_waba=lambda x: "0123456789")
+        facebook_waba_api_mock.return_value = MagicMock(
+            get_wabas=lambda ids: [{"id": id} for id in ids]
+        )
 
         sync_whatsapp_cloud_wabas()
         # Simulates situation where the application has already been synchronized
@@ -429,6 +531,7 @@ class SyncWhatsappWabaViewTestCase(TestCase):
     def setUp(self) -> None:
         self.redis_mock = MagicMock()
         self.redis_mock.get.return_value = None
+        self.redis_mock.mget.side_effect = lambda keys: [None] * len(keys)
 
         lock_mock = MagicMock()
         lock_mock.__enter__.return_value = None
@@ -495,7 +598,9 @@ class SyncWhatsappWabaViewTestCase(TestCase):
             created_by=User.objects.get_admin_user(),
         )
         before_config = app.config.copy()
-        facebook_waba_api_mock.return_value = MagicMock(get_waba=lambda x: "0123456789")
+        facebook_waba_api_mock.return_value = MagicMock(
+            get_wabas=lambda ids: [{"id": id} for id in ids]
+        )
         apptypes_mock.get.return_value = MagicMock(apps=[app])
         sync_whatsapp_wabas()
         # Assert the app has modifiedy after runing sync task
@@ -525,8 +630,8 @@ class SyncWhatsappWabaViewTestCase(TestCase):
         before_config = app.config.copy()
 
         apptypes_mock.get.return_value = MagicMock(apps=[app])
-        facebook_waba_api_mock.return_value.get_waba.side_effect = FacebookApiException(
-            "Something wrong"
+        facebook_waba_api_mock.return_value.get_wabas.side_effect = (
+            FacebookApiException("Something wrong")
         )
 
         sync_whatsapp_wabas()
@@ -541,6 +646,7 @@ class SyncWhatsappWabaViewTestCase(TestCase):
     ):
         redis = redis_mock.return_value
         redis.ttl.return_value = timedelta(hours=1).seconds
+        redis.mget.side_effect = lambda keys: ["synced"] * len(keys)
 
         data = {
             "wa_waba_id": "0123456789",
@@ -559,7 +665,9 @@ class SyncWhatsappWabaViewTestCase(TestCase):
         redis.set(key, "synced", timedelta(minutes=30).seconds)
 
         apptypes_mock.get.return_value = MagicMock(apps=[app])
-        facebook_waba_api_mock.return_value = MagicMock(get_waba=lambda x: "0123456789")
+        facebook_waba_api_mock.return_value = MagicMock(
+            get_wabas=lambda ids: [{"id": id} for id in ids]
+        )
 
         sync_whatsapp_wabas()
         # Simulates situation where the application has already been synchronized
@@ -570,6 +678,7 @@ class SyncWhatsappPhoneNumberViewTestCase(TestCase):
     def setUp(self) -> None:
         self.redis_mock = MagicMock()
         self.redis_mock.get.return_value = None
+        self.redis_mock.mget.side_effect = lambda keys: [None] * len(keys)
 
         lock_mock = MagicMock()
         lock_mock.__enter__.return_value = None
@@ -611,7 +720,7 @@ class SyncWhatsappPhoneNumberViewTestCase(TestCase):
         )
         before_config = app.config.copy()
         facebook_get_phone_number_api_mock.return_value = MagicMock(
-            get_phone_number=lambda x: phone_number_data
+            get_phone_numbers_by_ids=lambda ids: [phone_number_data for _ in ids]
         )
         apptypes_mock.get.return_value = MagicMock(apps=[app])
         sync_whatsapp_phone_numbers()
@@ -701,7 +810,7 @@ class SyncWhatsappPhoneNumberViewTestCase(TestCase):
         )
         before_config = app.config.copy()
         facebook_get_phone_number_api_mock.return_value = MagicMock(
-            get_phone_numbers=lambda x: [phone_number_data]
+            get_phone_numbers_by_wabas=lambda ids: [[phone_number_data] for _ in ids]
         )
         apptypes_mock.get.return_value = MagicMock(apps=[app])
         sync_whatsapp_phone_numbers()
@@ -731,8 +840,8 @@ class SyncWhatsappPhoneNumberViewTestCase(TestCase):
         )
         before_config = app.config.copy()
         apptypes_mock.get.return_value = MagicMock(apps=[app])
-        facebook_get_phone_number_api_mock.return_value.get_phone_number.side_effect = (
-            FacebookApiException("Something wrong")
+        facebook_get_phone_number_api_mock.return_value.get_phone_numbers_by_ids.side_effect = FacebookApiException(
+            "Something wrong"
         )
 
         sync_whatsapp_phone_numbers()
@@ -775,6 +884,7 @@ class SyncWhatsappPhoneNumberViewTestCase(TestCase):
     ):
         redis = mock_redis.return_value
         redis.ttl.return_value = timedelta(hours=1).seconds
+        redis.mget.side_effect = lambda keys: ["synced"] * len(keys)
 
         data = {
             "fb_access_token": "0123456789",
@@ -799,7 +909,7 @@ class SyncWhatsappPhoneNumberViewTestCase(TestCase):
         )
         before_config = app.config.copy()
         facebook_get_phone_number_api_mock.return_value = MagicMock(
-            get_phone_number=lambda x: phone_number_data
+            get_phone_numbers_by_ids=lambda ids: [phone_number_data for _ in ids]
         )
         apptypes_mock.get.return_value = MagicMock(apps=[app])
 
@@ -816,6 +926,7 @@ class SyncWhatsappCloudPhoneNumberViewTestCase(TestCase):
     def setUp(self) -> None:
         self.redis_mock = MagicMock()
         self.redis_mock.get.return_value = None
+        self.redis_mock.mget.side_effect = lambda keys: [None] * len(keys)
 
         lock_mock = MagicMock()
         lock_mock.__enter__.return_value = None
@@ -854,7 +965,7 @@ class SyncWhatsappCloudPhoneNumberViewTestCase(TestCase):
         )
         before_config = app.config.copy()
         facebook_get_phone_number_api_mock.return_value = MagicMock(
-            get_phone_number=lambda x: phone_number_data,
+            get_phone_numbers_by_ids=lambda ids: [phone_number_data for _ in ids],
         )
         apptypes_mock.get.return_value = MagicMock(apps=[app])
         sync_whatsapp_cloud_phone_numbers()
@@ -905,8 +1016,8 @@ class SyncWhatsappCloudPhoneNumberViewTestCase(TestCase):
         )
         before_config = app.config.copy()
         apptypes_mock.get.return_value = MagicMock(apps=[app])
-        facebook_get_phone_number_api_mock.return_value.get_phone_number.side_effect = (
-            FacebookApiException("Something wrong")
+        facebook_get_phone_number_api_mock.return_value.get_phone_numbers_by_ids.side_effect = FacebookApiException(
+            "Something wrong"
         )
 
         sync_whatsapp_cloud_phone_numbers()
@@ -921,6 +1032,7 @@ class SyncWhatsappCloudPhoneNumberViewTestCase(TestCase):
     ):
         redis = mock_redis.return_value
         redis.ttl.return_value = timedelta(hours=1).seconds
+        redis.mget.side_effect = lambda keys: ["synced"] * len(keys)
 
         data = {
             "wa_phone_number_id": "0123456789",
@@ -943,7 +1055,7 @@ class SyncWhatsappCloudPhoneNumberViewTestCase(TestCase):
         )
         before_config = app.config.copy()
         facebook_get_phone_number_api_mock.return_value = MagicMock(
-            get_phone_number=lambda x: phone_number_data
+            get_phone_numbers_by_ids=lambda ids: [phone_number_data for _ in ids]
         )
         apptypes_mock.get.return_value = MagicMock(apps=[app])
 
@@ -954,3 +1066,116 @@ class SyncWhatsappCloudPhoneNumberViewTestCase(TestCase):
 
         # Assert the app has not modifiedy after runing sync task
         self.assertEqual(before_config, app.config)
+
+
+class SyncWhatsappBatchesTestCase(TestCase):
+    def setUp(self) -> None:
+        self.redis_mock = MagicMock()
+        self.redis_mock.mget.side_effect = lambda keys: [None] * len(keys)
+        self.type = APPTYPES.get("wpp-cloud")
+
+        return super().setUp()
+
+    def create_app(self, config: dict) -> App:
+        return self.type.create_app(
+            config=config,
+            project_uuid=uuid4(),
+            flow_object_uuid=uuid4(),
+            created_by=User.objects.get_admin_user(),
+        )
+
+    def test_fetch_in_batches_groups_requests_by_access_token(self):
+        requests = [("token-1", str(index)) for index in range(120)]
+        requests += [("token-2", "0"), ("token-1", "0")]
+        fetch = MagicMock(side_effect=lambda token, ids: [f"{token}:{i}" for i in ids])
+
+        results = fetch_in_batches(requests, fetch)
+
+        batch_sizes = sorted(len(call.args[1]) for call in fetch.call_args_list)
+        self.assertEqual(batch_sizes, [1, 20, 50, 50])
+        self.assertEqual(results[("token-1", "119")], "token-1:119")
+        self.assertEqual(results[("token-2", "0")], "token-2:0")
+
+    def test_fetch_in_batches_returns_the_error_of_failed_batches(self):
+        error = FacebookApiException("Something wrong")
+        fetch = MagicMock(side_effect=error)
+
+        results = fetch_in_batches([("token", "1"), ("token", "2")], fetch)
+
+        self.assertEqual(results, {("token", "1"): error, ("token", "2"): error})
+
+    @patch("marketplace.core.types.channels.whatsapp.tasks.FacebookWABAApi")
+    @patch("marketplace.core.types.channels.whatsapp.tasks.APPTYPES")
+    @patch("marketplace.core.types.channels.whatsapp.tasks.get_redis_connection")
+    def test_only_changed_configs_are_written(
+        self, mock_redis, apptypes_mock, facebook_waba_api_mock
+    ):
+        mock_redis.return_value = self.redis_mock
+        unchanged_app = self.create_app({"wa_waba_id": "1", "waba": {"id": "1"}})
+        changed_app = self.create_app({"wa_waba_id": "2"})
+        failed_app = self.create_app({"wa_waba_id": "3"})
+
+        def get_wabas(waba_ids):
+            return [
+                FacebookApiException("Invalid WABA")
+                if waba_id == "3"
+                else {"id": waba_id}
+                for waba_id in waba_ids
+            ]
+
+        facebook_waba_api_mock.return_value.get_wabas.side_effect = get_wabas
+        apptypes_mock.get.return_value = MagicMock(
+            apps=App.objects.filter(
+                uuid__in=[unchanged_app.uuid, changed_app.uuid, failed_app.uuid]
+            ),
+            get_access_token=self.type.get_access_token,
+        )
+
+        with patch.object(
+            App.objects, "bulk_update", wraps=App.objects.bulk_update
+        ) as bulk_update_mock:
+            sync_whatsapp_cloud_wabas()
+
+        facebook_waba_api_mock.return_value.get_wabas.assert_called_once()
+        updated_apps = bulk_update_mock.call_args.args[0]
+        self.assertEqual([app.uuid for app in updated_apps], [changed_app.uuid])
+
+        changed_app.refresh_from_db()
+        self.assertEqual(changed_app.config["waba"], {"id": "2"})
+        self.assertEqual(changed_app.waba_id, "2")
+
+        synced_keys = {
+            call.args[0]
+            for call in self.redis_mock.pipeline.return_value.set.call_args_list
+        }
+        self.assertEqual(
+            synced_keys,
+            {
+                f"sync-whatsapp-waba-lock-app:{unchanged_app.uuid}",
+                f"sync-whatsapp-waba-lock-app:{changed_app.uuid}",
+            },
+        )
+
+    def test_config_changes_made_during_the_sync_are_kept(self):
+        app = self.create_app({"wa_waba_id": "2"})
+        synced_app = App.objects.get(pk=app.pk)
+        changed_apps = {}
+        set_app_config(synced_app, "waba", {"id": "2"}, changed_apps)
+
+        # Edited after the app was read by the sync
+        App.objects.filter(pk=app.pk).update(
+            config={"wa_waba_id": "2", "title": "Edited"}
+        )
+
+        save_synced_apps(
+            self.redis_mock,
+            SYNC_WHATSAPP_WABA_LOCK_KEY,
+            60,
+            [synced_app],
+            changed_apps,
+        )
+
+        app.refresh_from_db()
+        self.assertEqual(
+            app.config, {"wa_waba_id": "2", "title": "Edited", "waba": {"id": "2"}}
+        )
@@ -5,6 +5,7 @@ from unittest.mock import MagicMock
 
 from django.urls import reverse
 from django.utils.crypto import get_random_string
+from django.core.cache import cache
 from django.test import override_settings
 from rest_framework import status
 
@@ -315,20 +316,36 @@ class WhatsAppReportSentMessagesTestCase(APIBaseTestCase):
         self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
 
 
-class MockConversation(object):
-    def __dict__(self) -> dict:
-        return dict(
-            user_initiated=2,
-            business_initiated=2099,
-            total=2101,
-        )
-
-
+# Conversations are cached per day, each test starts with an empty cache
+LOCMEM_CACHES = {
+    "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}
+}
+
+CONVERSATION_DATA_POINTS = [
+    {
+        "start": 1685847600,
+        "end": 1685934000,
+        "conversation": 2,
+        "conversation_direction": "USER_INITIATED",
+        "conversation_category": "UNKNOWN",
+    },
+    {
+        "start": 1685847600,
+        "end": 1685934000,
+        "conversation": 2099,
+        "conversation_direction": "BUSINESS_INITIATED",
+        "conversation_category": "UNKNOWN",
+    },
+]
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
 class WhatsAppOnPremisseConversationsTestCase(APIBaseTestCase):
     view_class = WhatsAppViewSet
 
     def setUp(self):
         super().setUp()
+        cache.clear()
 
         self.app = App.objects.create(
             code="wpp",
@@ -353,10 +370,11 @@ class WhatsAppOnPremisseConversationsTestCase(APIBaseTestCase):
         return self.view_class.as_view({"get": "conversations"})
 
     @patch(
-        "marketplace.core.types.channels.whatsapp_base.requests.facebook.FacebookConversationAPI.conversations"
+        "marketplace.core.types.channels.whatsapp_base.requests.facebook."
+        "FacebookConversationAPI.conversation_data_points"
     )
     def test_get_conversations(self, mock_conversations):
-        mock_conversations.return_value = MockConversation()
+        mock_conversations.return_value = CONVERSATION_DATA_POINTS
 
         params = {
             "start": self.start_date,
@@ -366,7 +384,8 @@ class WhatsAppOnPremisseConversationsTestCase(APIBaseTestCase):
         self.assertEqual(response.status_code, status.HTTP_200_OK)
 
     @patch(
-        "marketplace.core.types.channels.whatsapp_base.requests.facebook.FacebookConversationAPI.conversations"
+        "marketplace.core.types.channels.whatsapp_base.requests.facebook."
+        "FacebookConversationAPI.conversation_data_points"
     )
     def test_get_conversations_with_facebook_api_exception(self, mock_conversations):
         error_message = "Facebook API exception"
@@ -0,0 +1,151 @@
+import calendar
+import logging
+
+from datetime import date, datetime, timedelta
+from typing import Dict, List
+
+from django.conf import settings
+from django.core.cache import cache
+
+from .requests.facebook import Conversations, FacebookConversationAPI
+
+
+logger = logging.getLogger(__name__)
+
+
+class ConversationsCache:
+    """
+    Caches the conversation analytics of a WABA per UTC day.
+
+    A data point returned by the Graph API belongs to the day of its start.
+    Days that Meta no longer changes are cached without expiration and the open
+    days for WHATSAPP_CONVERSATIONS_OPEN_DAY_CACHE_TTL seconds, so a range is
+    assembled from the cache and only the missing days are requested, in a
+    single call.
+    """
+
+    KEY = "wpp-conversations:{waba_id}:{granularity}:{day}"
+    GRANULARITY = "DAILY"
+
+    def __init__(self, waba_id: str, access_token: str, api=None):
+        self.waba_id = waba_id
+        self.access_token = access_token
+        self.api = api or FacebookConversationAPI()
+        self.closed_day_delay = timedelta(
+            seconds=settings.WHATSAPP_CONVERSATIONS_CLOSED_DAY_DELAY
+        )
+        self.open_day_ttl = settings.WHATSAPP_CONVERSATIONS_OPEN_DAY_CACHE_TTL
+
+    def conversations(self, start: int, end: int) -> Conversations:
+        days = self.days_between(start, end)
+        keys = {day: self._key(day) for day in days}
+
+        cached = self._get_many(list(keys.values()))
+        data_points_by_day = {
+            day: cached[key] for day, key in keys.items() if key in cached
+        }
+
+        missing_days = [day for day in days if day not in data_points_by_day]
+        if missing_days:
+            fetched = self._fetch(missing_days[0], missing_days[-1])
+            self._store(fetched)
+            data_points_by_day.update(fetched)
+
+        data_points = [
+            data_point for day in days for data_point in data_points_by_day[day]
+        ]
+        return Conversations({"data": [{"data_points": data_points}]})
+
+    def _fetch(self, first_day: date, last_day: date) -> Dict[date, List[dict]]:
+        data_points = self.api.conversation_data_points(
+            waba_id=self.waba_id,
+            access_token=self.access_token,
+            start=self.day_to_timestamp(first_day),
+            end=self.day_to_timestamp(last_day + timedelta(days=1)) - 1,
+        )
+
+        counts_by_day = {
+            day: {} for day in self.days_between_dates(first_day, last_day)
+        }
+        for data_point in data_points:
+            if data_point.get("start") is None:
+                continue
+
+            counts = counts_by_day.get(self.timestamp_to_day(data_point["start"]))
+            if counts is None:
+                continue
+
+            key = (
+                data_point.get("conversation_direction"),
+                data_point.get("conversation_category"),
+            )
+            counts[key] = counts.get(key, 0) + data_point.get("conversation", 0)
+
+        # Only the counts used by Conversations are kept
+        return {
+            day: [
+                dict(
+                    conversation_direction=direction,
+                    conversation_category=category,
+                    conversation=count,
+                )
+                for (direction, category), count in counts.items()
+            ]
+            for day, counts in counts_by_day.items()
+        }
+
+    def _store(self, data_points_by_day: Dict[date, List[dict]]):
+        closed_until = (datetime.utcnow() - self.closed_day_delay).date()
+
+        closed_days = {}
+        open_days = {}
+        for day, data_points in data_points_by_day.items():
+            days = closed_days if day < closed_until else open_days
+            days[self._key(day)] = data_points
+
+        self._set_many(closed_days, timeout=None)
+        self._set_many(open_days, timeout=self.open_day_ttl)
+
+    def _key(self, day: date) -> str:
+        return self.KEY.format(
+            waba_id=self.waba_id, granularity=self.GRANULARITY, day=day.isoformat()
+        )
+
+    @staticmethod
+    def _get_many(keys: List[str]) -> dict:
+        try:
+            return cache.get_many(keys)
+        except Exception as e:
+            logger.warning(f"Error reading conversations from cache: {e}")
+            return {}
+
+    @staticmethod
+    def _set_many(values: dict, timeout):
+        if not values:
+            return
+
+        try:
+            cache.set_many(values, timeout=timeout)
+        except Exception as e:
+            logger.warning(f"Error writing conversations to cache: {e}")
+
+    @classmethod
+    def days_between(cls, start: int, end: int) -> List[date]:
+        return cls.days_between_dates(
+            cls.timestamp_to_day(start), cls.timestamp_to_day(end)
+        )
+
+    @staticmethod
+    def days_between_dates(first_day: date, last_day: date) -> List[date]:
+        return [
+            first_day + timedelta(days=offset)
+            for offset in range((last_day - first_day).days + 1)
+        ]
+
+    @staticmethod
+    def timestamp_to_day(timestamp: int) -> date:
+        return datetime.utcfromtimestamp(int(timestamp)).date()
+
+    @staticmethod
+    def day_to_timestamp(day: date) -> int:
+        return calendar.timegm(day.timetuple())
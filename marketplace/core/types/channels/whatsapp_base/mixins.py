@@ -15,7 +15,7 @@ if TYPE_CHECKING:
     )
 
 from marketplace.accounts.permissions import ProjectViewPermission, IsCRMUser
-from .requests.facebook import FacebookConversationAPI
+from .conversations_cache import ConversationsCache
 from .exceptions import FacebookApiException, UnableProcessProfilePhoto
 from .serializers import WhatsAppBusinessContactSerializer, WhatsAppProfileSerializer
 
@@ -73,12 +73,9 @@ class WhatsAppConversationsMixin(object, metaclass=abc.ABCMeta):
         date_params = QueryParamsParser(request.query_params)
 
         try:
-            conversations = FacebookConversationAPI().conversations(
-                waba_id=self.app_waba_id,
-                access_token=self.get_access_token,
-                start=date_params.start,
-                end=date_params.end,
-            )
+            conversations = ConversationsCache(
+                waba_id=self.app_waba_id, access_token=self.get_access_token
+            ).conversations(start=date_params.start, end=date_params.end)
         except FacebookApiException as error:
             raise ValidationError(error)
 
@@ -84,14 +84,35 @@ class FacebookConversationAPI(object):  # TODO: Use BaseFacebookBaseApi
 
         return fields
 
-    def conversations(
+    def _get_conversation_analytics(
         self, waba_id: str, access_token: str, start: str, end: str
-    ) -> Conversations:
+    ) -> dict:
         fields = self._get_fields(start, end)
         params = dict(fields=fields, access_token=access_token)
         response = self._request(
             f"https://graph.facebook.com/{WHATSAPP_VERSION}/{waba_id}", params=params
         )
-        conversation_analytics = response.json().get("conversation_analytics")
+        return response.json().get("conversation_analytics")
+
+    def conversations(
+        self, waba_id: str, access_token: str, start: str, end: str
+    ) -> Conversations:
+        conversation_analytics = self._get_conversation_analytics(
+            waba_id, access_token, start, end
+        )
 
         return Conversations(conversation_analytics)
+
+    def conversation_data_points(
+        self, waba_id: str, access_token: str, start: str, end: str
+    ) -> list:
+        conversation_analytics = self._get_conversation_analytics(
+            waba_id, access_token, start, end
+        )
+        data = (conversation_analytics or {}).get("data", [])
+
+        return [
+            data_point
+            for data_content in data
+            for data_point in data_content.get("data_points", [])
+        ]
@@ -0,0 +1,84 @@
+from datetime import date, datetime, timedelta
+from unittest.mock import MagicMock
+
+from django.core.cache import cache
+from django.test import SimpleTestCase, override_settings
+
+from marketplace.core.types.channels.whatsapp_base.conversations_cache import (
+    ConversationsCache,
+)
+
+
+def data_point(day: date, conversations: int, direction="USER_INITIATED"):
+    start = ConversationsCache.day_to_timestamp(day) + 3 * 60 * 60
+    return {
+        "start": start,
+        "end": start + 24 * 60 * 60,
+        "conversation": conversations,
+        "conversation_direction": direction,
+        "conversation_category": "UNKNOWN",
+    }
+
+
+@override_settings(
+    CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}},
+    WHATSAPP_CONVERSATIONS_CLOSED_DAY_DELAY=48 * 60 * 60,
+    WHATSAPP_CONVERSATIONS_OPEN_DAY_CACHE_TTL=600,
+)
+class ConversationsCacheTestCase(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+        self.api = MagicMock()
+        self.first_day = date(2023, 6, 1)
+        self.last_day = date(2023, 6, 3)
+
+    def get_conversations(self, first_day=None, last_day=None):
+        first_day = first_day or self.first_day
+        last_day = last_day or self.last_day
+        return ConversationsCache("waba-id", "token", api=self.api).conversations(
+            ConversationsCache.day_to_timestamp(first_day),
+            ConversationsCache.day_to_timestamp(last_day) + 24 * 60 * 60 - 1,
+        )
+
+    def test_closed_days_are_fetched_once(self):
+        self.api.conversation_data_points.return_value = [
+            data_point(self.first_day, 2),
+            data_point(self.first_day, 3, direction="BUSINESS_INITIATED"),
+            data_point(self.last_day, 5),
+        ]
+
+        first = self.get_conversations().__dict__()
+        second = self.get_conversations().__dict__()
+
+        self.api.conversation_data_points.assert_called_once()
+        self.assertEqual(first, second)
+        self.assertEqual(first["user_initiated"], 7)
+        self.assertEqual(first["business_initiated"], 3)
+        self.assertEqual(first["total"], 10)
+
+    def test_only_missing_days_are_fetched(self):
+        self.api.conversation_data_points.return_value = [data_point(self.first_day, 2)]
+        self.get_conversations(last_day=self.first_day)
+
+        self.api.conversation_data_points.return_value = [data_point(self.last_day, 5)]
+        conversations = self.get_conversations().__dict__()
+
+        kwargs = self.api.conversation_data_points.call_args.kwargs
+        self.assertEqual(
+            kwargs["start"],
+            ConversationsCache.day_to_timestamp(self.first_day + timedelta(days=1)),
+        )
+        self.assertEqual(conversations["user_initiated"], 7)
+
+    def test_open_days_expire(self):
+        today = datetime.utcnow().date()
+        self.api.conversation_data_points.return_value = [data_point(today, 2)]
+
+        ConversationsCache("waba-id", "token", api=self.api)._store(
+            {today: [], self.first_day: []}
+        )
+
+        closed_key = ConversationsCache("waba-id", "token")._key(self.first_day)
+        open_key = ConversationsCache("waba-id", "token")._key(today)
+        self.assertIsNone(cache._expire_info[cache.make_key(closed_key)])
+        self.assertIsNotNone(cache._expire_info[cache.make_key(open_key)])
@@ -193,6 +193,28 @@ class CatalogListTestCase(MockServiceTestCase):
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(len(response.json["results"]), 0)
 
+    def test_list_uses_stored_connected_catalog(self):
+        self.app.config["connected_catalog_id"] = "123456789"
+        self.app.save()
+
+        url = reverse("catalog-list-create", kwargs={"app_uuid": self.app.uuid})
+        with patch.object(
+            MockFacebookService, "get_connected_catalog"
+        ) as get_connected_catalog_mock:
+            response = self.request.get(url, app_uuid=self.app.uuid)
+
+        get_connected_catalog_mock.assert_not_called()
+        connected = response.json["results"][0]
+        self.assertEqual(connected["facebook_catalog_id"], "123456789")
+        self.assertTrue(connected["is_connected"])
+
+    def test_connected_catalog_is_stored_on_first_list(self):
+        url = reverse("catalog-list-create", kwargs={"app_uuid": self.app.uuid})
+        self.request.get(url, app_uuid=self.app.uuid)
+
+        self.app.refresh_from_db()
+        self.assertEqual(self.app.config["connected_catalog_id"], "0123456789")
+
 
 class CatalogRetrieveTestCase(MockServiceTestCase):
     current_view_mapping = {"get": "retrieve"}
@@ -225,6 +247,9 @@ class CatalogEnabledTestCase(MockServiceTestCase):
         )
         self.assertEqual(response.status_code, status.HTTP_200_OK)
 
+        self.app.refresh_from_db()
+        self.assertEqual(self.app.config["connected_catalog_id"], "0123456789")
+
     def test_failed_enable_catalog(self):
         mock_facebook_service = MockFailiedEnableDisableCatalogFacebookService()
         patcher_fb_failure = patch.object(
@@ -264,6 +289,24 @@ class CatalogDisableTestCase(MockServiceTestCase):
         )
         self.assertEqual(response.status_code, status.HTTP_200_OK)
 
+    def test_disable_connected_catalog(self):
+        self.app.config["connected_catalog_id"] = self.catalog.facebook_catalog_id
+        self.app.save()
+
+        url = reverse(
+            "catalog-disable",
+            kwargs={"app_uuid": self.app.uuid, "catalog_uuid": self.catalog.uuid},
+        )
+        self.request.post(
+            url,
+            app_uuid=self.app.uuid,
+            catalog_uuid=self.catalog.uuid,
+            body={"project_uuid": str(self.app.project_uuid)},
+        )
+
+        self.app.refresh_from_db()
+        self.assertIsNone(self.app.config["connected_catalog_id"])
+
     def test_failed_disable_catalog(self):
         mock_facebook_service = MockFailiedEnableDisableCatalogFacebookService()
         patcher_fb_failure = patch.object(
@@ -12,6 +12,12 @@ from marketplace.services.flows.service import (
     FlowsService,
 )
 from marketplace.wpp_products.models import Catalog
+from marketplace.wpp_products.connected_catalog import (
+    forget_connected_catalog_id,
+    get_connected_catalog_id,
+    set_connected_catalog_id,
+    unset_connected_catalog_id,
+)
 from marketplace.applications.models import App
 
 from marketplace.clients.facebook.client import FacebookClient
@@ -133,7 +139,7 @@ class CatalogViewSet(BaseViewSet):
     def retrieve(self, request, *args, **kwargs):
         catalog = self.get_object()
         service = self.fb_service(catalog.app)
-        connected_catalog_id = service.get_connected_catalog(catalog.app)
+        connected_catalog_id = get_connected_catalog_id(catalog.app, service)
         serializer = self.serializer_class(
             catalog, context={"connected_catalog_id": connected_catalog_id}
         )
@@ -145,8 +151,8 @@ class CatalogViewSet(BaseViewSet):
         serialized_data = []
 
         if queryset.exists():
-            service = self.fb_service(queryset.first().app)
-            connected_catalog_id = service.get_connected_catalog(queryset.first().app)
+            app = queryset.first().app
+            connected_catalog_id = get_connected_catalog_id(app, self.fb_service(app))
             serializer = CatalogListSerializer(
                 page_data, context={"connected_catalog_id": connected_catalog_id}
             )
@@ -173,6 +179,8 @@ class CatalogViewSet(BaseViewSet):
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
+        unset_connected_catalog_id(catalog.app, catalog.facebook_catalog_id)
+
         return Response(status=status.HTTP_204_NO_CONTENT)
 
     @action(detail=True, methods=["POST"])
@@ -183,6 +191,7 @@ class CatalogViewSet(BaseViewSet):
         if not success:
             return Response(status=status.HTTP_400_BAD_REQUEST, data=response)
 
+        set_connected_catalog_id(catalog.app, catalog.facebook_catalog_id)
         self.flows_service.update_catalog_to_active(
             catalog.app, catalog.facebook_catalog_id
         )
@@ -196,6 +205,7 @@ class CatalogViewSet(BaseViewSet):
         if not success:
             return Response(status=status.HTTP_400_BAD_REQUEST, data=response)
 
+        unset_connected_catalog_id(catalog.app, catalog.facebook_catalog_id)
         self.flows_service.update_catalog_to_inactive(
             catalog.app, catalog.facebook_catalog_id
         )
@@ -221,6 +231,7 @@ class CommerceSettingsViewSet(BaseViewSet):
         app = get_object_or_404(App, uuid=app_uuid, code="wpp-cloud")
         service = self.fb_service(app)
         response = service.toggle_catalog_visibility(app, enable_visibility)
+        forget_connected_catalog_id(app)
         return Response(response)
 
     @action(detail=False, methods=["POST"])
@@ -232,6 +243,7 @@ class CommerceSettingsViewSet(BaseViewSet):
         app = get_object_or_404(App, uuid=app_uuid, code="wpp-cloud")
         service = self.fb_service(app)
         response = service.toggle_cart(app, enable_cart)
+        forget_connected_catalog_id(app)
         return Response(response)
 
     @action(detail=False, methods=["GET"])
@@ -239,6 +251,7 @@ class CommerceSettingsViewSet(BaseViewSet):
         app = get_object_or_404(App, uuid=app_uuid, code="wpp-cloud")
         service = self.fb_service(app)
         response = service.get_connected_catalog(app)
+        set_connected_catalog_id(app, response or None)
         return Response(response)
 
 
@@ -1,6 +1,7 @@
 import uuid
 
 from django.urls import reverse
+from django.core.cache import cache
 from django.test import override_settings
 
 from rest_framework import status
@@ -27,7 +28,7 @@ User = get_user_model()
 
 FACEBOOK_CONVERSATION_API_PATH = (
     "marketplace.core.types.channels.whatsapp_base."
-    + "requests.facebook.FacebookConversationAPI.conversations"
+    + "requests.facebook.FacebookConversationAPI.conversation_data_points"
 )
 
 
@@ -218,20 +219,36 @@ class WhatsAppCloudReportSentMessagesTestCase(APIBaseTestCase):
         self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
 
 
-class MockConversation(object):
-    def __dict__(self) -> dict:
-        return dict(
-            user_initiated=2,
-            business_initiated=2099,
-            total=2101,
-        )
-
-
+# Conversations are cached per day, each test starts with an empty cache
+LOCMEM_CACHES = {
+    "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}
+}
+
+CONVERSATION_DATA_POINTS = [
+    {
+        "start": 1685847600,
+        "end": 1685934000,
+        "conversation": 2,
+        "conversation_direction": "USER_INITIATED",
+        "conversation_category": "UNKNOWN",
+    },
+    {
+        "start": 1685847600,
+        "end": 1685934000,
+        "conversation": 2099,
+        "conversation_direction": "BUSINESS_INITIATED",
+        "conversation_category": "UNKNOWN",
+    },
+]
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
 class WhatsAppCloudConversationsTestCase(APIBaseTestCase):
     view_class = WhatsAppCloudViewSet
 
     def setUp(self):
         super().setUp()
+        cache.clear()
 
         self.app = App.objects.create(
             code="wpp-cloud",
@@ -256,7 +273,7 @@ class WhatsAppCloudConversationsTestCase(APIBaseTestCase):
 
     @patch(FACEBOOK_CONVERSATION_API_PATH)
     def test_get_conversations(self, mock_conversations):
-        mock_conversations.return_value = MockConversation()
+        mock_conversations.return_value = CONVERSATION_DATA_POINTS
 
         params = {
             "start": self.start_date,
@@ -349,7 +366,7 @@ class WhatsAppCloudConversationsPermissionTestCase(APIBaseTestCase):
 
     @patch(FACEBOOK_CONVERSATION_API_PATH)
     def test_get_conversations_without_authorization(self, mock_conversations):
-        mock_conversations.return_value = MockConversation()
+        mock_conversations.return_value = CONVERSATION_DATA_POINTS
 
         params = {
             "start": self.start_date,
@@ -365,7 +382,7 @@ class WhatsAppCloudConversationsPermissionTestCase(APIBaseTestCase):
     def test_get_conversations_allow_crm_access_true_email_not_in_list(
         self, mock_conversations
     ):
-        mock_conversations.return_value = MockConversation()
+        mock_conversations.return_value = CONVERSATION_DATA_POINTS
 
         params = {
             "start": self.start_date,
@@ -377,7 +394,7 @@ class WhatsAppCloudConversationsPermissionTestCase(APIBaseTestCase):
     @patch(FACEBOOK_CONVERSATION_API_PATH)
     @override_settings(ALLOW_CRM_ACCESS=True, CRM_EMAILS_LIST=["user@marketplace.ai"])
     def test_get_conversations_with_crm_user(self, mock_conversations):
-        mock_conversations.return_value = MockConversation()
+        mock_conversations.return_value = CONVERSATION_DATA_POINTS
 
         params = {
             "start": self.start_date,
@@ -1,29 +1,284 @@
+import socket
+import threading
 import time
+import zlib
+
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Hashable, List, Optional, Tuple
 
 import amqp
 
 
-class PyAMQPConnectionBackend:  # pragma: no cover
+class AckTracker:
+    """
+    Ordered bookkeeping of the deliveries of a channel processed by workers.
+
+    Workers only record the outcome of each delivery, the acks are sent by the
+    connection thread on `flush`, as channels can't be shared between threads.
+    The longest run of acked deliveries at the head is acked with a single
+    `multiple` ack, deliveries completed behind one still in progress are
+    settled one by one, so a slow message never holds the others.
+    """
+
+    ACK = "ack"
+    REJECT = "reject"
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._deliveries = OrderedDict()
+        self._completed = 0
+
+    @property
+    def completed(self) -> int:
+        return self._completed
+
+    @property
+    def pending(self) -> int:
+        """Deliveries not settled yet, in progress or completed."""
+        return len(self._deliveries)
+
+    def add(self, delivery_tag: int):
+        with self._lock:
+            self._deliveries[delivery_tag] = None
+
+    def ack(self, delivery_tag: int):
+        self._complete(delivery_tag, (self.ACK, None))
+
+    def reject(self, delivery_tag: int, requeue: bool):
+        self._complete(delivery_tag, (self.REJECT, requeue))
+
+    def _complete(self, delivery_tag: int, outcome: Tuple[str, Optional[bool]]):
+        with self._lock:
+            if self._deliveries.get(delivery_tag, outcome) is None:
+                self._deliveries[delivery_tag] = outcome
+                self._completed += 1
+
+    def pop_operations(self) -> List[tuple]:
+        """Returns the channel operations that settle the completed deliveries."""
+        operations = []
+        with self._lock:
+            at_head = True
+            run_end = None
+            for delivery_tag, outcome in list(self._deliveries.items()):
+                if outcome is None:
+                    at_head = False
+                    continue
+
+                del self._deliveries[delivery_tag]
+                action, requeue = outcome
+
+                if action == self.ACK and at_head:
+                    run_end = delivery_tag
+                    continue
+
+                if run_end is not None:
+                    operations.append((self.ACK, run_end, True))
+                    run_end = None
+
+                if action == self.ACK:
+                    operations.append((self.ACK, delivery_tag, False))
+                else:
+                    operations.append((self.REJECT, delivery_tag, requeue))
+
+            if run_end is not None:
+                operations.append((self.ACK, run_end, True))
+
+            self._completed = 0
+
+        return operations
+
+    def flush(self, channel: amqp.Channel):
+        for action, delivery_tag, flag in self.pop_operations():
+            if action == self.ACK:
+                channel.basic_ack(delivery_tag, multiple=flag)
+            else:
+                channel.basic_reject(delivery_tag, requeue=flag)
+
+
+class TrackedChannel:
+    """
+    Stands for the channel of a message handled by a worker, so consumers keep
+    calling `message.channel.basic_ack` and `basic_reject`.
+    """
+
+    def __init__(self, channel: amqp.Channel, tracker: AckTracker):
+        self._channel = channel
+        self._tracker = tracker
+
+    def basic_ack(self, delivery_tag: int, multiple: bool = False):
+        self._tracker.ack(delivery_tag)
+
+    def basic_reject(self, delivery_tag: int, requeue: bool):
+        self._tracker.reject(delivery_tag, requeue)
+
+    def __getattr__(self, name):
+        return getattr(self._channel, name)
+
+
+class QueueConsumer:
+    """
+    Consumes a queue on its own channel, with a bounded number of workers.
+
+    Each worker is a single thread and messages with the same `ordering_key`
+    always go to the same worker, so they are processed in delivery order.
+    Without an `ordering_key` the queue has a single worker. `on_close` is
+    called on shutdown, once the workers are stopped.
+    """
+
+    def __init__(
+        self,
+        channel: amqp.Channel,
+        callback: Callable,
+        workers: int,
+        ordering_key: Optional[Callable[[amqp.Message], Hashable]] = None,
+        on_close: Optional[Callable[[], None]] = None,
+    ):
+        self.channel = channel
+        self.callback = callback
+        self.ordering_key = ordering_key
+        self.on_close = on_close
+        self.tracker = AckTracker()
+        lanes = workers if ordering_key is not None else 1
+        self.lanes = [ThreadPoolExecutor(max_workers=1) for _ in range(max(lanes, 1))]
+
+    def on_message(self, message: amqp.Message):
+        self.tracker.add(message.delivery_tag)
+        lane = self._lane(message)
+        message.channel = TrackedChannel(self.channel, self.tracker)
+        lane.submit(self._handle, message)
+
+    def _lane(self, message: amqp.Message) -> ThreadPoolExecutor:
+        if len(self.lanes) == 1:
+            return self.lanes[0]
+
+        try:
+            key = self.ordering_key(message)
+        except Exception as error:
+            print(f"[-] Error reading the ordering key: {type(error)} {error}")
+            key = None
+        return self.lanes[zlib.crc32(repr(key).encode()) % len(self.lanes)]
+
+    def _handle(self, message: amqp.Message):
+        try:
+            self.callback(message)
+        except Exception as error:
+            # The message is requeued, as it wasn't processed
+            print(f"[-] Error handling message: {type(error)} {error}")
+            self.tracker.reject(message.delivery_tag, requeue=True)
+
+    def flush(self):
+        self.tracker.flush(self.channel)
+
+    def shutdown(self):
+        # Messages not started are redelivered by the broker
+        for lane in self.lanes:
+            lane.shutdown(wait=True, cancel_futures=True)
+
+        if self.on_close is not None:
+            self.on_close()
+
+
+class ConsumersChannel:
+    """
+    Passed to the consumers handle in place of a channel, opens a channel for
+    each consumed queue so each one has its own prefetch and worker pool. A
+    queue may be given its own `prefetch_count`, and an `on_close` callback
+    called when its consumer is shut down with the connection.
+    """
+
+    def __init__(self, connection: amqp.Connection, prefetch_count: int, workers: int):
+        self.connection = connection
+        self.prefetch_count = prefetch_count
+        self.workers = workers
+        self.consumers: List[QueueConsumer] = []
+
+    def basic_consume(
+        self,
+        queue: str,
+        callback: Callable,
+        ordering_key: Optional[Callable[[amqp.Message], Hashable]] = None,
+        prefetch_count: Optional[int] = None,
+        on_close: Optional[Callable[[], None]] = None,
+        **kwargs,
+    ):
+        if prefetch_count is None:
+            prefetch_count = self.prefetch_count
+
+        channel = self.connection.channel()
+        channel.basic_qos(0, prefetch_count, False)
+
+        consumer = QueueConsumer(
+            channel, callback, self.workers, ordering_key, on_close=on_close
+        )
+        self.consumers.append(consumer)
+
+        return channel.basic_consume(queue, callback=consumer.on_message, **kwargs)
+
+
+class PyAMQPConnectionBackend:
     _start_message = "[+] Connection established. Waiting for events"
 
-    def __init__(self, handle_consumers: callable):
+    # Seconds waited for frames while deliveries are in progress, so their acks
+    # are sent soon after the workers complete them. Once the prefetch is full
+    # the broker sends nothing until then.
+    busy_drain_timeout = 0.05
+
+    def __init__(
+        self,
+        handle_consumers: callable,
+        prefetch_count: int = 1,
+        workers: int = 1,
+        ack_batch_size: int = 1,
+        ack_interval: float = 1,
+    ):
         self._handle_consumers = handle_consumers
+        self.prefetch_count = prefetch_count
+        self.workers = workers
+        self.ack_batch_size = ack_batch_size
+        self.ack_interval = ack_interval
 
-    def _drain_events(self, connection: amqp.connection.Connection):
+    def _drain_events(
+        self, connection: amqp.connection.Connection, consumers: List[QueueConsumer]
+    ):
+        last_flush = time.monotonic()
         while True:
-            connection.drain_events()
+            timeout = self.ack_interval
+            if any(consumer.tracker.pending for consumer in consumers):
+                timeout = min(self.busy_drain_timeout, self.ack_interval)
+
+            try:
+                connection.drain_events(timeout=timeout)
+            except socket.timeout:
+                pass
 
-    def start_consuming(self, connection_params: dict):
+            now = time.monotonic()
+            flush_all = now - last_flush >= self.ack_interval
+            for consumer in consumers:
+                if flush_all or self._should_flush(consumer.tracker):
+                    consumer.flush()
+            if flush_all:
+                last_flush = now
+
+    def _should_flush(self, tracker: AckTracker) -> bool:
+        # With no delivery in progress there is nothing left to batch with
+        completed = tracker.completed
+        return completed >= self.ack_batch_size or 0 < completed == tracker.pending
+
+    def start_consuming(self, connection_params: dict):  # pragma: no cover
         while True:
+            consumers_channel = None
             try:
                 with amqp.Connection(**connection_params) as connection:
-                    channel = connection.channel()
+                    consumers_channel = ConsumersChannel(
+                        connection, self.prefetch_count, self.workers
+                    )
 
-                    self._handle_consumers(channel)
+                    self._handle_consumers(consumers_channel)
 
                     print(self._start_message)
 
-                    self._drain_events(connection)
+                    self._drain_events(connection, consumers_channel.consumers)
 
             except (
                 amqp.exceptions.AMQPError,
@@ -38,3 +293,9 @@ class PyAMQPConnectionBackend:  # pragma: no cover
                 # TODO: Handle exceptions with RabbitMQ
                 print("error on drain_events:", type(error), error)
                 time.sleep(5)
+
+            finally:
+                # Unacked messages are redelivered on the new connection
+                if consumers_channel is not None:
+                    for consumer in consumers_channel.consumers:
+                        consumer.shutdown()
@@ -0,0 +1,226 @@
+import socket
+import threading
+import time
+
+from unittest.mock import Mock, call
+
+from django.test import SimpleTestCase
+
+from marketplace.event_driven.backends.pyamqp_backend import (
+    AckTracker,
+    ConsumersChannel,
+    PyAMQPConnectionBackend,
+    QueueConsumer,
+)
+
+
+class AckTrackerTestCase(SimpleTestCase):
+    def setUp(self):
+        self.tracker = AckTracker()
+        for delivery_tag in range(1, 6):
+            self.tracker.add(delivery_tag)
+
+    def test_acks_at_the_head_are_sent_together(self):
+        for delivery_tag in [3, 1, 2]:
+            self.tracker.ack(delivery_tag)
+
+        channel = Mock()
+        self.tracker.flush(channel)
+
+        channel.basic_ack.assert_called_once_with(3, multiple=True)
+        self.assertEqual(self.tracker.completed, 0)
+
+    def test_deliveries_behind_one_in_progress_are_settled_one_by_one(self):
+        self.tracker.ack(1)
+        self.tracker.ack(3)
+        self.tracker.reject(4, requeue=False)
+
+        self.assertEqual(
+            self.tracker.pop_operations(),
+            [
+                (AckTracker.ACK, 1, True),
+                (AckTracker.ACK, 3, False),
+                (AckTracker.REJECT, 4, False),
+            ],
+        )
+
+        self.tracker.ack(2)
+        self.tracker.ack(5)
+        self.assertEqual(self.tracker.pop_operations(), [(AckTracker.ACK, 5, True)])
+
+    def test_rejects_split_the_acks_at_the_head(self):
+        self.tracker.ack(1)
+        self.tracker.reject(2, requeue=True)
+        self.tracker.ack(3)
+
+        self.assertEqual(
+            self.tracker.pop_operations(),
+            [
+                (AckTracker.ACK, 1, True),
+                (AckTracker.REJECT, 2, True),
+                (AckTracker.ACK, 3, True),
+            ],
+        )
+
+    def test_only_the_first_outcome_is_kept(self):
+        self.tracker.ack(1)
+        self.tracker.reject(1, requeue=True)
+        self.tracker.ack(10)
+
+        self.assertEqual(self.tracker.completed, 1)
+        self.assertEqual(self.tracker.pop_operations(), [(AckTracker.ACK, 1, True)])
+
+
+class QueueConsumerTestCase(SimpleTestCase):
+    def wait_until_completed(self, consumer, count):
+        for _ in range(500):
+            if consumer.tracker.completed >= count:
+                return
+            time.sleep(0.01)
+        self.fail("Messages not processed")
+
+    def test_messages_are_processed_by_the_workers(self):
+        thread_names = []
+
+        def callback(message):
+            thread_names.append(threading.current_thread().name)
+            if message.body == "fail":
+                raise ValueError("Unexpected")
+            message.channel.basic_ack(message.delivery_tag)
+
+        channel = Mock()
+        consumer = QueueConsumer(channel, callback, workers=2)
+        for delivery_tag, body in enumerate(["ok", "fail", "ok"], start=1):
+            consumer.on_message(Mock(delivery_tag=delivery_tag, body=body))
+        self.wait_until_completed(consumer, 3)
+        consumer.shutdown()
+
+        consumer.flush()
+        self.assertNotIn(threading.current_thread().name, thread_names)
+        channel.basic_ack.assert_has_calls(
+            [call(1, multiple=True), call(3, multiple=True)]
+        )
+        channel.basic_reject.assert_called_once_with(2, requeue=True)
+
+    def test_messages_with_the_same_key_are_processed_in_order(self):
+        processed = []
+        lock = threading.Lock()
+
+        def callback(message):
+            key, index = message.body
+            # Earlier messages of a key take longer, they would finish last if
+            # processed in parallel
+            time.sleep(0.01 * (5 - index))
+            with lock:
+                processed.append(message.body)
+            message.channel.basic_ack(message.delivery_tag)
+
+        consumer = QueueConsumer(
+            Mock(), callback, workers=3, ordering_key=lambda message: message.body[0]
+        )
+        bodies = [(key, index) for index in range(5) for key in "abc"]
+        for delivery_tag, body in enumerate(bodies, start=1):
+            consumer.on_message(Mock(delivery_tag=delivery_tag, body=body))
+        self.wait_until_completed(consumer, len(bodies))
+        consumer.shutdown()
+
+        for key in "abc":
+            self.assertEqual(
+                [index for body_key, index in processed if body_key == key],
+                list(range(5)),
+            )
+
+    def test_queue_without_ordering_key_has_a_single_worker(self):
+        consumer = QueueConsumer(Mock(), Mock(), workers=4)
+        self.assertEqual(len(consumer.lanes), 1)
+        consumer.shutdown()
+
+
+class ConsumersChannelTestCase(SimpleTestCase):
+    def test_each_queue_has_its_own_channel(self):
+        connection = Mock()
+        connection.channel.side_effect = [Mock(), Mock()]
+        consumers_channel = ConsumersChannel(connection, prefetch_count=8, workers=2)
+
+        consumers_channel.basic_consume("queue-1", callback=Mock())
+        consumers_channel.basic_consume("queue-2", callback=Mock(), ordering_key=Mock())
+
+        first, second = consumers_channel.consumers
+        self.assertIsNot(first.channel, second.channel)
+        self.assertEqual([len(first.lanes), len(second.lanes)], [1, 2])
+        for consumer in consumers_channel.consumers:
+            consumer.channel.basic_qos.assert_called_once_with(0, 8, False)
+            consumer.shutdown()
+
+    def test_queues_may_have_their_own_prefetch_and_close_callback(self):
+        consumers_channel = ConsumersChannel(Mock(), prefetch_count=8, workers=2)
+        on_close = Mock()
+
+        consumers_channel.basic_consume(
+            "queue", callback=Mock(), prefetch_count=100, on_close=on_close
+        )
+
+        consumer = consumers_channel.consumers[0]
+        consumer.channel.basic_qos.assert_called_once_with(0, 100, False)
+        on_close.assert_not_called()
+        consumer.shutdown()
+        on_close.assert_called_once_with()
+
+
+class StopDraining(Exception):
+    pass
+
+
+class FakeConnection:
+    """Sends no frames, as a broker once the prefetch of the queues is full."""
+
+    def __init__(self, channel: Mock, acked_tag: int, max_calls: int = 500):
+        self.channel = channel
+        self.acked_tag = acked_tag
+        self.max_calls = max_calls
+        self.timeouts = []
+
+    def drain_events(self, timeout: float):
+        acked = [args[0] for args, _ in self.channel.basic_ack.call_args_list]
+        if self.acked_tag in acked or len(self.timeouts) >= self.max_calls:
+            raise StopDraining()
+
+        self.timeouts.append(timeout)
+        time.sleep(timeout)
+        raise socket.timeout()
+
+
+class PyAMQPConnectionBackendTestCase(SimpleTestCase):
+    def test_acks_are_sent_without_waiting_the_ack_interval(self):
+        backend = PyAMQPConnectionBackend(
+            Mock(), prefetch_count=8, workers=1, ack_batch_size=4, ack_interval=60
+        )
+
+        def callback(message):
+            time.sleep(0.01)
+            message.channel.basic_ack(message.delivery_tag)
+
+        channel = Mock()
+        consumer = QueueConsumer(channel, callback, workers=1)
+        for delivery_tag in range(1, 9):
+            consumer.on_message(Mock(delivery_tag=delivery_tag))
+
+        connection = FakeConnection(channel, acked_tag=8)
+        started = time.monotonic()
+        with self.assertRaises(StopDraining):
+            backend._drain_events(connection, [consumer])
+        consumer.shutdown()
+
+        self.assertLess(time.monotonic() - started, 5)
+        self.assertLess(max(connection.timeouts), 60)
+        acked = [args[0] for args, _ in channel.basic_ack.call_args_list]
+        self.assertEqual(acked[-1], 8)
+
+    def test_idle_connection_waits_the_ack_interval(self):
+        backend = PyAMQPConnectionBackend(Mock(), ack_interval=0.01)
+        connection = FakeConnection(Mock(), acked_tag=None, max_calls=3)
+
+        with self.assertRaises(StopDraining):
+            backend._drain_events(connection, [QueueConsumer(Mock(), Mock(), 1)])
+
+        self.assertEqual(connection.timeouts, [0.01] * 3)
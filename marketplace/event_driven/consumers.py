@@ -1,11 +1,31 @@
 from abc import ABC, abstractmethod
+from typing import Optional, Tuple
 
 import amqp
 
+from .parsers import JSONParser
 from .signals import message_started, message_finished
 
 
 class EDAConsumer(ABC):  # pragma: no cover
+    # Body fields identifying the messages that must be processed in delivery
+    # order with each other, as the events of the same project
+    ordering_fields: Tuple[str, ...] = ()
+
+    def ordering_key(self, message: amqp.Message) -> Optional[tuple]:
+        """Returns the key of the message, see `ordering_fields`."""
+        if not self.ordering_fields:
+            return None
+
+        try:
+            body = JSONParser.parse(message.body)
+        except Exception:
+            return None
+
+        if not isinstance(body, dict):
+            return None
+        return tuple(body.get(field) for field in self.ordering_fields)
+
     def handle(self, message: amqp.Message):
         message_started.send(sender=self)
         try:
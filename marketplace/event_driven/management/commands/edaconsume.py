@@ -4,12 +4,30 @@ from django.utils.module_loading import import_string
 
 
 handle_consumers_function = import_string(settings.EDA_CONSUMERS_HANDLE)
-connection_backend = import_string(settings.EDA_CONNECTION_BACKEND)(
-    handle_consumers_function
-)
+connection_backend_class = import_string(settings.EDA_CONNECTION_BACKEND)
 
 
 class Command(BaseCommand):  # pragma: no cover
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--prefetch",
+            type=int,
+            default=settings.EDA_PREFETCH_COUNT,
+            help="Unacked messages delivered to each queue.",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=settings.EDA_CONSUMER_WORKERS,
+            help="Threads processing the messages of each queue.",
+        )
+        parser.add_argument(
+            "--ack-batch-size",
+            type=int,
+            default=settings.EDA_ACK_BATCH_SIZE,
+            help="Processed messages of a queue acked together.",
+        )
+
     def handle(self, *args, **options):
         connection_params = dict(
             host=settings.EDA_BROKER_HOST,
@@ -19,4 +37,11 @@ class Command(BaseCommand):  # pragma: no cover
             virtual_host=settings.EDA_VIRTUAL_HOST,
         )
 
+        connection_backend = connection_backend_class(
+            handle_consumers_function,
+            prefetch_count=options["prefetch"],
+            workers=options["workers"],
+            ack_batch_size=options["ack_batch_size"],
+            ack_interval=settings.EDA_ACK_INTERVAL,
+        )
         connection_backend.start_consuming(connection_params)
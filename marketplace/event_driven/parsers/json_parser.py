@@ -1,4 +1,4 @@
-import json
+from marketplace.core import json_codec
 
 from .base_parser import BaseParser
 from .exceptions import ParseError
@@ -16,6 +16,6 @@ class JSONParser(BaseParser):
 
         try:
             decoded_stream = stream.decode(encoding)
-            return json.loads(decoded_stream)
+            return json_codec.loads(decoded_stream)
         except ValueError as exc:
             raise ParseError("JSON parse error - %s" % str(exc))
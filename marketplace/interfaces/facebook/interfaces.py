@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import List, Dict, Any, Tuple
+from typing import List, Dict, Any, Iterator, Tuple
 
 
 class ProfileHandlerInterface(ABC):
@@ -47,6 +47,10 @@ class TemplatesRequestsInterface(ABC):
     def list_template_messages(self, waba_id: str) -> Dict[str, Any]:
         pass
 
+    @abstractmethod
+    def list_template_messages_pages(self, waba_id: str) -> Iterator[Dict[str, Any]]:
+        pass
+
     @abstractmethod
     def get_template_namespace(self, waba_id: str) -> str:
         pass
@@ -14,6 +14,8 @@ from marketplace.event_driven.consumers import EDAConsumer
 
 
 class ProjectConsumer(EDAConsumer):  # pragma: no cover
+    ordering_fields = ("uuid",)
+
     def consume(self, message: amqp.Message):
         print(f"[ProjectConsumer] - Consuming a message. Body: {message.body}")
 
@@ -7,6 +7,8 @@ from ..usecases import create_template_type
 
 
 class TemplateTypeConsumer(EDAConsumer):  # pragma: no cover
+    ordering_fields = ("uuid",)
+
     def consume(self, message: amqp.Message):
         print(f"[TemplateTypeConsumer] - Consuming a message. Body: {message.body}")
 
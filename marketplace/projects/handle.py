@@ -4,7 +4,15 @@ from .consumers import TemplateTypeConsumer, ProjectConsumer
 
 
 def handle_consumers(channel: Channel) -> None:
+    template_type_consumer = TemplateTypeConsumer()
     channel.basic_consume(
-        "integrations.template-types", callback=TemplateTypeConsumer().handle
+        "integrations.template-types",
+        callback=template_type_consumer.handle,
+        ordering_key=template_type_consumer.ordering_key,
+    )
+    project_consumer = ProjectConsumer()
+    channel.basic_consume(
+        "integrations.projects",
+        callback=project_consumer.handle,
+        ordering_key=project_consumer.ordering_key,
     )
-    channel.basic_consume("integrations.projects", callback=ProjectConsumer().handle)
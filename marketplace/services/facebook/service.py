@@ -2,7 +2,7 @@ import time
 import logging
 import requests
 
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Iterator
 
 from marketplace.applications.models import App
 from marketplace.wpp_products.models import Catalog
@@ -222,6 +222,9 @@ class TemplateService:
     def list_template_messages(self, waba_id: str) -> Dict[str, Any]:
         return self.client.list_template_messages(waba_id)
 
+    def list_template_messages_pages(self, waba_id: str) -> Iterator[Dict[str, Any]]:
+        return self.client.list_template_messages_pages(waba_id)
+
     def get_template_namespace(self, waba_id: str) -> str:
         return self.client.get_template_namespace(waba_id)
 
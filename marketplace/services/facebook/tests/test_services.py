@@ -82,6 +82,9 @@ class MockClient:
     def list_template_messages(self, waba_id):
         return {"messages": []}
 
+    def list_template_messages_pages(self, waba_id):
+        yield {"data": []}
+
     def get_template_namespace(self, waba_id):
         return "namespace"
 
@@ -376,6 +379,10 @@ class TestTemplateService(TestCase):
         response = self.service.list_template_messages("waba_id")
         self.assertEqual(response, {"messages": []})
 
+    def test_list_template_messages_pages(self):
+        pages = self.service.list_template_messages_pages("waba_id")
+        self.assertEqual(list(pages), [{"data": []}])
+
     def test_get_template_namespace(self):
         response = self.service.get_template_namespace("waba_id")
         self.assertEqual(response, "namespace")
@@ -0,0 +1,71 @@
+from unittest.mock import MagicMock, patch
+
+from django.test import SimpleTestCase
+
+from marketplace.clients.exceptions import CustomAPIException
+from marketplace.clients.facebook.client import TemplatesRequests
+
+
+def page(templates, after=None):
+    response = MagicMock()
+    data = {"data": templates}
+    if after:
+        data["paging"] = {"cursors": {"after": after}, "next": f"https://next/{after}"}
+    response.json.return_value = data
+    return response
+
+
+@patch("marketplace.clients.facebook.client.time.sleep")
+class TemplatesRequestsPaginationTestCase(SimpleTestCase):
+    def setUp(self):
+        self.client = TemplatesRequests("token")
+
+    def test_pages_follow_cursors(self, mock_sleep):
+        with patch.object(
+            self.client,
+            "make_request",
+            side_effect=[page([{"id": "1"}], after="c1"), page([{"id": "2"}])],
+        ) as make_request:
+            pages = list(self.client.list_template_messages_pages("waba", page_size=1))
+
+        self.assertEqual([p["data"] for p in pages], [[{"id": "1"}], [{"id": "2"}]])
+        self.assertNotIn("after", make_request.call_args_list[0].kwargs["params"])
+        self.assertEqual(make_request.call_args_list[1].kwargs["params"]["after"], "c1")
+        self.assertEqual(make_request.call_args_list[1].kwargs["params"]["limit"], 1)
+
+    def test_transient_error_resumes_from_last_cursor(self, mock_sleep):
+        with patch.object(
+            self.client,
+            "make_request",
+            side_effect=[
+                page([{"id": "1"}], after="c1"),
+                CustomAPIException(status_code=503),
+                page([{"id": "2"}]),
+            ],
+        ) as make_request:
+            pages = list(self.client.list_template_messages_pages("waba"))
+
+        self.assertEqual(len(pages), 2)
+        self.assertEqual(make_request.call_count, 3)
+        self.assertEqual(make_request.call_args_list[2].kwargs["params"]["after"], "c1")
+        mock_sleep.assert_called_once()
+
+    def test_client_error_is_raised(self, mock_sleep):
+        with patch.object(
+            self.client,
+            "make_request",
+            side_effect=CustomAPIException(status_code=400),
+        ) as make_request:
+            with self.assertRaises(CustomAPIException):
+                list(self.client.list_template_messages_pages("waba"))
+
+        make_request.assert_called_once()
+
+    def test_error_response_ends_listing(self, mock_sleep):
+        response = MagicMock()
+        response.json.return_value = {"error": {"code": 100}, "paging": {}}
+
+        with patch.object(self.client, "make_request", return_value=response):
+            pages = list(self.client.list_template_messages_pages("waba"))
+
+        self.assertEqual(pages, [{"error": {"code": 100}, "paging": {}}])
@@ -4,8 +4,20 @@ from typing import Union
 
 
 class CalculateByWeight(Rule):
+    TITLE_ENDINGS = ("kg", "g", "ml")
+    DESCRIPTION_ENDINGS = ("kg", "g", "unid", "unidade", "ml")
+    CATEGORIES_TO_CALCULATE = frozenset(
+        {
+            "hortifruti",
+            "carnes e aves",
+            "frios e laticínios",
+            "padaria",
+        }
+    )
+    TRIGGER_CATEGORIES = CATEGORIES_TO_CALCULATE
+
     def apply(self, product: FacebookProductDTO, **kwargs) -> bool:
-        if self._calculates_by_weight(product):
+        if self._calculates_by_weight(product, **kwargs):
             unit_multiplier = self._get_multiplier(product)
             weight = self._get_weight(product) * unit_multiplier
 
@@ -31,40 +43,18 @@ class CalculateByWeight(Rule):
     def _get_weight(self, product: FacebookProductDTO) -> float:
         return product.product_details["Dimension"]["weight"]
 
-    def _calculates_by_weight(self, product: FacebookProductDTO) -> bool:
-        title_endings = ["kg", "g", "ml"]
-        description_endings = ["kg", "g", "unid", "unidade", "ml"]
-
-        title_lower = product.title.lower()
-        description_lower = product.description.lower()
-
-        if any(title_lower.endswith(ending) for ending in title_endings) or any(
-            description_lower.endswith(ending) for ending in description_endings
-        ):
+    def _calculates_by_weight(self, product: FacebookProductDTO, **kwargs) -> bool:
+        if product.title.lower().endswith(
+            self.TITLE_ENDINGS
+        ) or product.description.lower().endswith(self.DESCRIPTION_ENDINGS):
             return False
 
-        if "iogurte" in (
-            category.lower()
-            for category in product.product_details["ProductCategories"].values()
-        ):
-            return False
-
-        categories_to_calculate = [
-            "hortifruti",
-            "carnes e aves",
-            "frios e laticínios",
-            "padaria",
-        ]
-        product_categories = {
-            k: v.lower()
-            for k, v in product.product_details["ProductCategories"].items()
-        }
+        product_categories = self.get_product_categories(product, **kwargs)
 
-        for category in categories_to_calculate:
-            if category in product_categories.values():
-                return True
+        if "iogurte" in product_categories:
+            return False
 
-        return False
+        return not self.CATEGORIES_TO_CALCULATE.isdisjoint(product_categories)
 
     def _format_price(self, price: Union[int, float]) -> str:
         return f"{price:.2f}"
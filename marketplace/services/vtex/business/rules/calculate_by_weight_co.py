@@ -4,13 +4,26 @@ from typing import Union
 
 
 class CalculateByWeightCO(Rule):
+    TITLE_ENDINGS = ("kg", "g", "ml", "unidad", "gr")
+    DESCRIPTION_ENDINGS = ("kg", "g", "unid", "unidade", "unidad", "ml")
+    INCREASED_PRICE_CATEGORIES = frozenset(
+        {
+            "carne y pollo",
+            "carne res",
+            "pescados y mariscos",
+            "pescado congelado",
+        }
+    )
+    CATEGORIES_TO_CALCULATE = INCREASED_PRICE_CATEGORIES | {"verduras", "frutas"}
+    TRIGGER_CATEGORIES = CATEGORIES_TO_CALCULATE
+
     def apply(self, product: FacebookProductDTO, **kwargs) -> bool:
-        if self._calculates_by_weight(product):
+        if self._calculates_by_weight(product, **kwargs):
             unit_multiplier = self._get_multiplier(product)
             weight = self._get_weight(product) * unit_multiplier
 
             # 10% increase for specific categories
-            if self._is_increased_price_category(product) and weight >= 500:
+            if self._is_increased_price_category(product, **kwargs) and weight >= 500:
                 increase_factor = 1.10  # 10%
                 product.price *= unit_multiplier * increase_factor
                 product.sale_price *= unit_multiplier * increase_factor
@@ -31,19 +44,11 @@ class CalculateByWeightCO(Rule):
 
         return True
 
-    def _is_increased_price_category(self, product: FacebookProductDTO) -> bool:
-        categories = [
-            "carne y pollo",
-            "carne res",
-            "pescados y mariscos",
-            "pescado congelado",
-        ]
-        product_categories = {
-            k: v.lower()
-            for k, v in product.product_details["ProductCategories"].items()
-        }
-
-        return any(category in product_categories.values() for category in categories)
+    def _is_increased_price_category(
+        self, product: FacebookProductDTO, **kwargs
+    ) -> bool:
+        product_categories = self.get_product_categories(product, **kwargs)
+        return not self.INCREASED_PRICE_CATEGORIES.isdisjoint(product_categories)
 
     def _get_multiplier(self, product: FacebookProductDTO) -> float:
         return product.product_details.get("UnitMultiplier", 1.0)
@@ -51,36 +56,14 @@ class CalculateByWeightCO(Rule):
     def _get_weight(self, product: FacebookProductDTO) -> float:
         return product.product_details["Dimension"]["weight"]
 
-    def _calculates_by_weight(self, product: FacebookProductDTO) -> bool:
-        title_endings = ["kg", "g", "ml", "unidad", "gr"]
-        description_endings = ["kg", "g", "unid", "unidade", "unidad", "ml"]
-
-        title_lower = product.title.lower()
-        description_lower = product.description.lower()
-
-        if any(title_lower.endswith(ending) for ending in title_endings) or any(
-            description_lower.endswith(ending) for ending in description_endings
-        ):
+    def _calculates_by_weight(self, product: FacebookProductDTO, **kwargs) -> bool:
+        if product.title.lower().endswith(
+            self.TITLE_ENDINGS
+        ) or product.description.lower().endswith(self.DESCRIPTION_ENDINGS):
             return False
 
-        all_categories = [
-            "carne y pollo",
-            "carne res",
-            "pescados y mariscos",
-            "pescado congelado",
-            "verduras",
-            "frutas",
-        ]
-        product_categories = {
-            k: v.lower()
-            for k, v in product.product_details["ProductCategories"].items()
-        }
-
-        for category in all_categories:
-            if category in product_categories.values():
-                return True
-
-        return False
+        product_categories = self.get_product_categories(product, **kwargs)
+        return not self.CATEGORIES_TO_CALCULATE.isdisjoint(product_categories)
 
     def _format_price(self, price: Union[int, float]) -> str:
         return f"{price:.2f}"
@@ -4,7 +4,10 @@ from marketplace.services.vtex.utils.data_processor import FacebookProductDTO
 
 
 class CategoriesBySeller(Rule):
-    HOME_APPLIANCES_CATEGORIES = {"eletrodoméstico", "eletro", "eletroportáteis"}
+    HOME_APPLIANCES_CATEGORIES = frozenset(
+        {"eletrodoméstico", "eletro", "eletroportáteis"}
+    )
+    TRIGGER_CATEGORIES = HOME_APPLIANCES_CATEGORIES
     DESCRIPTION_MAX_LENGTH = 9999
 
     def apply(self, product: FacebookProductDTO, **kwargs) -> bool:
@@ -12,7 +15,7 @@ class CategoriesBySeller(Rule):
         service = kwargs.get("service")
         domain = kwargs.get("domain")
 
-        if self._is_home_appliance(product):
+        if self._is_home_appliance(product, **kwargs):
             if seller_id != "gbarbosab101":
                 return False
 
@@ -34,17 +37,9 @@ class CategoriesBySeller(Rule):
 
         return True
 
-    def _get_categories(self, product: FacebookProductDTO) -> set:
-        return set(
-            category.lower()
-            for category in product.product_details.get(
-                "ProductCategories", {}
-            ).values()
-        )
-
-    def _is_home_appliance(self, product: FacebookProductDTO) -> bool:
-        product_categories = self._get_categories(product)
-        return bool(self.HOME_APPLIANCES_CATEGORIES.intersection(product_categories))
+    def _is_home_appliance(self, product: FacebookProductDTO, **kwargs) -> bool:
+        product_categories = self.get_product_categories(product, **kwargs)
+        return not self.HOME_APPLIANCES_CATEGORIES.isdisjoint(product_categories)
 
     def _product_specification(
         self, product: FacebookProductDTO, service, domain
@@ -14,14 +14,17 @@ class ExcludeAlcoholicDrinks(Rule):
         ALCOHOLIC_DRINKS_CATEGORIES (set): A set of category names that identify alcoholic drinks.
     """
 
-    ALCOHOLIC_DRINKS_CATEGORIES = {
-        "bebida alcoólica",
-        "bebidas alcoólicas",
-        "bebidas alcohólicas",
-        "vinos y licores",
-        "licores",
-        "vinos",
-    }
+    ALCOHOLIC_DRINKS_CATEGORIES = frozenset(
+        {
+            "bebida alcoólica",
+            "bebidas alcoólicas",
+            "bebidas alcohólicas",
+            "vinos y licores",
+            "licores",
+            "vinos",
+        }
+    )
+    TRIGGER_CATEGORIES = ALCOHOLIC_DRINKS_CATEGORIES
 
     def apply(self, product: FacebookProductDTO, **kwargs) -> bool:
         """
@@ -33,9 +36,9 @@ class ExcludeAlcoholicDrinks(Rule):
         Returns:
             bool: True if the product does not belong to alcoholic drinks category, False otherwise.
         """
-        return not self._is_alcoholic_drink(product)
+        return not self._is_alcoholic_drink(product, **kwargs)
 
-    def _is_alcoholic_drink(self, product: FacebookProductDTO) -> bool:
+    def _is_alcoholic_drink(self, product: FacebookProductDTO, **kwargs) -> bool:
         """
         Checks if the product belongs to any of the alcoholic drinks categories.
 
@@ -48,10 +51,5 @@ class ExcludeAlcoholicDrinks(Rule):
         Returns:
             bool: True if the product belongs to alcoholic drinks category, False otherwise.
         """
-        product_categories = set(
-            category.lower()
-            for category in product.product_details.get(
-                "ProductCategories", {}
-            ).values()
-        )
-        return bool(self.ALCOHOLIC_DRINKS_CATEGORIES.intersection(product_categories))
+        product_categories = self.get_product_categories(product, **kwargs)
+        return not self.ALCOHOLIC_DRINKS_CATEGORIES.isdisjoint(product_categories)
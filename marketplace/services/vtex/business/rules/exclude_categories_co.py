@@ -7,11 +7,14 @@ class ExcludeCustomizedCategoriesCO(Rule):
     Rule to exclude specific product categories for Colombia.
     """
 
-    CUSTOMIZED_EXCLUDED_CATEGORIES = {
-        "cigarrillos y tabacos",
-        "tabacos",
-        "cigarrillos",
-    }
+    CUSTOMIZED_EXCLUDED_CATEGORIES = frozenset(
+        {
+            "cigarrillos y tabacos",
+            "tabacos",
+            "cigarrillos",
+        }
+    )
+    TRIGGER_CATEGORIES = CUSTOMIZED_EXCLUDED_CATEGORIES
 
     def apply(self, product: FacebookProductDTO, **kwargs) -> bool:
         """
@@ -23,11 +26,13 @@ class ExcludeCustomizedCategoriesCO(Rule):
         Returns:
             bool: True if the product should be included, False if it is excluded.
         """
-        if self._is_customized_excluded_category(product):
+        if self._is_customized_excluded_category(product, **kwargs):
             return False  # Excluded product
         return True  # Product is valid
 
-    def _is_customized_excluded_category(self, product: FacebookProductDTO) -> bool:
+    def _is_customized_excluded_category(
+        self, product: FacebookProductDTO, **kwargs
+    ) -> bool:
         """
         Checks if the product is in the excluded categories.
 
@@ -37,12 +42,5 @@ class ExcludeCustomizedCategoriesCO(Rule):
         Returns:
             bool: True if the product is in an excluded category.
         """
-        product_categories = set(
-            category.lower()
-            for category in product.product_details.get(
-                "ProductCategories", {}
-            ).values()
-        )
-        return bool(
-            self.CUSTOMIZED_EXCLUDED_CATEGORIES.intersection(product_categories)
-        )
+        product_categories = self.get_product_categories(product, **kwargs)
+        return not self.CUSTOMIZED_EXCLUDED_CATEGORIES.isdisjoint(product_categories)
@@ -1,8 +1,35 @@
 from abc import ABC, abstractmethod
+from typing import FrozenSet, Optional
+
 from marketplace.services.vtex.utils.data_processor import FacebookProductDTO
 
 
 class Rule(ABC):  # TODO: structure order of execution of layers, to avoid conflicts
+    # Lowercased categories that the rule acts on. When set, the rule is
+    # skipped by the RulePipeline for products outside these categories.
+    TRIGGER_CATEGORIES: Optional[FrozenSet[str]] = None
+
     @abstractmethod
     def apply(self, product: FacebookProductDTO, **kwargs) -> bool:
         pass
+
+    def is_applicable(self, product_categories: FrozenSet[str]) -> bool:
+        if self.TRIGGER_CATEGORIES is None:
+            return True
+        return not self.TRIGGER_CATEGORIES.isdisjoint(product_categories)
+
+    @staticmethod
+    def get_product_categories(product: FacebookProductDTO, **kwargs) -> FrozenSet[str]:
+        """
+        Returns the lowercased product categories, reusing the ones
+        already computed by the RulePipeline when available.
+        """
+        product_categories = kwargs.get("product_categories")
+        if product_categories is None:
+            product_categories = frozenset(
+                category.lower()
+                for category in product.product_details.get(
+                    "ProductCategories", {}
+                ).values()
+            )
+        return product_categories
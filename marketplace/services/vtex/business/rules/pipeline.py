@@ -0,0 +1,124 @@
+import threading
+import time
+
+from typing import Dict, List, Optional, Sequence
+
+from .interface import Rule
+from .rule_mappings import RULE_MAPPINGS
+from marketplace.services.vtex.utils.data_processor import FacebookProductDTO
+
+
+class RulePipeline:
+    """
+    Ordered list of rule instances, built once per rules configuration.
+
+    Pipelines are cached by the tuple of rule names configured in the App, so
+    every processing call with the same configuration reuses the same rule
+    instances. The lowercased product categories are computed once per product
+    and shared with the rules, and rules whose TRIGGER_CATEGORIES do not match
+    the product are skipped. Time spent in each rule is accumulated, by its
+    position in the pipeline, for the lifetime of the pipeline, so a run
+    reports its own timings as the difference from a snapshot taken when it
+    started.
+    """
+
+    _cache: Dict[tuple, "RulePipeline"] = {}
+    _cache_lock = threading.Lock()
+
+    def __init__(self, rules: List[Rule]):
+        self.rules = rules
+        self._timings = [[0, 0.0] for _ in rules]
+        self._timings_lock = threading.Lock()
+
+    @classmethod
+    def from_rule_names(cls, rule_names: Sequence[str]) -> "RulePipeline":
+        key = tuple(rule_names)
+        with cls._cache_lock:
+            pipeline = cls._cache.get(key)
+            if pipeline is None:
+                pipeline = cls(cls._build_rules(rule_names))
+                cls._cache[key] = pipeline
+        return pipeline
+
+    @classmethod
+    def clear_cache(cls):
+        with cls._cache_lock:
+            cls._cache.clear()
+
+    @staticmethod
+    def _build_rules(rule_names: Sequence[str]) -> List[Rule]:
+        rules = []
+        for rule_name in rule_names:
+            rule_class = RULE_MAPPINGS.get(rule_name)
+            if rule_class:
+                rules.append(rule_class())
+            else:
+                print(f"Rule {rule_name} not found or not mapped.")
+        return rules
+
+    @staticmethod
+    def _rule_name(rule: Rule) -> str:
+        return type(rule).__name__
+
+    def apply(self, product: FacebookProductDTO, **kwargs) -> bool:
+        """
+        Applies the rules in order, stopping at the first one that rejects the product.
+        """
+        product_categories = Rule.get_product_categories(product)
+        kwargs["product_categories"] = product_categories
+
+        for position, rule in enumerate(self.rules):
+            if not rule.is_applicable(product_categories):
+                continue
+
+            start = time.perf_counter()
+            try:
+                applied = rule.apply(product, **kwargs)
+            finally:
+                self._record_timing(position, time.perf_counter() - start)
+
+            if not applied:
+                return False
+
+        return True
+
+    def _record_timing(self, position: int, elapsed: float):
+        with self._timings_lock:
+            timing = self._timings[position]
+            timing[0] += 1
+            timing[1] += elapsed
+
+    def get_timings(self) -> List[dict]:
+        """
+        Returns the number of calls and the total time in seconds spent in
+        each rule, in the order of the pipeline.
+        """
+        with self._timings_lock:
+            return [
+                {"rule": self._rule_name(rule), "calls": calls, "total_time": total}
+                for rule, (calls, total) in zip(self.rules, self._timings)
+            ]
+
+    def timings_summary(self, since: Optional[List[dict]] = None) -> str:
+        """Summarizes the timings, minus those of the `since` snapshot."""
+        timings = self.get_timings()
+        if since is not None:
+            for timing, previous in zip(timings, since):
+                timing["calls"] -= previous["calls"]
+                timing["total_time"] -= previous["total_time"]
+
+        timings.sort(key=lambda timing: timing["total_time"], reverse=True)
+        parts = [
+            f"{timing['rule']}: {timing['calls']} calls, {timing['total_time']:.3f}s"
+            for timing in timings
+        ]
+        return "; ".join(parts)
+
+    def __iter__(self):
+        return iter(self.rules)
+
+    def __len__(self):
+        return len(self.rules)
+
+    def __getitem__(self, index):
+        return self.rules[index]
@@ -6,8 +6,20 @@ from marketplace.services.vtex.utils.data_processor import FacebookProductDTO
 
 
 class RoundUpCalculateByWeight(Rule):
+    TITLE_ENDINGS = ("kg", "g", "ml")
+    DESCRIPTION_ENDINGS = ("kg", "g", "unid", "unidade", "ml")
+    CATEGORIES_TO_CALCULATE = frozenset(
+        {
+            "hortifruti",
+            "carnes e aves",
+            "frios e laticínios",
+            "padaria",
+        }
+    )
+    TRIGGER_CATEGORIES = CATEGORIES_TO_CALCULATE
+
     def apply(self, product: FacebookProductDTO, **kwargs) -> bool:
-        if self._calculates_by_weight(product):
+        if self._calculates_by_weight(product, **kwargs):
             unit_multiplier, weight = self._get_product_measurements(product)
 
             product.price *= unit_multiplier
@@ -46,7 +58,7 @@ class RoundUpCalculateByWeight(Rule):
     def _get_weight(self, product: FacebookProductDTO) -> float:
         return product.product_details["Dimension"]["weight"]
 
-    def _calculates_by_weight(self, product: FacebookProductDTO) -> bool:
+    def _calculates_by_weight(self, product: FacebookProductDTO, **kwargs) -> bool:
         """
         Determines if the weight calculation should be applied to a product based
         on its categories and description.
@@ -67,32 +79,17 @@ class RoundUpCalculateByWeight(Rule):
         Returns:
             bool: True if the product should be calculated by weight, False otherwise.
         """
-        title_lower = product.title.lower()
-        description_lower = product.description.lower()
-
-        if any(title_lower.endswith(ending) for ending in ["kg", "g", "ml"]):
+        if product.title.lower().endswith(self.TITLE_ENDINGS):
             return False
-        if any(
-            description_lower.endswith(ending)
-            for ending in ["kg", "g", "unid", "unidade", "ml"]
-        ):
+        if product.description.lower().endswith(self.DESCRIPTION_ENDINGS):
             return False
 
-        product_categories = {
-            value.lower()
-            for value in product.product_details["ProductCategories"].values()
-        }
-        categories_to_calculate = {
-            "hortifruti",
-            "carnes e aves",
-            "frios e laticínios",
-            "padaria",
-        }
+        product_categories = self.get_product_categories(product, **kwargs)
 
         if "iogurte" in product_categories:
             return False
 
-        return not categories_to_calculate.isdisjoint(product_categories)
+        return not self.CATEGORIES_TO_CALCULATE.isdisjoint(product_categories)
 
     def _format_grams(self, value: float) -> str:
         """
@@ -0,0 +1,107 @@
+from unittest.mock import patch
+
+from django.test import TestCase
+
+from marketplace.services.vtex.business.rules.pipeline import RulePipeline
+from marketplace.services.vtex.business.rules.exclude_alcoholic_drinks import (
+    ExcludeAlcoholicDrinks,
+)
+from marketplace.services.vtex.business.rules.currency_pt_br import CurrencyBRL
+from marketplace.services.vtex.utils.data_processor import FacebookProductDTO
+
+
+class TestRulePipeline(TestCase):
+    def setUp(self):
+        RulePipeline.clear_cache()
+        self.addCleanup(RulePipeline.clear_cache)
+
+    def _product(self, categories):
+        return FacebookProductDTO(
+            id="1",
+            title="Product",
+            description="Description",
+            availability="in stock",
+            status="active",
+            condition="new",
+            price=1000,
+            sale_price=900,
+            link="http://example.com/product",
+            image_link="http://example.com/image.jpg",
+            brand="Brand",
+            product_details={"ProductCategories": categories},
+        )
+
+    def test_pipeline_is_cached_by_rule_names(self):
+        rule_names = ["exclude_alcoholic_drinks", "currency_pt_br"]
+
+        pipeline = RulePipeline.from_rule_names(rule_names)
+
+        self.assertIs(pipeline, RulePipeline.from_rule_names(list(rule_names)))
+        self.assertIsNot(pipeline, RulePipeline.from_rule_names(["currency_pt_br"]))
+        self.assertIsInstance(pipeline[0], ExcludeAlcoholicDrinks)
+        self.assertIsInstance(pipeline[1], CurrencyBRL)
+
+    def test_unknown_rules_are_ignored(self):
+        pipeline = RulePipeline.from_rule_names(["currency_pt_br", "invalid_rule"])
+        self.assertEqual(len(pipeline), 1)
+
+    def test_apply_stops_at_rejecting_rule(self):
+        pipeline = RulePipeline.from_rule_names(
+            ["exclude_alcoholic_drinks", "currency_pt_br"]
+        )
+        product = self._product({"1": "Vinos"})
+
+        self.assertFalse(pipeline.apply(product))
+        self.assertEqual(product.price, 1000)
+
+    def test_apply_all_rules(self):
+        pipeline = RulePipeline.from_rule_names(
+            ["exclude_alcoholic_drinks", "currency_pt_br"]
+        )
+        product = self._product({"1": "Mercearia"})
+
+        self.assertTrue(pipeline.apply(product))
+        self.assertEqual(product.price, "10.00 BRL")
+
+    def test_rules_outside_trigger_categories_are_skipped(self):
+        pipeline = RulePipeline.from_rule_names(["exclude_alcoholic_drinks"])
+
+        with patch.object(ExcludeAlcoholicDrinks, "apply") as apply_mock:
+            self.assertTrue(pipeline.apply(self._product({"1": "Mercearia"})))
+
+        apply_mock.assert_not_called()
+
+    def test_timings_are_recorded_per_rule(self):
+        pipeline = RulePipeline.from_rule_names(
+            ["exclude_alcoholic_drinks", "currency_pt_br"]
+        )
+        pipeline.apply(self._product({"1": "Vinos"}))
+        pipeline.apply(self._product({"1": "Mercearia"}))
+
+        timings = pipeline.get_timings()
+
+        self.assertEqual(timings[0]["rule"], "ExcludeAlcoholicDrinks")
+        self.assertEqual(timings[0]["calls"], 1)
+        self.assertEqual(timings[1]["rule"], "CurrencyBRL")
+        self.assertEqual(timings[1]["calls"], 1)
+        self.assertIn("CurrencyBRL", pipeline.timings_summary())
+
+    def test_timings_of_the_same_rule_class_are_kept_apart(self):
+        pipeline = RulePipeline.from_rule_names(["currency_pt_br", "currency_pt_br"])
+        with patch.object(CurrencyBRL, "apply", return_value=True):
+            pipeline.apply(self._product({"1": "Mercearia"}))
+
+        timings = pipeline.get_timings()
+
+        self.assertEqual([timing["calls"] for timing in timings], [1, 1])
+
+    def test_timings_summary_since_snapshot(self):
+        pipeline = RulePipeline.from_rule_names(["currency_pt_br"])
+        pipeline.apply(self._product({"1": "Mercearia"}))
+        snapshot = pipeline.get_timings()
+
+        pipeline.apply(self._product({"1": "Mercearia"}))
+        pipeline.apply(self._product({"1": "Mercearia"}))
+
+        self.assertIn("CurrencyBRL: 2 calls", pipeline.timings_summary(since=snapshot))
+        self.assertIn("CurrencyBRL: 3 calls", pipeline.timings_summary())
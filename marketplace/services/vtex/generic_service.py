@@ -382,15 +382,19 @@ class CatalogProductInsertion:
         credentials, catalog, sellers: Optional[List[str]] = None
     ) -> None:
         from marketplace.celery import app as celery_app
+        from marketplace.core.claim_check import check_kwargs
 
         """Sends the insert task to the task queue."""
         celery_app.send_task(
             name="task_insert_vtex_products",
-            kwargs={
-                "credentials": credentials,
-                "catalog_uuid": str(catalog.uuid),
-                "sellers": sellers,
-            },
+            kwargs=check_kwargs(
+                {
+                    "credentials": credentials,
+                    "catalog_uuid": str(catalog.uuid),
+                    "sellers": sellers,
+                },
+                "sellers",
+            ),
             queue="product_first_synchronization",
         )
         print(
@@ -611,15 +615,19 @@ class CatalogInsertionBySeller:  # pragma: no cover
     @staticmethod
     def _send_task(credentials, catalog, sellers: Optional[List[str]] = None) -> None:
         from marketplace.celery import app as celery_app
+        from marketplace.core.claim_check import check_kwargs
 
         """Sends the insert task to the task queue."""
         celery_app.send_task(
             name="task_insert_vtex_products_by_sellers",
-            kwargs={
-                "credentials": credentials,
-                "catalog_uuid": str(catalog.uuid),
-                "sellers": sellers,
-            },
+            kwargs=check_kwargs(
+                {
+                    "credentials": credentials,
+                    "catalog_uuid": str(catalog.uuid),
+                    "sellers": sellers,
+                },
+                "sellers",
+            ),
             queue="product_first_synchronization",
         )
         print(
@@ -33,12 +33,14 @@ Example:
 
 from typing import List, Optional
 
+from django.conf import settings
 from django.core.cache import cache
 
 from marketplace.services.vtex.exceptions import CredentialsValidationError
 from marketplace.services.vtex.utils.data_processor import DataProcessor
-from marketplace.services.vtex.business.rules.rule_mappings import RULE_MAPPINGS
+from marketplace.services.vtex.business.rules.pipeline import RulePipeline
 from marketplace.services.vtex.utils.data_processor import FacebookProductDTO
+from marketplace.services.vtex.utils.lookup_cache import VtexLookupCache
 from marketplace.wpp_products.models import Catalog
 
 
@@ -47,6 +49,16 @@ class PrivateProductsService:
         self.client = client
         self.data_processor = data_processor_class()
         self.webhook_data_processor = data_processor_class(use_threads=False)
+        # Shared by the DataProcessor and the business rules, so a lookup already
+        # made in the pipeline is not repeated for the same product or SKU
+        self.specification_cache = VtexLookupCache(
+            "vtex_specification", timeout=settings.VTEX_SPECIFICATION_CACHE_TTL
+        )
+        self.seller_simulation_cache = VtexLookupCache(
+            "vtex_seller_simulation",
+            timeout=settings.VTEX_SIMULATION_CACHE_TTL,
+            maxsize=1_000,
+        )
         # TODO: Check if it makes sense to leave the domain instantiated
         # so that the domain parameter is removed from the methods
 
@@ -115,6 +127,7 @@ class PrivateProductsService:
 
         skus_ids = self.list_all_skus_ids(domain)
         rules = self._load_rules(config.get("rules", []))
+        self._clear_lookup_caches()
         store_domain = config.get("store_domain")
 
         products_dto = self.data_processor.process_product_data(
@@ -135,9 +148,12 @@ class PrivateProductsService:
         return self.client.get_product_details(sku_id, domain)
 
     def simulate_cart_for_seller(self, sku_id, seller_id, domain):
-        return self.client.pub_simulate_cart_for_seller(
-            sku_id, seller_id, domain
-        )  # TODO: Change to pvt_simulate_cart_for_seller
+        return self.seller_simulation_cache.get_or_fetch(
+            (domain, seller_id, sku_id),
+            lambda: self.client.pub_simulate_cart_for_seller(
+                sku_id, seller_id, domain
+            ),  # TODO: Change to pvt_simulate_cart_for_seller
+        )
 
     def simulate_cart_for_multiple_sellers(self, sku_id, sellers, domain):
         """
@@ -155,6 +171,15 @@ class PrivateProductsService:
             # Merge the results from the client into the overall results
             results.update(chunk_results)
 
+            # A cart with a single seller is the same simulation made by
+            # `simulate_cart_for_seller`, so the rules reuse it. The payment
+            # data of a cart with several sellers covers all of its items, so
+            # it can't stand for the simulation of one of them
+            if len(seller_chunk) == 1 and seller_chunk[0] in chunk_results:
+                self.seller_simulation_cache.set(
+                    (domain, seller_chunk[0], sku_id), chunk_results[seller_chunk[0]]
+                )
+
         return results
 
     def update_webhook_product_info(
@@ -163,6 +188,7 @@ class PrivateProductsService:
         config = catalog.vtex_app.config
         rules = self._load_rules(config.get("rules", []))
         store_domain = config.get("store_domain")
+        self._clear_lookup_caches()
         updated_products_dto = self.webhook_data_processor.process_product_data(
             skus_ids=skus_ids,
             active_sellers=seller_ids,
@@ -182,6 +208,7 @@ class PrivateProductsService:
         config = catalog.vtex_app.config
         rules = self._load_rules(config.get("rules", []))
         store_domain = config.get("store_domain")
+        self._clear_lookup_caches()
         updated_products_dto = self.webhook_data_processor.process_sellers_skus_batch(
             service=self,
             domain=domain,
@@ -194,7 +221,10 @@ class PrivateProductsService:
         return updated_products_dto
 
     def get_product_specification(self, product_id, domain):
-        return self.client.get_product_specification(product_id, domain)
+        return self.specification_cache.get_or_fetch(
+            (domain, product_id),
+            lambda: self.client.get_product_specification(product_id, domain),
+        )
 
     # ================================
     # Private Methods
@@ -203,12 +233,9 @@ class PrivateProductsService:
     def _is_domain_valid(self, domain):
         return self.client.check_domain(domain)
 
-    def _load_rules(self, rule_names):
-        rules = []
-        for rule_name in rule_names:
-            rule_class = RULE_MAPPINGS.get(rule_name)
-            if rule_class:
-                rules.append(rule_class())
-            else:
-                print(f"Rule {rule_name} not found or not mapped.")
-        return rules
+    def _clear_lookup_caches(self):
+        self.specification_cache.clear()
+        self.seller_simulation_cache.clear()
+
+    def _load_rules(self, rule_names) -> RulePipeline:
+        return RulePipeline.from_rule_names(rule_names)
@@ -167,3 +167,74 @@ class PrivateProductsServiceTestCase(TestCase):
             )
         self.assertIsInstance(products, list)
         self.service.data_processor.process_product_data.assert_called_once()
+
+    @patch("django.core.cache.cache.set")
+    @patch("django.core.cache.cache.get", return_value=None)
+    def test_get_product_specification_is_memoized(self, mock_cache_get, _):
+        self.mock_client.get_product_specification = Mock(return_value=[])
+
+        self.service.get_product_specification(1, "valid.domain.com")
+        self.service.get_product_specification("1", "valid.domain.com")
+
+        self.mock_client.get_product_specification.assert_called_once_with(
+            1, "valid.domain.com"
+        )
+        mock_cache_get.assert_called_once_with("vtex_specification:valid.domain.com:1")
+
+    @patch("django.core.cache.cache.get")
+    def test_get_product_specification_uses_shared_cache(self, mock_cache_get):
+        mock_cache_get.return_value = [{"Name": "Voltagem", "Value": ["220V"]}]
+        self.mock_client.get_product_specification = Mock()
+
+        specification = self.service.get_product_specification(1, "valid.domain.com")
+
+        self.assertEqual(specification, mock_cache_get.return_value)
+        self.mock_client.get_product_specification.assert_not_called()
+
+    def test_simulate_cart_for_seller_is_memoized_per_run(self):
+        self.mock_client.pub_simulate_cart_for_seller = Mock(
+            return_value={"is_available": True}
+        )
+
+        self.service.simulate_cart_for_seller("1", "seller1", "valid.domain.com")
+        self.service.simulate_cart_for_seller(1, "seller1", "valid.domain.com")
+        self.service.simulate_cart_for_seller(1, "seller2", "valid.domain.com")
+
+        self.assertEqual(self.mock_client.pub_simulate_cart_for_seller.call_count, 2)
+
+        self.service._clear_lookup_caches()
+        self.service.simulate_cart_for_seller(1, "seller1", "valid.domain.com")
+
+        self.assertEqual(self.mock_client.pub_simulate_cart_for_seller.call_count, 3)
+
+    def test_single_seller_cart_simulation_is_reused(self):
+        self.mock_client.simulate_cart_for_multiple_sellers = Mock(
+            return_value={"seller1": {"is_available": True, "price": 100}}
+        )
+        self.mock_client.pub_simulate_cart_for_seller = Mock()
+
+        self.service.simulate_cart_for_multiple_sellers(
+            1, ["seller1"], "valid.domain.com"
+        )
+        cart = self.service.simulate_cart_for_seller(1, "seller1", "valid.domain.com")
+
+        self.assertEqual(cart, {"is_available": True, "price": 100})
+        self.mock_client.pub_simulate_cart_for_seller.assert_not_called()
+
+    def test_multiple_sellers_cart_simulation_is_not_reused(self):
+        self.mock_client.simulate_cart_for_multiple_sellers = Mock(
+            return_value={
+                "seller1": {"is_available": True, "price": 100},
+                "seller2": {"is_available": True, "price": 200},
+            }
+        )
+        self.mock_client.pub_simulate_cart_for_seller = Mock(
+            return_value={"is_available": True}
+        )
+
+        self.service.simulate_cart_for_multiple_sellers(
+            1, ["seller1", "seller2"], "valid.domain.com"
+        )
+        self.service.simulate_cart_for_seller(1, "seller1", "valid.domain.com")
+
+        self.mock_client.pub_simulate_cart_for_seller.assert_called_once()
@@ -0,0 +1,83 @@
+import threading
+
+from unittest.mock import MagicMock, patch
+
+from django.test import SimpleTestCase
+
+from marketplace.services.vtex.utils.data_processor import (
+    DataProcessor,
+    ProgressCounter,
+)
+
+
+class ProgressCounterTestCase(SimpleTestCase):
+    def test_increment_from_many_threads(self):
+        counter = ProgressCounter()
+
+        def increment():
+            for _ in range(1000):
+                counter.increment()
+
+        threads = [threading.Thread(target=increment) for _ in range(10)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(counter.value, 10_000)
+
+
+class DataProcessorBatchPersistenceTestCase(SimpleTestCase):
+    def setUp(self):
+        self.processor = DataProcessor()
+        self.processor.batch_size = 2
+        self.processor.results = []
+        self.processor.upload_on_sync = True
+        self.processor.sent_to_db_count = 0
+        self.processor.valid_products = ProgressCounter()
+        self.processor.invalid_products = ProgressCounter()
+        self.processor.progress_bar = MagicMock()
+
+    def test_full_batches_are_saved_by_the_writer_thread(self):
+        saved_batches = []
+        saved_by_threads = set()
+
+        def save(batch):
+            saved_batches.append(batch)
+            saved_by_threads.add(threading.current_thread())
+            return True
+
+        with patch.object(self.processor, "_save_batch_to_database", side_effect=save):
+            self.processor._start_background_threads()
+            for item in ["a", "b", "c", "d", "e"]:
+                self.processor._handle_processing_result([item])
+            self.processor._handle_processing_result([])
+            self.processor._stop_background_threads()
+
+        self.assertEqual(saved_batches, [["a", "b"], ["c", "d"]])
+        self.assertNotIn(threading.current_thread(), saved_by_threads)
+        self.assertEqual(self.processor.results, ["e"])
+        self.assertEqual(self.processor.valid_products.value, 5)
+        self.assertEqual(self.processor.invalid_products.value, 1)
+
+    def test_failed_batches_are_kept_for_retry(self):
+        with patch.object(
+            self.processor, "_save_batch_to_database", return_value=False
+        ):
+            self.processor._start_background_threads()
+            for item in ["a", "b", "c"]:
+                self.processor._handle_processing_result([item])
+            self.processor._stop_background_threads()
+
+        self.assertEqual(self.processor.results, ["a", "b", "c"])
+
+    def test_save_remaining_results_in_batches(self):
+        self.processor.results = ["a", "b", "c"]
+
+        with patch.object(
+            self.processor, "_save_batch_to_database", side_effect=[True, False]
+        ) as save_mock:
+            self.processor._save_remaining_results()
+
+        self.assertEqual(save_mock.call_count, 2)
+        self.assertEqual(self.processor.results, ["c"])
@@ -0,0 +1,53 @@
+import re
+
+from django.test import SimpleTestCase
+
+from marketplace.services.vtex.utils.text_normalizer import (
+    normalize_text,
+    normalize_texts,
+)
+
+
+def legacy_clean_text(text: str) -> str:
+    """Previous DataProcessor.clean_text implementation, kept as reference."""
+    text = re.sub(r"<[^>]*>", "", text)
+    text = text.replace('"', "").replace("'", " ")
+    text = re.sub(r"\r\n|\r|\n", "\n", text)
+    text = re.sub(r"[ \t]+", " ", text.strip())
+    text = text.replace("•", "")
+    text = re.sub(r"\.(?=[^\s\n])", ". ", text)
+    return text
+
+
+SAMPLE_TEXTS = [
+    "",
+    "Arroz Branco Tipo 1 5Kg",
+    "  Leite   Integral\t1L  ",
+    '<p>Descrição do <b>"produto"</b></p><br/>Marca d\'água.Nova fórmula.',
+    "• Item 1\r\n• Item 2\r• Item 3\n•Item 4",
+    "Preço: R$ 10.99.Oferta válida.\r\n\r\nConsulte.",
+    "<ul><li>Voltagem: 220V</li><li>Garantia: 12 meses.</li></ul>",
+    "Texto com '\"aspas\"' e  •  marcadores . Fim.",
+    "a • b",
+    "• começo",
+    "v1.0.2 e 3.5mm",
+]
+
+
+class NormalizeTextTestCase(SimpleTestCase):
+    def test_matches_legacy_clean_text(self):
+        for text in SAMPLE_TEXTS:
+            with self.subTest(text=text):
+                self.assertEqual(normalize_text(text), legacy_clean_text(text))
+
+    def test_normalize_texts_keeps_order(self):
+        self.assertEqual(
+            normalize_texts(SAMPLE_TEXTS),
+            [legacy_clean_text(text) for text in SAMPLE_TEXTS],
+        )
+
+    def test_normalize_text(self):
+        self.assertEqual(
+            normalize_text('<p>Café  "Especial"</p>\r\n• 500g.Torrado'),
+            "Café Especial\n 500g. Torrado",
+        )
@@ -1,47 +1,65 @@
 import concurrent.futures
 
 import threading
-import re
 
 from typing import List
 
 from tqdm import tqdm
 from queue import Queue
 
+from django.db import connections
+
 from marketplace.services.product.product_facebook_manage import ProductFacebookManager
 from marketplace.services.vtex.utils.facebook_product_dto import FacebookProductDTO
 from marketplace.services.vtex.utils.sku_validator import SKUValidator
+from marketplace.services.vtex.utils.text_normalizer import (
+    normalize_text,
+    normalize_texts,
+)
 from marketplace.clients.exceptions import CustomAPIException
 from marketplace.clients.zeroshot.client import MockZeroShotClient
 from marketplace.wpp_products.utils import UploadManager
 
 
+class ProgressCounter:
+    """
+    Counter incremented by many threads without a shared lock: each thread
+    writes only its own slot and readers sum all of them.
+    """
+
+    def __init__(self):
+        self._local = threading.local()
+        self._slots = []
+
+    def increment(self, amount: int = 1):
+        slot = getattr(self._local, "slot", None)
+        if slot is None:
+            slot = self._local.slot = [0]
+            self._slots.append(slot)
+        slot[0] += amount
+
+    @property
+    def value(self) -> int:
+        return sum(slot[0] for slot in list(self._slots))
+
+
 class DataProcessor:
     def __init__(self, use_threads=True):
         self.max_workers = 100
-        self.progress_lock = threading.Lock()
         self.use_threads = use_threads
         self.batch_size = 5000
-        self.save_lock = threading.Lock()  # Exclusive lock for _save_batch_to_database
+        # Guards only the in-memory results buffer, never database writes
+        self.results_lock = threading.Lock()
+        # Batches waiting for the writer thread, bounded to limit memory usage
+        self.write_queue_size = 2
+        self.progress_refresh_interval = 1  # seconds
 
     @staticmethod
     def clean_text(text: str) -> str:
         """Cleans up text by removing HTML tags, replacing quotes with empty space,
         replacing commas with semicolons, and normalizing whitespace but keeping new lines.
         """
-        # Remove HTML tags
-        text = re.sub(r"<[^>]*>", "", text)
-        # Replace double and single quotes with empty space
-        text = text.replace('"', "").replace("'", " ")
-        # Normalize new lines and carriage returns to a single newline
-        text = re.sub(r"\r\n|\r|\n", "\n", text)
-        # Remove excessive whitespace but keep new lines
-        text = re.sub(r"[ \t]+", " ", text.strip())
-        # Remove bullet points
-        text = text.replace("•", "")
-        # Ensure there's a space after a period, unless followed by a new line
-        text = re.sub(r"\.(?=[^\s\n])", ". ", text)
-        return text
+        return normalize_text(text)
 
     @staticmethod
     def extract_fields(
@@ -76,8 +94,7 @@ class DataProcessor:
         title = title[:200].title()
         description = description[:9999].title()
         # Clean title and description
-        title = DataProcessor.clean_text(title)
-        description = DataProcessor.clean_text(description)
+        title, description = normalize_texts([title, description])
 
         availability = (
             "in stock" if availability_details["is_available"] else "out of stock"
@@ -123,9 +140,10 @@ class DataProcessor:
         self.domain = domain
         self.store_domain = store_domain
         self.rules = rules
+        self.rules_timings = rules.get_timings()
         self.update_product = update_product
-        self.invalid_products_count = 0
-        self.valid_products_count = 0
+        self.invalid_products = ProgressCounter()
+        self.valid_products = ProgressCounter()
         self.catalog = catalog
         self.sku_validator = SKUValidator(service, domain, MockZeroShotClient())
         self.upload_on_sync = upload_on_sync
@@ -142,6 +160,7 @@ class DataProcessor:
         for sku_id in skus_ids:
             self.queue.put(sku_id)
 
+        self._start_background_threads()
         try:
             # Process items in queue
             if self.use_threads:
@@ -149,17 +168,19 @@ class DataProcessor:
             else:
                 self._process_queue_without_threads()
         finally:
+            self._stop_background_threads()
             # Close the progress bar after processing, even in case of errors
             self.progress_bar.close()
 
         # Upload remaining items in the buffer
         if self.upload_on_sync and self.results:
             print(f"Uploading the last {len(self.results)} items to the database.")
-            self._save_batch_to_database()
+            self._save_remaining_results()
 
         print(
-            f"Processing completed. Total valid products: {self.valid_products_count}"
+            f"Processing completed. Total valid products: {self.valid_products.value}"
         )
+        print(f"Rules timing: {self.rules.timings_summary(since=self.rules_timings)}")
         return self.results
 
     def _process_queue_with_threads(self):
@@ -229,39 +250,90 @@ class DataProcessor:
 
     def _handle_processing_result(self, processing_result):
         """
-        Handles the processing result: updates results, progress, and performs batch saving if necessary.
+        Handles the processing result: updates results and progress, and hands a
+        full batch over to the writer thread when needed.
         """
-        with self.progress_lock:
-            if processing_result:
-                self.valid_products_count += 1
-                self.results.extend(processing_result)
-                self.progress_bar.set_description(
-                    f"[✓:{len(self.results)} | DB:{self.sent_to_db_count} | ✗:{self.invalid_products_count}]"
-                )
-                if self.upload_on_sync and len(self.results) >= self.batch_size:
-                    with self.save_lock:
-                        print(
-                            f"Batch size of {self.batch_size} reached. Saving to the database."
-                        )
-                        self._save_batch_to_database()
-            else:
-                self.invalid_products_count += 1
-                self.progress_bar.set_description(
-                    f"[✓:{len(self.results)} | DB:{self.sent_to_db_count} | ✗:{self.invalid_products_count}]"
-                )
-            self.progress_bar.update(1)
+        if not processing_result:
+            self.invalid_products.increment()
+            return
+
+        self.valid_products.increment()
+        batch = None
+        with self.results_lock:
+            self.results.extend(processing_result)
+            if self.upload_on_sync and len(self.results) >= self.batch_size:
+                batch = self.results[: self.batch_size]
+                self.results = self.results[self.batch_size :]  # noqa: E203
+
+        if batch:
+            print(f"Batch size of {self.batch_size} reached. Sending to the writer.")
+            # Blocks only when the writer is behind by more than write_queue_size batches
+            self.write_queue.put(batch)
 
     def _handle_worker_error(self, item, error_message: str):
         """
         Handles errors during worker processing by logging and updating progress.
         """
         print(f"Error processing item {item}: {error_message}")
-        with self.progress_lock:
-            self.invalid_products_count += 1
-            self.progress_bar.set_description(
-                f"[✓:{len(self.results)} | DB:{self.sent_to_db_count} | ✗:{self.invalid_products_count}]"
+        self.invalid_products.increment()
+
+    def _start_background_threads(self):
+        """
+        Starts the progress reporter and, when saving during processing, the
+        single writer thread that persists batches while the workers keep running.
+        """
+        self.write_queue = Queue(maxsize=self.write_queue_size)
+        self.processing_finished = threading.Event()
+
+        self.progress_thread = threading.Thread(
+            target=self._report_progress, daemon=True
+        )
+        self.progress_thread.start()
+
+        self.writer_thread = None
+        if self.upload_on_sync:
+            self.writer_thread = threading.Thread(
+                target=self._write_batches, daemon=True
             )
-            self.progress_bar.update(1)
+            self.writer_thread.start()
+
+    def _stop_background_threads(self):
+        if self.writer_thread:
+            self.write_queue.put(None)  # Sentinel: no more batches
+            self.writer_thread.join()
+
+        self.processing_finished.set()
+        self.progress_thread.join()
+        self._refresh_progress()
+
+    def _write_batches(self):
+        """Writer thread loop: saves queued batches until the sentinel is received."""
+        try:
+            while True:
+                batch = self.write_queue.get()
+                if batch is None:
+                    break
+
+                if not self._save_batch_to_database(batch):
+                    # Keep the items in the buffer so they are retried at the end
+                    with self.results_lock:
+                        self.results = batch + self.results
+        finally:
+            # Database connections are per thread, close the writer's one
+            connections.close_all()
+
+    def _report_progress(self):
+        while not self.processing_finished.wait(self.progress_refresh_interval):
+            self._refresh_progress()
+
+    def _refresh_progress(self):
+        valid = self.valid_products.value
+        invalid = self.invalid_products.value
+        self.progress_bar.set_description(
+            f"[✓:{valid} | DB:{self.sent_to_db_count} | ✗:{invalid}]", refresh=False
+        )
+        self.progress_bar.n = valid + invalid
+        self.progress_bar.refresh()
 
     def process_single_sku(self, sku_id):
         """
@@ -327,13 +399,7 @@ class DataProcessor:
                 "service": self.service,
                 "domain": self.domain,
             }
-            all_rules_applied = True
-            for rule in self.rules:
-                if not rule.apply(product_dto, **params):
-                    all_rules_applied = False
-                    break
-
-            if all_rules_applied:
+            if self.rules.apply(product_dto, **params):
                 facebook_products.append(product_dto)
 
         return facebook_products
@@ -371,13 +437,23 @@ class DataProcessor:
 
         return True
 
-    def _save_batch_to_database(self):
+    def _save_remaining_results(self):
+        """
+        Saves the items left in the buffer after processing, batch by batch.
+        """
+        remaining, self.results = self.results, []
+        for start in range(0, len(remaining), self.batch_size):
+            batch = remaining[start : start + self.batch_size]  # noqa: E203
+            if not self._save_batch_to_database(batch):
+                self.results.extend(batch)
+
+    def _save_batch_to_database(self, batch: List[FacebookProductDTO]) -> bool:
         """
-        Saves processed products to the database in batches.
+        Saves a batch of processed products to the database.
+        Returns True when the batch was saved.
         """
-        batch = self.results[: self.batch_size]
         if not batch:
-            return
+            return True
 
         try:
             product_manager = ProductFacebookManager()  # Manages database interactions.
@@ -392,18 +468,16 @@ class DataProcessor:
                 # Increment the saved item counter
                 self.sent_to_db_count += len(batch)
 
-                # Remove saved items from the buffer.
-                self.results = self.results[self.batch_size :]  # noqa: E203
-
                 # Start upload task
                 UploadManager.check_and_start_upload(self.vtex_app.uuid)
-            else:
-                print(
-                    "Failed to save batch to the database. Will retry in the next cycle."
-                )
+                return True
+
+            print("Failed to save batch to the database. Will retry in the next cycle.")
         except Exception as e:
             print(f"Error while saving batch to the database: {e}")
 
+        return False
+
     def process_sellers_skus_batch(
         self,
         service,
@@ -421,12 +495,13 @@ class DataProcessor:
         # Initialize configuration
         self.queue = Queue()
         self.results = []
-        self.invalid_products_count = 0
-        self.valid_products_count = 0
+        self.invalid_products = ProgressCounter()
+        self.valid_products = ProgressCounter()
         self.service = service
         self.domain = domain
         self.store_domain = store_domain
         self.rules = rules
+        self.rules_timings = rules.get_timings()
         self.catalog = catalog
         self.vtex_app = self.catalog.vtex_app
         self.upload_on_sync = upload_on_sync
@@ -446,6 +521,7 @@ class DataProcessor:
         # Determine whether to use threads
         use_threads = len(seller_sku_pairs) > 10
 
+        self._start_background_threads()
         try:
             # Process items in queue
             if use_threads:
@@ -453,18 +529,20 @@ class DataProcessor:
             else:
                 self._process_queue_without_threads()
         finally:
+            self._stop_background_threads()
             # Close the progress bar after processing, even in case of errors
             self.progress_bar.close()
 
         # Save remaining items in buffer
         if self.results:
             print(f"Uploading the last {len(self.results)} items to the database.")
-            self._save_batch_to_database()
+            self._save_remaining_results()
 
         # Final log and return
         print(
-            f"Processing completed. Total valid products: {self.valid_products_count}"
+            f"Processing completed. Total valid products: {self.valid_products.value}"
         )
+        print(f"Rules timing: {self.rules.timings_summary(since=self.rules_timings)}")
         if initial_batch_count > 0 and len(self.results) == 0:
             print("All items processed successfully.")
             return True
@@ -524,13 +602,7 @@ class DataProcessor:
             "service": self.service,
             "domain": self.domain,
         }
-        all_rules_applied = True
-        for rule in self.rules:
-            if not rule.apply(product_dto, **params):
-                all_rules_applied = False
-                break
-
-        if all_rules_applied:
+        if self.rules.apply(product_dto, **params):
             facebook_products.append(product_dto)
 
         return facebook_products
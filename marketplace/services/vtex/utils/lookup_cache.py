@@ -0,0 +1,81 @@
+import logging
+import threading
+
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Tuple
+
+from django.core.cache import cache
+
+
+logger = logging.getLogger(__name__)
+
+
+class VtexLookupCache:
+    """
+    Memoizes VTEX lookups that are repeated while processing products.
+
+    Values are kept in a bounded in-process LRU scoped to a processing run
+    (see `clear`) and, when `timeout` is greater than zero, also in the shared
+    Django cache for `timeout` seconds so other workers can reuse them.
+    """
+
+    def __init__(self, prefix: str, timeout: int = 0, maxsize: int = 10_000):
+        self.prefix = prefix
+        self.timeout = timeout
+        self.maxsize = maxsize
+        self._local = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_or_fetch(self, key_parts: Tuple[Hashable, ...], fetch: Callable[[], Any]):
+        key = tuple(str(part) for part in key_parts)
+
+        with self._lock:
+            if key in self._local:
+                self._local.move_to_end(key)
+                return self._local[key]
+
+        value = self._get_shared(key)
+        if value is None:
+            value = fetch()
+            self._set_shared(key, value)
+
+        self._set_local(key, value)
+        return value
+
+    def set(self, key_parts: Tuple[Hashable, ...], value):
+        """Stores a value fetched by other means, as `get_or_fetch` would."""
+        key = tuple(str(part) for part in key_parts)
+        self._set_shared(key, value)
+        self._set_local(key, value)
+
+    def clear(self):
+        """Drops the in-process values, starting a new processing run."""
+        with self._lock:
+            self._local.clear()
+
+    def _set_local(self, key, value):
+        with self._lock:
+            self._local[key] = value
+            self._local.move_to_end(key)
+            while len(self._local) > self.maxsize:
+                self._local.popitem(last=False)
+
+    def _shared_key(self, key) -> str:
+        return f"{self.prefix}:{':'.join(key)}"
+
+    def _get_shared(self, key):
+        if self.timeout <= 0:
+            return None
+        try:
+            return cache.get(self._shared_key(key))
+        except Exception as e:
+            logger.warning(f"Error reading {self._shared_key(key)} from cache: {e}")
+            return None
+
+    def _set_shared(self, key, value):
+        if self.timeout <= 0 or value is None:
+            return
+        try:
+            cache.set(self._shared_key(key), value, timeout=self.timeout)
+        except Exception as e:
+            logger.warning(f"Error writing {self._shared_key(key)} to cache: {e}")
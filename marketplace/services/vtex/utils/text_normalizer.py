@@ -0,0 +1,52 @@
+"""
+Text normalization for product titles and descriptions sent to Meta.
+
+Produces the same output as the original `DataProcessor.clean_text`, with the
+patterns compiled once at import time and each substitution skipped when the
+text does not contain the characters it acts on. Character cleanup uses
+`str.replace`, which is much faster than `str.translate` on non-ASCII text.
+"""
+
+import re
+
+from typing import Iterable, List
+
+
+HTML_TAGS_PATTERN = re.compile(r"<[^>]*>")
+HORIZONTAL_SPACES_PATTERN = re.compile(r"[ \t]+")
+PERIOD_WITHOUT_SPACE_PATTERN = re.compile(r"\.(?=\S)")
+
+BULLET_POINT = "•"
+
+
+def normalize_text(text: str) -> str:
+    """Cleans up text by removing HTML tags, replacing quotes with empty space,
+    removing bullet points and normalizing whitespace but keeping new lines.
+    """
+    # Remove HTML tags
+    if "<" in text:
+        text = HTML_TAGS_PATTERN.sub("", text)
+    # Remove double quotes and replace single quotes with a space
+    if '"' in text:
+        text = text.replace('"', "")
+    if "'" in text:
+        text = text.replace("'", " ")
+    # Normalize new lines and carriage returns to a single newline
+    if "\r" in text:
+        text = text.replace("\r\n", "\n").replace("\r", "\n")
+    # Remove excessive whitespace but keep new lines
+    text = text.strip()
+    if "  " in text or "\t" in text:
+        text = HORIZONTAL_SPACES_PATTERN.sub(" ", text)
+    # Remove bullet points
+    if BULLET_POINT in text:
+        text = text.replace(BULLET_POINT, "")
+    # Ensure there's a space after a period, unless followed by a new line
+    if "." in text:
+        text = PERIOD_WITHOUT_SPACE_PATTERN.sub(". ", text)
+    return text
+
+
+def normalize_texts(texts: Iterable[str]) -> List[str]:
+    """Normalizes a batch of texts, returning them in the same order."""
+    return [normalize_text(text) for text in texts]
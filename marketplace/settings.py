@@ -169,8 +169,21 @@ REST_FRAMEWORK = {
     "DEFAULT_PERMISSION_CLASSES": [
         "rest_framework.permissions.AllowAny",
     ],
+    "DEFAULT_RENDERER_CLASSES": [
+        "marketplace.core.renderers.FastJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ],
+    "DEFAULT_PARSER_CLASSES": [
+        "marketplace.core.parsers.FastJSONParser",
+        "rest_framework.parsers.FormParser",
+        "rest_framework.parsers.MultiPartParser",
+    ],
 }
 
+# Codec of the JSON written and read by Celery, DRF and the EDA consumers,
+# "orjson" or "json" for the standard library
+JSON_CODEC = env.str("JSON_CODEC", default="orjson")
+
 
 # AWS Configurations
 
@@ -228,6 +241,21 @@ OIDC_CACHE_TOKEN = env.bool(
 OIDC_CACHE_TTL = env.int(
     "OIDC_CACHE_TTL", default=600
 )  # Time-to-live for cached user tokens (default: 600 seconds).
+OIDC_LOCAL_TOKEN_VALIDATION = env.bool(
+    "OIDC_LOCAL_TOKEN_VALIDATION", default=False
+)  # Validate signed access tokens against the cached JWKS instead of requesting the userinfo.
+OIDC_JWKS_CACHE_TTL = env.int(
+    "OIDC_JWKS_CACHE_TTL", default=60 * 60
+)  # Time-to-live for the cached JWKS keys (default: 3600 seconds).
+OIDC_TOKEN_ISSUER = env.str(
+    "OIDC_TOKEN_ISSUER", default=None
+)  # Expected `iss` of locally validated access tokens, not checked when unset.
+OIDC_TOKEN_AUDIENCE = env.str(
+    "OIDC_TOKEN_AUDIENCE", default=None
+)  # Expected `aud` or `azp` of locally validated access tokens, not checked when unset.
+OIDC_TOKEN_LEEWAY = env.int(
+    "OIDC_TOKEN_LEEWAY", default=30
+)  # Clock skew allowed when checking the access token expiration (default: 30 seconds).
 
 # django-cors-headers Configurations
 
@@ -259,9 +287,15 @@ REDIS_URL = env.str("REDIS_URL", default="redis://localhost:6379")
 CELERY_BROKER_URL = env.str("CELERY_BROKER_URL", default=REDIS_URL)
 CELERY_RESULT_BACKEND = None
 CELERY_ACCEPT_CONTENT = ["application/json"]
-CELERY_TASK_SERIALIZER = "json"
-CELERY_RESULT_SERIALIZER = "json"
+# Registered by marketplace.celery, it writes the same JSON as "json"
+CELERY_TASK_SERIALIZER = "fastjson"
+CELERY_RESULT_SERIALIZER = "fastjson"
 CELERY_TIMEZONE = TIME_ZONE
+# Task arguments encoded to at least this many bytes are kept in Redis and
+# passed to the task by reference, see marketplace.core.claim_check
+CELERY_CLAIM_CHECK_MIN_SIZE = env.int("CELERY_CLAIM_CHECK_MIN_SIZE", default=32768)
+# Seconds a stored argument is kept, it must outlast the longest queue wait
+CELERY_CLAIM_CHECK_TTL = env.int("CELERY_CLAIM_CHECK_TTL", default=60 * 60 * 48)
 
 
 # Cache
@@ -323,6 +357,15 @@ WHATSAPP_API_URL = urllib.parse.urljoin(
 WHATSAPP_APPLICATION_SECRET = env.str("WHATSAPP_APPLICATION_SECRET", default="")
 WHATSAPP_APPLICATION_ID = env.str("WHATSAPP_APPLICATION_ID", default="")
 
+# Conversation analytics of a day are cached without expiration once this many
+# seconds passed since its end, the days still open are cached for a short TTL
+WHATSAPP_CONVERSATIONS_CLOSED_DAY_DELAY = env.int(
+    "WHATSAPP_CONVERSATIONS_CLOSED_DAY_DELAY", default=48 * 60 * 60
+)
+WHATSAPP_CONVERSATIONS_OPEN_DAY_CACHE_TTL = env.int(
+    "WHATSAPP_CONVERSATIONS_OPEN_DAY_CACHE_TTL", default=10 * 60
+)
+
 if APPTYPE_WHATSAPP_PATH in APPTYPES_CLASSES:
     WHATSAPP_TIME_BETWEEN_SYNC_WABA_IN_HOURS = (
         env.int("WHATSAPP_TIME_BETWEEN_SYNC_WABA_IN_HOURS", default=10) * 60 * 60
@@ -332,6 +375,10 @@ if APPTYPE_WHATSAPP_PATH in APPTYPES_CLASSES:
         * 60
         * 60
     )
+    # Graph API batch requests sent at the same time by the WABA and phone number syncs
+    WHATSAPP_SYNC_BATCH_CONCURRENCY = env.int(
+        "WHATSAPP_SYNC_BATCH_CONCURRENCY", default=4
+    )
 
 
 if APPTYPE_WHATSAPP_CLOUD_PATH in APPTYPES_CLASSES:
@@ -391,8 +438,8 @@ CELERY_BEAT_SCHEDULE = {
     },
     "refresh-whatsapp-templates-from-facebook": {
         "task": "refresh_whatsapp_templates_from_facebook",
-        "schedule": crontab(
-            minute=0, hour=env.int("REFRESH_WHATSAPP_TEMPLATES_HOUR", default=7)
+        "schedule": timedelta(
+            minutes=env.int("REFRESH_WHATSAPP_TEMPLATES_INTERVAL_MINUTES", default=30)
         ),
     },
     "check-apps-uncreated-on-flow": {
@@ -405,6 +452,12 @@ CELERY_BEAT_SCHEDULE = {
             minute=0, hour=env.int("SYNC_FACEBOOK_CATALOGS_HOUR", default=8)
         ),
     },
+    "sync-connected-catalogs": {
+        "task": "sync_connected_catalogs",
+        "schedule": timedelta(
+            minutes=env.int("SYNC_CONNECTED_CATALOGS_INTERVAL_MINUTES", default=60)
+        ),
+    },
     "task-cleanup-vtex-logs-and-uploads": {
         "task": "task_cleanup_vtex_logs_and_uploads",
         "schedule": crontab(minute=0, hour=0),
@@ -438,6 +491,12 @@ USE_CONNECT_V2 = env.bool("USE_CONNECT_V2", default=True)
 
 IMPORTANCE_CHANNELS_ORDER = env.list("IMPORTANCE_CHANNELS_ORDER", default=[])
 
+# Seconds the channel types listed by Flows and the icons of the generic
+# channels are cached, they are invalidated when an app type asset changes
+GENERIC_CHANNEL_TYPES_CACHE_TTL = env.int(
+    "GENERIC_CHANNEL_TYPES_CACHE_TTL", default=60 * 60
+)
+
 
 # Event Driven Architecture configurations
 
@@ -453,17 +512,86 @@ if USE_EDA:
     EDA_BROKER_USER = env("EDA_BROKER_USER", default="guest")
     EDA_BROKER_PASSWORD = env("EDA_BROKER_PASSWORD", default="guest")
 
+    # Unacked messages delivered to each queue and threads processing them,
+    # messages of the same project (and user, for permissions) are always
+    # processed by the same thread, in order. Acks are sent in batches of
+    # EDA_ACK_BATCH_SIZE, once no message is in progress or every
+    # EDA_ACK_INTERVAL seconds
+    EDA_PREFETCH_COUNT = env.int("EDA_PREFETCH_COUNT", default=8)
+    EDA_CONSUMER_WORKERS = env.int("EDA_CONSUMER_WORKERS", default=4)
+    EDA_ACK_BATCH_SIZE = env.int("EDA_ACK_BATCH_SIZE", default=4)
+    EDA_ACK_INTERVAL = env.float("EDA_ACK_INTERVAL", default=1.0)
+
+    # Permission events are applied together when EDA_PERMISSION_BATCH_SIZE of
+    # them are received or after EDA_PERMISSION_BATCH_WINDOW seconds, their
+    # queue is consumed with a prefetch of at least EDA_PERMISSION_BATCH_SIZE
+    EDA_PERMISSION_BATCH_WINDOW = env.float(
+        "EDA_PERMISSION_BATCH_WINDOW", default=0.5
+    )
+    EDA_PERMISSION_BATCH_SIZE = env.int("EDA_PERMISSION_BATCH_SIZE", default=100)
+
 
 ALLOW_CRM_ACCESS = env.bool("ALLOW_CRM_ACCESS", default=False)
 
 if ALLOW_CRM_ACCESS:
     CRM_EMAILS_LIST = env.list("CRM_EMAILS_LIST")
 
+# Seconds the role of a user in a project is cached for the permission
+# checks, it is invalidated when the authorization changes
+PROJECT_AUTHORIZATION_CACHE_TTL = env.int(
+    "PROJECT_AUTHORIZATION_CACHE_TTL", default=60 * 60
+)
+
 
 # Define how many requests can be made in a period
 VTEX_PERIOD = env.int("VTEX_PERIOD", default=60)
 VTEX_CALLS_PER_PERIOD = env.int("VTEX_CALLS_PER_PERIOD", default=50000)
 
+# Time in seconds that VTEX lookups are shared between workers through the cache
+# (0 disables sharing, keeping the lookups memoized only within a processing run)
+VTEX_SPECIFICATION_CACHE_TTL = env.int("VTEX_SPECIFICATION_CACHE_TTL", default=600)
+VTEX_SIMULATION_CACHE_TTL = env.int("VTEX_SIMULATION_CACHE_TTL", default=0)
+
+# Maximum age of the last full product payload sent to Meta by the batch uploader,
+# after which the full payload is sent again instead of only the changed fields
+META_FULL_PAYLOAD_MAX_AGE = (
+    env.int("META_FULL_PAYLOAD_MAX_AGE_IN_HOURS", default=24) * 60 * 60
+)
+
+# WhatsApp template refresh: the queue of the app refresh tasks, whose worker
+# concurrency bounds how many apps are refreshed at the same time, and how
+# long, in seconds, a single app refresh may run before being interrupted
+WHATSAPP_TEMPLATES_REFRESH_QUEUE = env.str(
+    "WHATSAPP_TEMPLATES_REFRESH_QUEUE", default="whatsapp-templates-refresh"
+)
+WHATSAPP_TEMPLATES_REFRESH_TIMEOUT = env.int(
+    "WHATSAPP_TEMPLATES_REFRESH_TIMEOUT", default=600
+)
+
+# Hours after which the templates of an app are refreshed again when Meta is
+# not sending webhooks for its WABA, and hours after which every app is
+# refreshed anyway (safety crawl). Template change webhooks refresh the app on
+# the next run of refresh_whatsapp_templates_from_facebook.
+WHATSAPP_TEMPLATES_STALE_AFTER = (
+    env.int("WHATSAPP_TEMPLATES_STALE_AFTER_IN_HOURS", default=24) * 60 * 60
+)
+WHATSAPP_TEMPLATES_SAFETY_CRAWL_INTERVAL = (
+    env.int("WHATSAPP_TEMPLATES_SAFETY_CRAWL_INTERVAL_IN_HOURS", default=168) * 60 * 60
+)
+# Seconds an app dispatched for refresh is not dispatched again while its
+# refresh task waits in the queue
+WHATSAPP_TEMPLATES_REFRESH_SCHEDULED_TTL = env.int(
+    "WHATSAPP_TEMPLATES_REFRESH_SCHEDULED_TTL", default=6 * 60 * 60
+)
+
+# Seconds the ids of the apps linked to a WABA are cached to route Meta
+# webhooks, in the shared cache (invalidated on app save) and in process
+APPS_BY_WABA_CACHE_TTL = env.int("APPS_BY_WABA_CACHE_TTL", default=60 * 60)
+APPS_BY_WABA_LOCAL_CACHE_TTL = env.int("APPS_BY_WABA_LOCAL_CACHE_TTL", default=5)
+
+# Seconds Meta template webhooks of a WABA are buffered to be processed together
+TEMPLATE_WEBHOOKS_BUFFER_WINDOW = env.int("TEMPLATE_WEBHOOKS_BUFFER_WINDOW", default=5)
+
 # Rapidpro
 RAPIDPRO_URL = env.str("RAPIDPRO_URL", "")
 RAPIDPRO_API_TOKEN = env.str("RAPIDPRO_API_TOKEN", "")
@@ -1,9 +1,15 @@
+import logging
+
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
 from rest_framework.permissions import AllowAny
 
 from marketplace.celery import app as celery_app
+from marketplace.wpp_templates.webhook_buffer import TemplateWebhookBuffer
+
+
+logger = logging.getLogger(__name__)
 
 
 class FacebookWebhook(APIView):  # pragma: no cover
@@ -14,8 +20,27 @@ class FacebookWebhook(APIView):  # pragma: no cover
         super().__init__(*args, **kwargs)
 
     def post(self, request):
-        celery_app.send_task(
-            name="update_templates_by_webhook",
-            kwargs={"webhook_data": request.data},
-        )
+        try:
+            buffer = TemplateWebhookBuffer()
+            waba_ids = buffer.add(request.data)
+        except Exception as e:
+            logger.error(f"Error buffering template webhook, processing it now: {e}")
+            celery_app.send_task(
+                name="update_templates_by_webhook",
+                kwargs={"webhook_data": request.data},
+            )
+            return Response(status=status.HTTP_200_OK)
+
+        for waba_id in waba_ids:
+            try:
+                celery_app.send_task(
+                    name="process_buffered_template_webhooks",
+                    kwargs={"waba_id": waba_id},
+                    countdown=buffer.window,
+                )
+            except Exception as e:
+                # The events stay buffered, the next webhook of the WABA
+                # schedules their batch
+                logger.error(f"Error scheduling template webhooks of {waba_id}: {e}")
+                buffer.unschedule(waba_id)
         return Response(status=status.HTTP_200_OK)
@@ -0,0 +1,50 @@
+from typing import Optional
+
+from marketplace.applications.models import App
+
+
+# Key of the WhatsApp Cloud app config where the id of the catalog connected
+# to its WABA on Meta is stored, so catalog pages don't query Meta
+CONNECTED_CATALOG_CONFIG_KEY = "connected_catalog_id"
+
+
+def get_connected_catalog_id(app: App, service) -> Optional[str]:
+    """
+    Returns the stored id of the catalog connected to the app, it is only
+    fetched through the service when it was never stored.
+    """
+    if CONNECTED_CATALOG_CONFIG_KEY not in app.config:
+        return refresh_connected_catalog_id(app, service)
+
+    return app.config[CONNECTED_CATALOG_CONFIG_KEY]
+
+
+def refresh_connected_catalog_id(app: App, service) -> Optional[str]:
+    # The service returns an empty list when no catalog is connected
+    catalog_id = service.get_connected_catalog(app) or None
+    set_connected_catalog_id(app, catalog_id)
+    return catalog_id
+
+
+def set_connected_catalog_id(app: App, catalog_id: Optional[str]):
+    if (
+        CONNECTED_CATALOG_CONFIG_KEY in app.config
+        and app.config[CONNECTED_CATALOG_CONFIG_KEY] == catalog_id
+    ):
+        return
+
+    app.config[CONNECTED_CATALOG_CONFIG_KEY] = catalog_id
+    app.save(update_fields=["config", "modified_on"])
+
+
+def unset_connected_catalog_id(app: App, catalog_id: str):
+    """Stores that no catalog is connected if `catalog_id` was the connected one."""
+    if app.config.get(CONNECTED_CATALOG_CONFIG_KEY) == catalog_id:
+        set_connected_catalog_id(app, None)
+
+
+def forget_connected_catalog_id(app: App):
+    """Makes the connected catalog be fetched again on its next use."""
+    if CONNECTED_CATALOG_CONFIG_KEY in app.config:
+        del app.config[CONNECTED_CATALOG_CONFIG_KEY]
+        app.save(update_fields=["config", "modified_on"])
@@ -13,6 +13,7 @@ from django.core.cache import cache
 from django.utils import timezone
 
 from marketplace.clients.facebook.client import FacebookClient
+from marketplace.services.facebook.service import FacebookService
 
 from marketplace.wpp_products.models import (
     Catalog,
@@ -23,6 +24,7 @@ from marketplace.wpp_products.models import (
 )
 from marketplace.clients.flows.client import FlowsClient
 from marketplace.celery import app as celery_app
+from marketplace.core.claim_check import check_kwargs, resolve_claim_checks
 from marketplace.services.vtex.generic_service import (
     ProductUpdateService,
     ProductInsertionService,
@@ -32,6 +34,7 @@ from marketplace.services.vtex.generic_service import (
 from marketplace.services.vtex.generic_service import APICredentials
 from marketplace.applications.models import App
 
+from marketplace.wpp_products.connected_catalog import refresh_connected_catalog_id
 from marketplace.wpp_products.utils import (
     ProductBatchUploader,
     ProductUploader,
@@ -57,6 +60,20 @@ def sync_facebook_catalogs():
         service.sync_catalogs()
 
 
+@celery_app.task(name="sync_connected_catalogs")
+def sync_connected_catalogs():
+    """Reconciles the stored connected catalog of the apps with catalogs with Meta."""
+    apps = App.objects.filter(code="wpp-cloud", catalogs__isnull=False).distinct()
+    for app in apps:
+        try:
+            service = FacebookService(
+                FacebookClient(app.apptype.get_system_access_token(app))
+            )
+            refresh_connected_catalog_id(app, service)
+        except Exception as e:
+            logger.error(f"Error syncing the connected catalog of App {app.uuid}: {e}")
+
+
 def get_projects_with_vtex_app() -> list:
     apps = App.objects.filter(code="vtex")
     related_wpp_cloud_project_uuids = []
@@ -158,6 +175,7 @@ class FacebookCatalogSyncService:
 
 
 @celery_app.task(name="task_insert_vtex_products")
+@resolve_claim_checks
 def task_insert_vtex_products(**kwargs):
     print("Starting task: 'task_insert_vtex_products'")
     vtex_service = ProductInsertionService()
@@ -425,6 +443,7 @@ def _extract_sellers_ids(webhook: dict):
 
 
 @celery_app.task(name="task_insert_vtex_products_by_sellers")
+@resolve_claim_checks
 def task_insert_vtex_products_by_sellers(**kwargs):
     print("Starting insertion products by seller")
     vtex_service = ProductInsertionBySellerService()
@@ -632,9 +651,10 @@ def task_dequeue_webhooks(app_uuid: str, celery_queue: str, batch_size: int = 50
                 print(f"No items to process for App: {app_uuid}. Stopping dequeue.")
                 break
 
+            # Batches of up to 5000 skus are passed by reference
             celery_app.send_task(
                 "task_update_webhook_batch_products",
-                kwargs={"app_uuid": app_uuid, "batch": batch},
+                kwargs=check_kwargs({"app_uuid": app_uuid, "batch": batch}, "batch"),
                 queue=celery_queue,
                 ignore_result=True,
             )
@@ -653,6 +673,7 @@ def task_dequeue_webhooks(app_uuid: str, celery_queue: str, batch_size: int = 50
 
 
 @celery_app.task(name="task_update_webhook_batch_products")
+@resolve_claim_checks
 def task_update_webhook_batch_products(app_uuid: str, batch: list):
     """
     Processes product updates in batches for a VTEX app.
@@ -0,0 +1,65 @@
+import uuid
+
+from unittest.mock import MagicMock, patch
+
+from django.test import TestCase
+from django.contrib.auth import get_user_model
+
+from marketplace.applications.models import App
+from marketplace.wpp_products.connected_catalog import (
+    forget_connected_catalog_id,
+    get_connected_catalog_id,
+)
+from marketplace.wpp_products.models import Catalog
+from marketplace.wpp_products.tasks import sync_connected_catalogs
+
+
+User = get_user_model()
+
+
+class ConnectedCatalogTestCase(TestCase):
+    def setUp(self):
+        self.app = App.objects.create(
+            code="wpp-cloud",
+            created_by=User.objects.get_admin_user(),
+            project_uuid=str(uuid.uuid4()),
+            platform=App.PLATFORM_WENI_FLOWS,
+        )
+        self.service = MagicMock()
+        self.service.get_connected_catalog.return_value = "0123456789"
+
+    def test_connected_catalog_is_fetched_once(self):
+        self.assertEqual(get_connected_catalog_id(self.app, self.service), "0123456789")
+        self.assertEqual(get_connected_catalog_id(self.app, self.service), "0123456789")
+
+        self.service.get_connected_catalog.assert_called_once()
+
+    def test_no_connected_catalog_is_stored(self):
+        self.service.get_connected_catalog.return_value = []
+
+        self.assertIsNone(get_connected_catalog_id(self.app, self.service))
+        self.assertIsNone(get_connected_catalog_id(self.app, self.service))
+
+        self.service.get_connected_catalog.assert_called_once()
+
+    def test_forgotten_connected_catalog_is_fetched_again(self):
+        get_connected_catalog_id(self.app, self.service)
+        forget_connected_catalog_id(self.app)
+        self.service.get_connected_catalog.return_value = "9876543210"
+
+        self.assertEqual(get_connected_catalog_id(self.app, self.service), "9876543210")
+
+    @patch("marketplace.wpp_products.tasks.FacebookService")
+    @patch("marketplace.wpp_products.tasks.FacebookClient")
+    def test_sync_connected_catalogs(self, _client_mock, service_mock):
+        Catalog.objects.create(
+            app=self.app, facebook_catalog_id="0123456789", name="catalog"
+        )
+        self.app.config["connected_catalog_id"] = None
+        self.app.save()
+        service_mock.return_value = self.service
+
+        sync_connected_catalogs()
+
+        self.app.refresh_from_db()
+        self.assertEqual(self.app.config["connected_catalog_id"], "0123456789")
@@ -1,11 +1,19 @@
+import json
+import time
 import uuid
 
+from unittest.mock import patch, MagicMock
+
 from django.test import TestCase
 from django.utils import timezone
 from django.contrib.auth import get_user_model
 
 from marketplace.wpp_products.models import UploadProduct, Catalog, ProductFeed
-from marketplace.wpp_products.utils import ProductBatchFetcher
+from marketplace.wpp_products.utils import (
+    ProductBatchFetcher,
+    ProductBatchUploader,
+    ProductSyncMetaPolices,
+)
 from marketplace.applications.models import App
 
 
@@ -90,3 +98,162 @@ class ProductBatchFetcherTestCase(TestCase):
         # Attempt to fetch products and expect StopIteration
         with self.assertRaises(StopIteration):
             next(batch_fetcher)
+
+
+class FakeRedisHashes:
+    def __init__(self):
+        self.hashes = {}
+
+    def hmget(self, key, fields):
+        values = self.hashes.get(key, {})
+        return [values.get(field) for field in fields]
+
+    def hset(self, key, mapping):
+        self.hashes.setdefault(key, {}).update(mapping)
+
+    def hdel(self, key, *fields):
+        for field in fields:
+            self.hashes.get(key, {}).pop(field, None)
+
+    def expire(self, key, seconds):
+        pass
+
+
+class ProductBatchUploaderTestCase(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_superuser(email="user@marketplace.ai")
+        self.app = App.objects.create(
+            code="wpp-cloud",
+            created_by=self.user,
+            project_uuid=str(uuid.uuid4()),
+            platform=App.PLATFORM_WENI_FLOWS,
+        )
+        self.catalog = Catalog.objects.create(
+            name="Test Catalog", facebook_catalog_id="123", app=self.app
+        )
+        self.data = {
+            "id": "1#1",
+            "title": "Product 1",
+            "description": "Description",
+            "availability": "in stock",
+            "price": "10.00 BRL",
+            "link": "https://store.com/product",
+        }
+        self.product = UploadProduct.objects.create(
+            facebook_product_id="1#1",
+            catalog=self.catalog,
+            data=self.data,
+            status="pending",
+        )
+
+        redis_patcher = patch("marketplace.wpp_products.utils.get_redis_connection")
+        self.redis_mock = MagicMock()
+        redis_patcher.start().return_value = self.redis_mock
+        self.addCleanup(redis_patcher.stop)
+
+        fb_service_patcher = patch.object(
+            ProductBatchUploader, "initialize_fb_service", return_value=MagicMock()
+        )
+        fb_service_patcher.start()
+        self.addCleanup(fb_service_patcher.stop)
+
+        self.uploader = ProductBatchUploader(
+            catalog=self.catalog, full_payload_max_age=3600
+        )
+
+    def _set_history(self, data, full_sent_at):
+        self.redis_mock.hmget.return_value = [
+            json.dumps({"data": data, "full_sent_at": full_sent_at})
+        ]
+
+    def test_sends_full_payload_without_history(self):
+        self.redis_mock.hmget.return_value = [None]
+
+        payload, sent_payloads = self.uploader.create_batch_payload(
+            UploadProduct.objects.all()
+        )
+
+        self.assertEqual(payload["requests"], [{"method": "UPDATE", "data": self.data}])
+        self.assertEqual(sent_payloads["1#1"]["data"], self.data)
+
+    def test_sends_only_changed_fields(self):
+        full_sent_at = time.time() - 60
+        previous = dict(self.data, price="12.00 BRL", availability="out of stock")
+        self._set_history(previous, full_sent_at)
+
+        payload, sent_payloads = self.uploader.create_batch_payload(
+            UploadProduct.objects.all()
+        )
+
+        self.assertEqual(
+            payload["requests"],
+            [
+                {
+                    "method": "UPDATE",
+                    "data": {
+                        "id": "1#1",
+                        "availability": "in stock",
+                        "price": "10.00 BRL",
+                    },
+                }
+            ],
+        )
+        self.assertEqual(sent_payloads["1#1"]["full_sent_at"], full_sent_at)
+
+    def test_skips_unchanged_products(self):
+        self._set_history(self.data, time.time() - 60)
+
+        payload, sent_payloads = self.uploader.create_batch_payload(
+            UploadProduct.objects.all()
+        )
+
+        self.assertEqual(payload["requests"], [])
+        self.assertIn("1#1", sent_payloads)
+
+    def test_sends_full_payload_after_max_age(self):
+        self._set_history(dict(self.data, price="12.00 BRL"), time.time() - 7200)
+
+        payload, _ = self.uploader.create_batch_payload(UploadProduct.objects.all())
+
+        self.assertEqual(payload["requests"], [{"method": "UPDATE", "data": self.data}])
+
+    def test_sends_full_payload_when_fields_were_removed(self):
+        previous = dict(self.data, sale_price="9.00 BRL")
+        self._set_history(previous, time.time() - 60)
+
+        payload, _ = self.uploader.create_batch_payload(UploadProduct.objects.all())
+
+        self.assertEqual(payload["requests"], [{"method": "UPDATE", "data": self.data}])
+
+    def test_process_and_upload_saves_history_without_calling_meta(self):
+        self._set_history(self.data, time.time() - 60)
+        self.uploader.send_to_meta = MagicMock()
+
+        self.uploader.process_and_upload(MagicMock(), "lock", 60)
+
+        self.uploader.send_to_meta.assert_not_called()
+        self.redis_mock.hset.assert_called_once()
+        self.product.refresh_from_db()
+        self.assertEqual(self.product.status, "success")
+
+    @patch("marketplace.wpp_products.utils.FacebookClient")
+    def test_products_deleted_on_meta_are_uploaded_in_full(self, mock_client):
+        redis = FakeRedisHashes()
+        self.uploader.payload_history.redis = redis
+        self.uploader.send_to_meta = MagicMock(return_value=True)
+        self.uploader.process_and_upload(MagicMock(), "lock", 60)
+
+        with patch(
+            "marketplace.wpp_products.utils.get_redis_connection", return_value=redis
+        ):
+            ProductSyncMetaPolices(self.catalog)._sync_local_products(
+                [{"id": "10", "retailer_id": "1#1", "review_rejection_reasons": []}]
+            )
+        mock_client.return_value.delete_products_in_batch.assert_called_once_with(
+            catalog_id="123",
+            products_to_delete=[{"method": "DELETE", "retailer_id": "1#1"}],
+        )
+
+        payload, _ = self.uploader.create_batch_payload(UploadProduct.objects.all())
+
+        self.assertEqual(payload["requests"], [{"method": "UPDATE", "data": self.data}])
@@ -3,10 +3,11 @@ import logging
 import json
 import time
 
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Tuple
 
 from datetime import datetime, timezone
 
+from django.conf import settings
 from django.db.models import QuerySet
 
 from django_redis import get_redis_connection
@@ -391,6 +392,10 @@ class ProductSyncMetaPolices:
     def _delete_products_in_batch(
         self, products_to_delete: List[Dict[str, Any]]
     ) -> None:
+        # Deleted products must be sent in full if they are uploaded again
+        MetaPayloadHistory(self.catalog).delete_many(
+            [product["retailer_id"] for product in products_to_delete]
+        )
         self.client.delete_products_in_batch(
             catalog_id=self.catalog.facebook_catalog_id,
             products_to_delete=products_to_delete,
@@ -460,11 +465,19 @@ class ProductBatchUploader:
     fb_service_class = FacebookService
     fb_client_class = FacebookClient
 
-    def __init__(self, catalog: Catalog, batch_size=5000):
+    def __init__(self, catalog: Catalog, batch_size=5000, full_payload_max_age=None):
         self.catalog = catalog
         self.batch_size = batch_size
         self.fb_service = self.initialize_fb_service()
         self.product_manager = ProductBatchFetcher(catalog, batch_size)
+        self.full_payload_max_age = (
+            full_payload_max_age
+            if full_payload_max_age is not None
+            else settings.META_FULL_PAYLOAD_MAX_AGE
+        )
+        self.payload_history = MetaPayloadHistory(
+            catalog, expiration_time=self.full_payload_max_age * 2
+        )
 
     def initialize_fb_service(self) -> FacebookService:
         app = self.catalog.app
@@ -481,9 +494,10 @@ class ProductBatchUploader:
         try:
             for products, product_ids in self.product_manager:
                 # Creates the payload in the format required by the Meta
-                payload = self.create_batch_payload(products)
+                payload, sent_payloads = self.create_batch_payload(products)
                 # Sends data to Meta and processes the results
-                if self.send_to_meta(payload):
+                if not payload["requests"] or self.send_to_meta(payload):
+                    self.payload_history.save_many(sent_payloads)
                     self.product_manager.mark_products_as_sent(product_ids)
                     self.log_sent_products(product_ids)
                 else:
@@ -499,21 +513,70 @@ class ProductBatchUploader:
             )
             self.product_manager.mark_products_as_error(product_ids)
 
-    def create_batch_payload(self, products: QuerySet) -> dict:
+    def create_batch_payload(self, products: QuerySet) -> Tuple[dict, dict]:
         """
         Creates a payload for the Meta Batch API from a list of products.
+
+        Each product is compared with the last payload uploaded for it, and only
+        the changed fields are sent. Products without history, or whose last full
+        payload is older than `full_payload_max_age`, are sent in full. Unchanged
+        products are left out of the request.
+
+        Returns the payload and the history entries to be saved once it is sent.
         """
-        batch_requests = [
-            {
-                "method": "UPDATE",
-                "data": product.data,
+        products = list(products)
+        previous_payloads = self.payload_history.get_many(
+            [product.facebook_product_id for product in products]
+        )
+        now = time.time()
+
+        batch_requests = []
+        sent_payloads = {}
+        for product in products:
+            data = product.data
+            previous = previous_payloads.get(product.facebook_product_id)
+            item_data, full_sent_at = self._build_item_data(data, previous, now)
+
+            if item_data:
+                batch_requests.append({"method": "UPDATE", "data": item_data})
+
+            sent_payloads[product.facebook_product_id] = {
+                "data": data,
+                "full_sent_at": full_sent_at,
             }
-            for product in products
-        ]
-        return {
+
+        payload = {
             "item_type": "PRODUCT_ITEM",
             "requests": batch_requests,
         }
+        return payload, sent_payloads
+
+    def _build_item_data(
+        self, data: dict, previous: Optional[dict], now: float
+    ) -> Tuple[dict, float]:
+        """
+        Returns the item data to be sent and the time of its last full upload.
+        An empty dict means nothing changed since the last upload.
+        """
+        if not previous or not isinstance(data, dict):
+            return data, now
+
+        full_sent_at = previous.get("full_sent_at") or 0
+        previous_data = previous.get("data") or {}
+
+        # Fields removed from the payload can only be reconciled with a full upload
+        is_expired = now - full_sent_at >= self.full_payload_max_age
+        if is_expired or set(previous_data) - set(data):
+            return data, now
+
+        changed_fields = {
+            key: value for key, value in data.items() if previous_data.get(key) != value
+        }
+        if not changed_fields:
+            return {}, full_sent_at
+
+        changed_fields["id"] = data.get("id")
+        return changed_fields, full_sent_at
 
     def send_to_meta(self, products: List) -> bool:
         """
@@ -550,6 +613,66 @@ class ProductBatchUploader:
         print(f"Logged {len(product_ids)} products as sent.")
 
 
+class MetaPayloadHistory:
+    """
+    Keeps the last payload uploaded to Meta for each product of a catalog,
+    stored in a Redis hash keyed by facebook_product_id.
+    """
+
+    def __init__(self, catalog: Catalog, expiration_time: int = 86_400 * 2):
+        self.key = f"meta_payload_history:{catalog.uuid}"
+        self.expiration_time = expiration_time
+        self.redis = get_redis_connection()
+
+    def get_many(self, product_ids: List[str]) -> Dict[str, dict]:
+        """Returns the stored entries for the given products, skipping missing ones."""
+        if not product_ids:
+            return {}
+
+        try:
+            values = self.redis.hmget(self.key, product_ids)
+        except exceptions.RedisError as e:
+            logger.error(f"Error reading payload history {self.key}: {e}")
+            return {}
+
+        history = {}
+        for product_id, value in zip(product_ids, values):
+            if not value:
+                continue
+            try:
+                history[product_id] = json.loads(value)
+            except (TypeError, ValueError):
+                continue
+        return history
+
+    def save_many(self, entries: Dict[str, dict]):
+        """Stores the entries, each with the sent data and its last full upload time."""
+        if not entries:
+            return
+
+        mapping = {
+            product_id: json.dumps(entry) for product_id, entry in entries.items()
+        }
+        try:
+            self.redis.hset(self.key, mapping=mapping)
+            self.redis.expire(self.key, self.expiration_time)
+        except exceptions.RedisError as e:
+            logger.error(f"Error saving payload history {self.key}: {e}")
+
+    def delete_many(self, product_ids: List[str]):
+        """Removes the entries of products deleted from the catalog."""
+        if not product_ids:
+            return
+
+        try:
+            self.redis.hdel(self.key, *product_ids)
+        except exceptions.RedisError as e:
+            logger.error(f"Error deleting payload history {self.key}: {e}")
+
+    def clear(self):
+        self.redis.delete(self.key)
+
+
 class RedisQueue:
     def __init__(self, queue_key):
         self.queue_key = queue_key
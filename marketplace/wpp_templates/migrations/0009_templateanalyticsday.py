@@ -0,0 +1,50 @@
+# Generated by Django 3.2.4 on 2026-10-19 16:24
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("applications", "0017_alter_app_platform"),
+        ("wpp_templates", "0008_templatebutton_example"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="TemplateAnalyticsDay",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("template_id", models.CharField(max_length=20)),
+                ("day", models.DateField()),
+                ("sent", models.IntegerField(default=0)),
+                ("delivered", models.IntegerField(default=0)),
+                ("read", models.IntegerField(default=0)),
+                ("has_data_point", models.BooleanField(default=True)),
+                ("modified_on", models.DateTimeField(auto_now=True)),
+                (
+                    "app",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="template_analytics",
+                        to="applications.app",
+                    ),
+                ),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name="templateanalyticsday",
+            constraint=models.UniqueConstraint(
+                fields=("app", "template_id", "day"),
+                name="unique_template_analytics_day_per_app",
+            ),
+        ),
+    ]
@@ -150,3 +150,27 @@ class TemplateHeader(models.Model):
 
     def to_dict(self):
         return dict(header_type=self.header_type, text=self.text)
+
+
+class TemplateAnalyticsDay(models.Model):
+    """Daily analytics of a template, as returned by the Graph API."""
+
+    app = models.ForeignKey(
+        App, on_delete=models.CASCADE, related_name="template_analytics"
+    )
+    template_id = models.CharField(max_length=20)
+    day = models.DateField()
+    sent = models.IntegerField(default=0)
+    delivered = models.IntegerField(default=0)
+    read = models.IntegerField(default=0)
+    # False when the Graph API returned no data point for the day
+    has_data_point = models.BooleanField(default=True)
+    modified_on = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["app", "template_id", "day"],
+                name="unique_template_analytics_day_per_app",
+            )
+        ]
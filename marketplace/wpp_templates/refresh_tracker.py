@@ -0,0 +1,157 @@
+import logging
+
+from datetime import datetime, timedelta
+from typing import List, Optional
+
+from django.conf import settings
+from django.utils import timezone
+from django_redis import get_redis_connection
+
+
+logger = logging.getLogger(__name__)
+
+
+# Webhook fields that mean the templates stored for the WABA are out of date
+TEMPLATE_CHANGE_EVENTS = (
+    "message_template_components_update",
+    "template_category_update",
+)
+
+
+def get_app_waba_id(app) -> Optional[str]:
+    waba = app.config.get("waba")
+    if waba:
+        return waba.get("id")
+    return app.config.get("wa_waba_id")
+
+
+class TemplateRefreshTracker:
+    """
+    Tracks in Redis what is needed to decide when the templates of an app must
+    be fetched again from Meta: when each app was last refreshed, when the last
+    webhook was received for each WABA and when the last template change event
+    was received for each WABA. Apps whose refresh is already queued are
+    marked as scheduled, so they aren't dispatched again until it runs.
+    """
+
+    LAST_REFRESH_KEY = "refresh-whatsapp-templates-last-success"
+    LAST_WEBHOOK_KEY = "refresh-whatsapp-templates-last-webhook"
+    LAST_CHANGE_KEY = "refresh-whatsapp-templates-last-change"
+    SCHEDULED_KEY = "refresh-whatsapp-templates-scheduled:{app_uuid}"
+
+    def __init__(self, redis=None):
+        self.redis = redis or get_redis_connection()
+        self.stale_after = timedelta(seconds=settings.WHATSAPP_TEMPLATES_STALE_AFTER)
+        self.safety_crawl_interval = timedelta(
+            seconds=settings.WHATSAPP_TEMPLATES_SAFETY_CRAWL_INTERVAL
+        )
+        self.scheduled_ttl = settings.WHATSAPP_TEMPLATES_REFRESH_SCHEDULED_TTL
+
+    def record_webhook(self, waba_id: str, template_changed: bool = False):
+        now = timezone.now().isoformat()
+        self.redis.hset(self.LAST_WEBHOOK_KEY, waba_id, now)
+        if template_changed:
+            self.redis.hset(self.LAST_CHANGE_KEY, waba_id, now)
+
+    def record_refresh(self, app_uuid: str, started_at: datetime):
+        # The start time is stored, so changes received during the refresh
+        # make the app due again
+        self.redis.hset(self.LAST_REFRESH_KEY, app_uuid, started_at.isoformat())
+
+    def get_last_refresh(self, app_uuid: str) -> Optional[datetime]:
+        return self._parse(self.redis.hget(self.LAST_REFRESH_KEY, app_uuid))
+
+    def mark_scheduled(self, app_uuids: List[str]):
+        if not app_uuids:
+            return
+
+        pipeline = self.redis.pipeline()
+        for app_uuid in app_uuids:
+            pipeline.set(
+                self.SCHEDULED_KEY.format(app_uuid=app_uuid),
+                "scheduled",
+                ex=self.scheduled_ttl,
+            )
+        pipeline.execute()
+
+    def clear_scheduled(self, app_uuid: str):
+        self.redis.delete(self.SCHEDULED_KEY.format(app_uuid=app_uuid))
+
+    def get_due_apps(self, apps: List) -> List:
+        """
+        Returns the apps whose templates must be refreshed now, leaving out
+        those whose refresh is already scheduled.
+        """
+        if not apps:
+            return []
+
+        now = timezone.now()
+        app_uuids = [str(app.uuid) for app in apps]
+        waba_ids = [get_app_waba_id(app) for app in apps]
+        scheduled = self.redis.mget(
+            [self.SCHEDULED_KEY.format(app_uuid=app_uuid) for app_uuid in app_uuids]
+        )
+        last_refreshes = self.redis.hmget(self.LAST_REFRESH_KEY, app_uuids)
+        last_webhooks = self.redis.hmget(self.LAST_WEBHOOK_KEY, waba_ids)
+        last_changes = self.redis.hmget(self.LAST_CHANGE_KEY, waba_ids)
+
+        return [
+            app
+            for app, is_scheduled, last_refresh, last_webhook, last_change in zip(
+                apps, scheduled, last_refreshes, last_webhooks, last_changes
+            )
+            if not is_scheduled
+            and self.is_due(
+                now,
+                self._parse(last_refresh),
+                self._parse(last_webhook),
+                self._parse(last_change),
+            )
+        ]
+
+    def is_app_due(self, app) -> bool:
+        """Same as `get_due_apps` for a single app, ignoring the scheduled mark."""
+        waba_id = get_app_waba_id(app)
+        return self.is_due(
+            timezone.now(),
+            self.get_last_refresh(str(app.uuid)),
+            self._parse(self.redis.hget(self.LAST_WEBHOOK_KEY, waba_id)),
+            self._parse(self.redis.hget(self.LAST_CHANGE_KEY, waba_id)),
+        )
+
+    def is_due(
+        self,
+        now: datetime,
+        last_refresh: Optional[datetime],
+        last_webhook: Optional[datetime],
+        last_change: Optional[datetime],
+    ) -> bool:
+        if last_refresh is None:
+            return True
+
+        if last_change and last_change > last_refresh:
+            return True
+
+        age = now - last_refresh
+        if age >= self.safety_crawl_interval:
+            return True
+
+        # While Meta keeps sending webhooks for the WABA, status updates are
+        # applied as they arrive and only change events or the safety crawl
+        # require a full refresh
+        receives_webhooks = (
+            last_webhook is not None and now - last_webhook < self.safety_crawl_interval
+        )
+        return not receives_webhooks and age >= self.stale_after
+
+    @staticmethod
+    def _parse(value) -> Optional[datetime]:
+        if not value:
+            return None
+        try:
+            return datetime.fromisoformat(
+                value.decode() if isinstance(value, bytes) else value
+            )
+        except ValueError:
+            logger.warning(f"Invalid template refresh timestamp: {value}")
+            return None
@@ -1,9 +1,18 @@
-from datetime import datetime
+from datetime import date, datetime, timedelta, timezone as dt_timezone
 
-from marketplace.wpp_templates.models import TemplateTranslation
+from django.utils import timezone
+
+from marketplace.wpp_templates.models import TemplateAnalyticsDay, TemplateTranslation
+
+
+ANALYTICS_METRICS = ("sent", "delivered", "read")
 
 
 class FacebookService:
+    # Meta may still update the analytics of a day after it ends, so a day is
+    # only stored as final once this delay has passed
+    closed_day_delay = timedelta(hours=48)
+
     def __init__(self, client):
         self.client = client
 
@@ -18,46 +27,6 @@ class FacebookService:
         }
         return fields
 
-    def format_analytics_data(self, analytics_data):
-        formatted_data = {}
-        grand_totals = {"sent": 0, "delivered": 0, "read": 0}
-
-        data_points = analytics_data.get("data", {}).get("data_points", [])
-
-        for point in data_points:
-            template_id = point.get("template_id")
-            start = self.timestamp_to_date(point.get("start"))
-            sent = point.get("sent")
-            delivered = point.get("delivered")
-            read = point.get("read")
-
-            grand_totals["sent"] += sent
-            grand_totals["delivered"] += delivered
-            grand_totals["read"] += read
-
-            if template_id not in formatted_data:
-                template_name = self.fba_template_id_to_template_name(template_id)
-                formatted_data[template_id] = {
-                    "template_id": template_id,
-                    "template_name": template_name,
-                    "totals": {"sent": 0, "delivered": 0, "read": 0},
-                    "dates": [],
-                }
-
-            formatted_data[template_id]["totals"]["sent"] += sent
-            formatted_data[template_id]["totals"]["delivered"] += delivered
-            formatted_data[template_id]["totals"]["read"] += read
-
-            formatted_data[template_id]["dates"].append(
-                {"start": start, "sent": sent, "delivered": delivered, "read": read}
-            )
-
-        output = {"data": list(formatted_data.values()), "grand_totals": grand_totals}
-        return output
-
-    def timestamp_to_date(self, timestamp):
-        return datetime.utcfromtimestamp(timestamp).strftime("%Y-%m-%d")
-
     def get_waba(self, app):
         wa_waba_id = app.config.get("wa_waba_id")
 
@@ -68,24 +37,171 @@ class FacebookService:
         }
 
     def template_analytics(self, app, data):
+        """
+        Returns the daily analytics of the templates. Closed days are fetched
+        from the Graph API once and then read from TemplateAnalyticsDay, open
+        days, and rows stored while their day was still open, are fetched
+        again on every call.
+        """
         start = data.get("start")
         end = data.get("end")
-        fba_template_ids = data.get("fba_template_ids")
+        fba_template_ids = [
+            str(template_id) for template_id in data.get("fba_template_ids")
+        ]
 
         waba_id = self.get_waba(app=app).get("wa_waba_id")
-        fields = self.get_fields(start, end, fba_template_ids)
-        analytics = self.client.get_template_analytics(waba_id=waba_id, fields=fields)
-        return self.format_analytics_data(analytics)
+        days = self.days_between(start, end)
+        stored = {
+            (row.template_id, row.day): row
+            for row in TemplateAnalyticsDay.objects.filter(
+                app=app,
+                template_id__in=fba_template_ids,
+                day__range=(days[0], days[-1]),
+            )
+        }
 
-    def fba_template_id_to_template_name(self, fba_template_id):
-        translation = TemplateTranslation.objects.filter(
-            message_template_id=fba_template_id
-        ).last()
+        missing = [
+            (template_id, day)
+            for template_id in fba_template_ids
+            for day in days
+            if (template_id, day) not in stored
+            or not self.is_final(stored[(template_id, day)])
+        ]
+        if missing:
+            stored.update(self.fetch_analytics_days(app, waba_id, missing, stored))
+
+        rows = [
+            stored[(template_id, day)]
+            for template_id in fba_template_ids
+            for day in days
+            if (template_id, day) in stored
+            and stored[(template_id, day)].has_data_point
+        ]
+        return self.format_analytics_rows(rows)
+
+    def fetch_analytics_days(self, app, waba_id, missing, stored):
+        """Fetches the missing days from the Graph API and stores them."""
+        template_ids = list(dict.fromkeys(template_id for template_id, _ in missing))
+        first_day = min(day for _, day in missing)
+        last_day = max(day for _, day in missing)
+
+        fields = self.get_fields(
+            self.day_to_timestamp(first_day),
+            self.day_to_timestamp(last_day + timedelta(days=1)) - 1,
+            template_ids,
+        )
+        analytics = self.client.get_template_analytics(waba_id=waba_id, fields=fields)
 
-        if translation:
-            return translation.template.name
+        rows = {}
+        for point in analytics.get("data", {}).get("data_points", []):
+            key = (
+                str(point.get("template_id")),
+                self.timestamp_to_day(point.get("start")),
+            )
+            row = (
+                rows.get(key)
+                or stored.get(key)
+                or TemplateAnalyticsDay(app=app, template_id=key[0], day=key[1])
+            )
+            for metric in ANALYTICS_METRICS:
+                setattr(row, metric, point.get(metric) or 0)
+            row.has_data_point = True
+            rows[key] = row
+
+        # Closed days without data points are stored too, so they are not
+        # requested again
+        last_closed_day = self.last_closed_day()
+        for key in missing:
+            if key in rows or key[1] > last_closed_day:
+                continue
+
+            row = stored.get(key) or TemplateAnalyticsDay(
+                app=app, template_id=key[0], day=key[1]
+            )
+            for metric in ANALYTICS_METRICS:
+                setattr(row, metric, 0)
+            row.has_data_point = False
+            rows[key] = row
+
+        self.save_analytics_rows(list(rows.values()))
+        return rows
+
+    def save_analytics_rows(self, rows):
+        new_rows = [row for row in rows if row.pk is None]
+        changed_rows = [row for row in rows if row.pk is not None]
+        for row in changed_rows:
+            row.modified_on = timezone.now()
+
+        # Conflicts happen when another request stored the same day first
+        TemplateAnalyticsDay.objects.bulk_create(new_rows, ignore_conflicts=True)
+        TemplateAnalyticsDay.objects.bulk_update(
+            changed_rows, [*ANALYTICS_METRICS, "has_data_point", "modified_on"]
+        )
+
+    def format_analytics_rows(self, rows):
+        template_names = self.fba_template_ids_to_template_names(
+            {row.template_id for row in rows}
+        )
+        formatted_data = {}
+        grand_totals = {metric: 0 for metric in ANALYTICS_METRICS}
+
+        for row in rows:
+            if row.template_id not in formatted_data:
+                formatted_data[row.template_id] = {
+                    "template_id": row.template_id,
+                    "template_name": template_names.get(row.template_id),
+                    "totals": {metric: 0 for metric in ANALYTICS_METRICS},
+                    "dates": [],
+                }
 
-        return None
+            template_data = formatted_data[row.template_id]
+            point = {"start": row.day.strftime("%Y-%m-%d")}
+            for metric in ANALYTICS_METRICS:
+                value = getattr(row, metric)
+                point[metric] = value
+                template_data["totals"][metric] += value
+                grand_totals[metric] += value
+            template_data["dates"].append(point)
+
+        return {"data": list(formatted_data.values()), "grand_totals": grand_totals}
+
+    def last_closed_day(self) -> date:
+        return (timezone.now() - self.closed_day_delay).date() - timedelta(days=1)
+
+    def is_final(self, row: TemplateAnalyticsDay) -> bool:
+        """A row is final when it was written after its day closed."""
+        closed_at = datetime(
+            row.day.year, row.day.month, row.day.day, tzinfo=dt_timezone.utc
+        ) + (timedelta(days=1) + self.closed_day_delay)
+        return row.modified_on >= closed_at
+
+    @staticmethod
+    def days_between(start: int, end: int):
+        first_day = FacebookService.timestamp_to_day(start)
+        last_day = FacebookService.timestamp_to_day(end)
+        return [
+            first_day + timedelta(days=offset)
+            for offset in range((last_day - first_day).days + 1)
+        ]
+
+    @staticmethod
+    def timestamp_to_day(timestamp) -> date:
+        return datetime.fromtimestamp(timestamp, tz=dt_timezone.utc).date()
+
+    @staticmethod
+    def day_to_timestamp(day: date) -> int:
+        return int(
+            datetime(day.year, day.month, day.day, tzinfo=dt_timezone.utc).timestamp()
+        )
+
+    def fba_template_ids_to_template_names(self, fba_template_ids):
+        translations = (
+            TemplateTranslation.objects.filter(message_template_id__in=fba_template_ids)
+            .order_by("pk")
+            .values_list("message_template_id", "template__name")
+        )
+        # When many translations share the id, the last one wins
+        return dict(translations)
 
     def enable_insights(self, app):
         waba_id = self.get_waba(app=app).get("wa_waba_id")
@@ -1,10 +1,19 @@
 import uuid
+
+from datetime import timedelta
+from unittest.mock import Mock
+
 from django.test import TestCase
+from django.utils import timezone
 
 from marketplace.wpp_templates.services.facebook import FacebookService
 
 from marketplace.applications.models import App
-from marketplace.wpp_templates.models import TemplateMessage, TemplateTranslation
+from marketplace.wpp_templates.models import (
+    TemplateAnalyticsDay,
+    TemplateMessage,
+    TemplateTranslation,
+)
 from django.contrib.auth import get_user_model
 
 
@@ -198,7 +207,7 @@ class TestFacebookServiceAnalytics(SetUpBaseService):
 
         validated_data = {
             "start": 1695772800,
-            "end": 1695945599,
+            "end": 1696031999,
             "fba_template_ids": [
                 "831797345020910",
                 "831797345020911",
@@ -224,6 +233,129 @@ class TestFacebookServiceAnalytics(SetUpBaseService):
         self.service = FacebookService(client=MockFacebookClient())
         self.assertEqual(response, expected_data)
 
+    def test_closed_days_are_fetched_once(self):
+        client = Mock(wraps=MockFacebookClient())
+        self.service = FacebookService(client=client)
+        validated_data = {
+            "start": 1695772800,
+            "end": 1695945599,
+            "fba_template_ids": ["831797345020910", "831797345020911"],
+        }
+
+        first_response = self.service.template_analytics(self.app, validated_data)
+        with self.assertNumQueries(2):
+            second_response = self.service.template_analytics(self.app, validated_data)
+
+        client.get_template_analytics.assert_called_once()
+        self.assertEqual(first_response, second_response)
+        self.assertEqual(
+            TemplateAnalyticsDay.objects.filter(
+                app=self.app, has_data_point=False
+            ).count(),
+            2,
+        )
+
+    def test_only_open_days_are_fetched_again(self):
+        client = Mock()
+        client.get_template_analytics.return_value = {"data": {"data_points": []}}
+        self.service = FacebookService(client=client)
+        today = timezone.now().date()
+        first_day = today - timedelta(days=5)
+        validated_data = {
+            "start": FacebookService.day_to_timestamp(first_day),
+            "end": FacebookService.day_to_timestamp(today + timedelta(days=1)) - 1,
+            "fba_template_ids": ["831797345020910"],
+        }
+
+        self.service.template_analytics(self.app, validated_data)
+        client.get_template_analytics.reset_mock()
+        self.service.template_analytics(self.app, validated_data)
+
+        fields = client.get_template_analytics.call_args.kwargs["fields"]
+        self.assertEqual(
+            FacebookService.timestamp_to_day(fields["start"]),
+            self.service.last_closed_day() + timedelta(days=1),
+        )
+        self.assertEqual(FacebookService.timestamp_to_day(fields["end"]), today)
+
+    def test_open_day_values_are_updated(self):
+        client = Mock()
+        self.service = FacebookService(client=client)
+        today = timezone.now().date()
+        start = FacebookService.day_to_timestamp(today)
+        validated_data = {
+            "start": start,
+            "end": start + 86399,
+            "fba_template_ids": ["831797345020910"],
+        }
+
+        for sent in (1, 4):
+            client.get_template_analytics.return_value = {
+                "data": {
+                    "data_points": [
+                        {
+                            "template_id": "831797345020910",
+                            "start": start,
+                            "sent": sent,
+                            "delivered": sent,
+                            "read": 0,
+                        }
+                    ]
+                }
+            }
+            response = self.service.template_analytics(self.app, validated_data)
+
+        self.assertEqual(
+            response["grand_totals"], {"sent": 4, "delivered": 4, "read": 0}
+        )
+        self.assertEqual(TemplateAnalyticsDay.objects.get(app=self.app).sent, 4)
+
+    def test_rows_stored_before_their_day_closed_are_fetched_again(self):
+        client = Mock()
+        self.service = FacebookService(client=client)
+        day = self.service.last_closed_day()
+        start = FacebookService.day_to_timestamp(day)
+        validated_data = {
+            "start": start,
+            "end": start + 86399,
+            "fba_template_ids": ["831797345020910", "831797345020911"],
+        }
+        for template_id in validated_data["fba_template_ids"]:
+            TemplateAnalyticsDay.objects.create(
+                app=self.app, template_id=template_id, day=day, sent=1
+            )
+        # Both rows were written while the day was still open
+        TemplateAnalyticsDay.objects.update(
+            modified_on=timezone.now() - timedelta(days=3)
+        )
+        client.get_template_analytics.return_value = {
+            "data": {
+                "data_points": [
+                    {
+                        "template_id": "831797345020910",
+                        "start": start,
+                        "sent": 5,
+                        "delivered": 5,
+                        "read": 2,
+                    }
+                ]
+            }
+        }
+
+        response = self.service.template_analytics(self.app, validated_data)
+        client.get_template_analytics.reset_mock()
+        self.service.template_analytics(self.app, validated_data)
+
+        self.assertEqual(
+            response["grand_totals"], {"sent": 5, "delivered": 5, "read": 2}
+        )
+        client.get_template_analytics.assert_not_called()
+        self.assertFalse(
+            TemplateAnalyticsDay.objects.get(
+                template_id="831797345020911"
+            ).has_data_point
+        )
+
     def test_enable_insights(self):
         response = self.service.enable_insights(self.app)
         self.assertTrue(response)
@@ -1,45 +1,115 @@
 import logging
 
 from celery import shared_task
+from celery.exceptions import SoftTimeLimitExceeded
 
-from sentry_sdk import capture_exception
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+from django_redis import get_redis_connection
 
-from .models import TemplateMessage
+from sentry_sdk import capture_exception
 
 from marketplace.applications.models import App
-from marketplace.wpp_templates.models import (
-    TemplateTranslation,
-    TemplateHeader,
-    TemplateButton,
+from marketplace.wpp_templates.models import TemplateMessage, TemplateTranslation
+from marketplace.wpp_templates.template_graph import TemplateGraph
+from marketplace.wpp_templates.refresh_tracker import (
+    TEMPLATE_CHANGE_EVENTS,
+    TemplateRefreshTracker,
+    get_app_waba_id,
 )
 from marketplace.clients.flows.client import FlowsClient
 from marketplace.clients.facebook.client import FacebookClient
 from marketplace.services.facebook.service import TemplateService
 
 from .utils import WebhookEventProcessor, handle_error_and_update_config
+from .webhook_buffer import TemplateWebhookBuffer
 
 
 logger = logging.getLogger(__name__)
 
 
+TEMPLATES_REFRESH_LOCK_KEY = "refresh-whatsapp-templates-lock:{app_uuid}"
+
+
+def should_refresh_templates(app) -> bool:
+    if not (app.config.get("wa_waba_id") or app.config.get("waba")):
+        return False
+
+    if "ignores_meta_sync" in app.config:
+        logger.info(
+            f"Skipping sync for app {app.uuid} based on previous error: {app.config['ignores_meta_sync']}"
+        )
+        return False
+
+    return True
+
+
 @shared_task(track_started=True, name="refresh_whatsapp_templates_from_facebook")
 def refresh_whatsapp_templates_from_facebook():
-    for app in App.objects.filter(code__in=["wpp", "wpp-cloud"]):
-        try:
-            if not (app.config.get("wa_waba_id") or app.config.get("waba")):
-                continue
+    """
+    Dispatches one independent refresh subtask per app that is due, see
+    TemplateRefreshTracker. The subtasks are sent to
+    WHATSAPP_TEMPLATES_REFRESH_QUEUE, whose worker concurrency bounds how many
+    apps are refreshed at the same time, so a slow or lost app refresh never
+    holds the others.
+    """
+    apps = App.objects.filter(code__in=["wpp", "wpp-cloud"]).only("uuid", "config")
+    apps = [app for app in apps if should_refresh_templates(app)]
+    tracker = TemplateRefreshTracker()
+    app_uuids = [str(app.uuid) for app in tracker.get_due_apps(apps)]
+
+    tracker.mark_scheduled(app_uuids)
+    for app_uuid in app_uuids:
+        refresh_app_templates_from_facebook.si(app_uuid).apply_async(
+            queue=settings.WHATSAPP_TEMPLATES_REFRESH_QUEUE
+        )
 
-            if "ignores_meta_sync" in app.config:
-                logger.info(
-                    f"Skipping sync for app {app.uuid} based on previous error: {app.config['ignores_meta_sync']}"
-                )
-                continue
+    logger.info(
+        f"Dispatched template refresh for {len(app_uuids)} of {len(apps)} apps "
+        f"to {settings.WHATSAPP_TEMPLATES_REFRESH_QUEUE}"
+    )
+
+
+@shared_task(
+    track_started=True,
+    name="refresh_app_templates_from_facebook",
+    soft_time_limit=settings.WHATSAPP_TEMPLATES_REFRESH_TIMEOUT,
+    time_limit=settings.WHATSAPP_TEMPLATES_REFRESH_TIMEOUT + 60,
+)
+def refresh_app_templates_from_facebook(app_uuid: str):
+    # Errors are logged and not raised, the task isn't retried
+    redis = get_redis_connection()
+    lock_key = TEMPLATES_REFRESH_LOCK_KEY.format(app_uuid=app_uuid)
+    if not redis.set(
+        lock_key, "locked", nx=True, ex=settings.WHATSAPP_TEMPLATES_REFRESH_TIMEOUT
+    ):
+        logger.info(f"Template refresh already running for app {app_uuid}. Skipping.")
+        return
+
+    tracker = TemplateRefreshTracker(redis)
+    try:
+        app = App.objects.get(uuid=app_uuid)
+        if not should_refresh_templates(app):
+            return
+
+        # The app may have been refreshed since this task was dispatched
+        if not tracker.is_app_due(app):
+            logger.info(f"Templates of app {app_uuid} are up to date. Skipping.")
+            return
 
-            service = FacebookTemplateSyncService(app)
-            service.sync_templates()
+        started_at = timezone.now()
+        service = FacebookTemplateSyncService(app)
+        if service.sync_templates():
+            tracker.record_refresh(app_uuid, started_at)
 
-        except Exception as e:
-            logger.error(f"Error processing app {app.uuid}: {str(e)}")
+    except SoftTimeLimitExceeded:
+        logger.error(f"Template refresh timed out for app {app_uuid}")
+    except Exception as e:
+        logger.error(f"Error processing app {app_uuid}: {str(e)}")
+    finally:
+        tracker.clear_scheduled(app_uuid)
+        redis.delete(lock_key)
 
 
 class FacebookTemplateSyncService:
@@ -55,23 +125,32 @@ class FacebookTemplateSyncService:
         self.flows_client = FlowsClient()
 
     def sync_templates(self):
-        waba_id = (
-            self.app.config.get("waba").get("id")
-            if self.app.config.get("waba")
-            else self.app.config.get("wa_waba_id")
-        )
+        waba_id = get_app_waba_id(self.app)
+
+        # Each page is stored as soon as it arrives, Flows and the removal of
+        # translations deleted on Meta need the complete list of templates
+        templates = []
+        template_graph = TemplateGraph(self.app)
+        for page in self.template_service.list_template_messages_pages(waba_id):
+            if page.get("error"):
+                template_error = page["error"]
+                logger.error(
+                    f"A error occurred with waba_id: {waba_id}. \nThe error was:  {template_error}\n"
+                )
+                handle_error_and_update_config(self.app, template_error)
+                return False
 
-        templates = self.template_service.list_template_messages(waba_id)
+            page_templates = page.get("data", [])
+            for template in page_templates:
+                try:
+                    template_graph.update(template)
+                except Exception as error:
+                    capture_exception(error)
+                    continue
 
-        if templates.get("error"):
-            template_error = templates["error"]
-            logger.error(
-                f"A error occurred with waba_id: {waba_id}. \nThe error was:  {template_error}\n"
-            )
-            handle_error_and_update_config(self.app, template_error)
-            return
+            template_graph.save()
+            templates.extend(page_templates)
 
-        templates = templates.get("data", [])
         try:
             self.flows_client.update_facebook_templates(
                 str(self.app.flow_object_uuid), templates
@@ -86,113 +165,38 @@ class FacebookTemplateSyncService:
         if waba_id:
             delete_unexistent_translations(self.app, templates)
 
-        for template in templates:
-            try:
-                translation = TemplateTranslation.objects.filter(
-                    message_template_id=template.get("id"), template__app=self.app
-                )
-                if translation:
-                    translation = translation.last()
-                    found_template = translation.template
-                else:
-                    found_template, _created = TemplateMessage.objects.get_or_create(
-                        app=self.app,
-                        name=template.get("name"),
-                    )
-
-                found_template.category = template.get("category")
-                found_template.save()
-
-                body = ""
-                footer = ""
-                for translation in template.get("components"):
-                    if translation.get("type") == "BODY":
-                        body = translation.get("text", "")
-
-                    if translation.get("type") == "FOOTER":
-                        footer = translation.get("text", "")
-
-                (
-                    returned_translation,
-                    _created,
-                ) = TemplateTranslation.objects.get_or_create(
-                    template=found_template,
-                    language=template.get("language"),
-                )
-                returned_translation.body = body
-                returned_translation.footer = footer
-                returned_translation.status = template.get("status")
-                returned_translation.variable_count = 0
-                returned_translation.message_template_id = template.get("id")
-                returned_translation.save()
-
-                for translation in template.get("components"):
-                    if translation.get("type") == "HEADER":
-                        (
-                            returned_header,
-                            _created,
-                        ) = TemplateHeader.objects.get_or_create(
-                            translation=returned_translation,
-                            header_type=translation.get("format"),
-                        )
-                        returned_header.text = translation.get("text", {})
-                        returned_header.example = translation.get("example", {}).get(
-                            "header_handle"
-                        )
-                        returned_header.save()
-
-                    if translation.get("type") == "BUTTONS":
-                        for button in translation.get("buttons"):
-                            (
-                                _returned_button,
-                                _created,
-                            ) = TemplateButton.objects.get_or_create(
-                                translation=returned_translation,
-                                button_type=button.get("type"),
-                                text=button.get("text"),
-                                url=button.get("url"),
-                                phone_number=button.get("phone_number"),
-                            )
-
-            except Exception as error:
-                capture_exception(error)
-                continue
-
         print(f"Completed template update for app {str(self.app.uuid)}")
+        return True
 
 
 def delete_unexistent_translations(app, templates):
-    templates_message = app.template.all()
-    templates_ids = [item["id"] for item in templates]
-
-    for template in templates_message:
-        try:
-            template_translation = TemplateTranslation.objects.filter(template=template)
-            if not template_translation:
-                print(f"Removing template without translation: {template}")
-                template.delete()
-                continue
-
-            for translation in template_translation:
-                if translation.message_template_id not in templates_ids:
-                    translation_language = (
-                        translation.language if translation.language else "No language"
-                    )
-                    print(
-                        f"Removing translation {translation.message_template_id}: {translation_language}"
-                    )
-                    translation.delete()
-
-            if template.translations.all().count() == 0:
-                temaplte_name = template.name if template.name else "No name"
-                print(f"Removing template:{temaplte_name} after removing translations")
-                template.delete()
-
-        except Exception as e:
-            logger.error(
-                f"An error occurred 'on delete_unexistent_translations()': {e}"
+    """
+    Deletes the translations of the app whose message_template_id was not
+    returned by Meta, and the templates left without translations.
+    """
+    message_template_ids = {
+        str(template["id"]) for template in templates if template.get("id")
+    }
+
+    try:
+        with transaction.atomic():
+            _, deleted_translations = (
+                TemplateTranslation.objects.filter(template__app=app)
+                .exclude(message_template_id__in=message_template_ids)
+                .delete()
             )
-            continue
+            _, deleted_templates = TemplateMessage.objects.filter(
+                app=app, translations__isnull=True
+            ).delete()
+    except Exception as e:
+        logger.error(f"An error occurred 'on delete_unexistent_translations()': {e}")
+        return
+
+    print(
+        f"Removed {deleted_translations.get('wpp_templates.TemplateTranslation', 0)} translations "
+        f"and {deleted_templates.get('wpp_templates.TemplateMessage', 0)} templates "
+        f"no longer returned by Meta for app {str(app.uuid)}"
+    )
 
 
 @shared_task(track_started=True, name="update_templates_by_webhook")
@@ -201,6 +205,7 @@ def update_templates_by_webhook(**kwargs):  # pragma: no cover
         "message_template_status_update",
     ]
     webhook_data = kwargs.get("webhook_data")
+    tracker = TemplateRefreshTracker()
     for entry in webhook_data.get("entry", []):
         whatsapp_business_account_id = entry.get("id")
         for change in entry.get("changes", []):
@@ -209,9 +214,57 @@ def update_templates_by_webhook(**kwargs):  # pragma: no cover
             if value.get("reason", None) is None:
                 value["reason"] = ""
 
+            template_changed = field in TEMPLATE_CHANGE_EVENTS
             if field in allowed_event_types:
-                WebhookEventProcessor.process_event(
+                found = WebhookEventProcessor.process_event(
                     whatsapp_business_account_id, value, field, webhook_data
                 )
+                # Templates created outside the platform are only stored on refresh
+                template_changed = template_changed or found is False
             else:
                 logger.info(f"Event: {field}, not mapped to usage")
+
+            try:
+                tracker.record_webhook(whatsapp_business_account_id, template_changed)
+            except Exception as e:
+                logger.error(f"Error recording webhook for template refresh: {e}")
+
+
+@shared_task(track_started=True, name="process_buffered_template_webhooks")
+def process_buffered_template_webhooks(waba_id: str):
+    """
+    Processes the template webhook events buffered for the WABA as one batch.
+    When it fails, the events are kept and processed with the next batch.
+    """
+    buffer = TemplateWebhookBuffer()
+    events = buffer.claim(waba_id)
+    if not events:
+        return
+
+    status_updates = []
+    template_changed = False
+    for event in events:
+        field = event.get("field")
+        value = event.get("value") or {}
+        if value.get("reason", None) is None:
+            value["reason"] = ""
+
+        if field == "message_template_status_update":
+            status_updates.append((value, event.get("webhook")))
+        else:
+            template_changed = template_changed or field in TEMPLATE_CHANGE_EVENTS
+            logger.info(f"Event: {field}, not mapped to usage")
+
+    if status_updates:
+        missing = WebhookEventProcessor.process_template_status_updates(
+            waba_id, status_updates
+        )
+        # Templates created outside the platform are only stored on refresh
+        template_changed = template_changed or bool(missing)
+
+    buffer.ack(waba_id)
+
+    try:
+        TemplateRefreshTracker().record_webhook(waba_id, template_changed)
+    except Exception as e:
+        logger.error(f"Error recording webhook for template refresh: {e}")
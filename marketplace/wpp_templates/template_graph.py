@@ -0,0 +1,325 @@
+from django.db import transaction
+
+from marketplace.wpp_templates.models import (
+    TemplateMessage,
+    TemplateTranslation,
+    TemplateHeader,
+    TemplateButton,
+)
+
+
+TRANSLATION_SYNC_FIELDS = [
+    "body",
+    "footer",
+    "status",
+    "variable_count",
+    "message_template_id",
+]
+HEADER_SYNC_FIELDS = ["text", "example"]
+
+
+def as_char(value):
+    """Returns the value the way it is stored by a CharField."""
+    return value if value is None else str(value)
+
+
+class TemplateGraph:
+    """
+    In-memory view of the templates stored for an app.
+
+    The stored templates, translations, headers and buttons are loaded once with
+    prefetching queries. Templates returned by the Graph API are merged with
+    `update`, which only records what changed and refuses the templates the
+    database would not store, and `save` writes the pending changes with bulk
+    queries in a single transaction.
+    """
+
+    bulk_batch_size = 500
+
+    def __init__(self, app):
+        self.app = app
+        self.templates_by_name = {}
+        self.translations_by_message_template_id = {}
+        self.translations_by_language = {}
+        self.headers_by_type = {}
+        self.button_keys = set()
+        self._reset_changes()
+        self._load()
+
+    def _reset_changes(self):
+        self.new_templates = []
+        self.new_translations = []
+        self.new_headers = []
+        self.new_buttons = []
+        self.changed_templates = {}
+        self.changed_translations = {}
+        self.changed_headers = {}
+
+    def _load(self):
+        templates = (
+            TemplateMessage.objects.filter(app=self.app)
+            .order_by("pk")
+            .prefetch_related("translations__headers", "translations__buttons")
+        )
+        for template in templates:
+            self.templates_by_name.setdefault(template.name, template)
+            for translation in template.translations.all():
+                self._add_translation(template, translation)
+                for header in translation.headers.all():
+                    self.headers_by_type.setdefault(
+                        (translation.uuid, header.header_type), header
+                    )
+                for button in translation.buttons.all():
+                    self.button_keys.add(
+                        self._button_key(
+                            translation,
+                            button.button_type,
+                            button.text,
+                            button.url,
+                            button.phone_number,
+                        )
+                    )
+
+    def _add_translation(self, template, translation):
+        translation.template = template
+        if translation.message_template_id:
+            self.translations_by_message_template_id[
+                translation.message_template_id
+            ] = translation
+        self.translations_by_language.setdefault(
+            (template.uuid, translation.language), translation
+        )
+
+    @staticmethod
+    def _button_key(translation, button_type, text, url, phone_number):
+        return (
+            translation.uuid,
+            as_char(button_type),
+            as_char(text),
+            as_char(url),
+            as_char(phone_number),
+        )
+
+    @property
+    def has_changes(self) -> bool:
+        return any(
+            [
+                self.new_templates,
+                self.new_translations,
+                self.new_headers,
+                self.new_buttons,
+                self.changed_templates,
+                self.changed_translations,
+                self.changed_headers,
+            ]
+        )
+
+    def update(self, data: dict):
+        """
+        Merges a template returned by the Graph API into the graph.
+
+        The values are validated against the model fields before anything is
+        queued, a template that can't be stored raises ValueError and leaves
+        the graph untouched, so it never fails the bulk writes of `save`.
+        """
+        message_template_id = as_char(data.get("id"))
+        components = data.get("components") or []
+
+        body = ""
+        footer = ""
+        headers = []
+        buttons = []
+        for component in components:
+            if component.get("type") == "BODY":
+                body = component.get("text", "")
+
+            if component.get("type") == "FOOTER":
+                footer = component.get("text", "")
+
+            if component.get("type") == "HEADER":
+                headers.append(
+                    (
+                        component.get("format"),
+                        {
+                            "text": component.get("text", {}),
+                            "example": component.get("example", {}).get(
+                                "header_handle"
+                            ),
+                        },
+                    )
+                )
+
+            if component.get("type") == "BUTTONS":
+                buttons.extend(component.get("buttons"))
+
+        template_values = {"category": data.get("category")}
+        translation_values = {
+            "body": body,
+            "footer": footer,
+            "status": data.get("status"),
+            "variable_count": 0,
+            "message_template_id": message_template_id,
+        }
+
+        translation = self.translations_by_message_template_id.get(message_template_id)
+        if translation is None:
+            self._validate(TemplateMessage, {"name": data.get("name")})
+        self._validate(TemplateMessage, template_values)
+        self._validate(
+            TemplateTranslation,
+            {"language": data.get("language"), **translation_values},
+        )
+        for header_type, header_values in headers:
+            self._validate(
+                TemplateHeader, {"header_type": header_type, **header_values}
+            )
+        for button in buttons:
+            self._validate(TemplateButton, self._button_values(button))
+
+        if translation:
+            template = translation.template
+        else:
+            template = self._get_or_build_template(data.get("name"))
+
+        self._set_fields(
+            template, template_values, self.new_templates, self.changed_templates
+        )
+
+        translation = self._get_or_build_translation(template, data.get("language"))
+        self._set_fields(
+            translation,
+            translation_values,
+            self.new_translations,
+            self.changed_translations,
+        )
+        if message_template_id:
+            self.translations_by_message_template_id[message_template_id] = translation
+
+        for header_type, header_values in headers:
+            header = self._get_or_build_header(translation, header_type)
+            self._set_fields(
+                header, header_values, self.new_headers, self.changed_headers
+            )
+
+        for button in buttons:
+            self._add_button(translation, button)
+
+    @staticmethod
+    def _validate(model, values):
+        """Raises ValueError for values the database columns would refuse."""
+        for field_name, value in values.items():
+            field = model._meta.get_field(field_name)
+            if isinstance(value, (dict, list)):
+                value = as_char(value)
+
+            if value is None:
+                if not field.null:
+                    raise ValueError(f"{model.__name__}.{field_name} can't be null")
+            elif field.max_length and len(str(value)) > field.max_length:
+                raise ValueError(
+                    f"{model.__name__}.{field_name} is longer than {field.max_length}"
+                )
+
+    @staticmethod
+    def _button_values(button) -> dict:
+        return {
+            "button_type": button.get("type"),
+            "text": button.get("text"),
+            "url": button.get("url"),
+            "phone_number": button.get("phone_number"),
+        }
+
+    def _get_or_build_template(self, name):
+        template = self.templates_by_name.get(name)
+        if template is None:
+            template = TemplateMessage(app=self.app, name=name)
+            self.templates_by_name[name] = template
+            self.new_templates.append(template)
+        return template
+
+    def _get_or_build_translation(self, template, language):
+        translation = self.translations_by_language.get((template.uuid, language))
+        if translation is None:
+            translation = TemplateTranslation(template=template, language=language)
+            self._add_translation(template, translation)
+            self.new_translations.append(translation)
+        return translation
+
+    def _get_or_build_header(self, translation, header_type):
+        header = self.headers_by_type.get((translation.uuid, header_type))
+        if header is None:
+            header = TemplateHeader(translation=translation, header_type=header_type)
+            self.headers_by_type[(translation.uuid, header_type)] = header
+            self.new_headers.append(header)
+        return header
+
+    def _add_button(self, translation, button):
+        values = self._button_values(button)
+        key = self._button_key(translation, *values.values())
+        if key in self.button_keys:
+            return
+
+        self.button_keys.add(key)
+        self.new_buttons.append(TemplateButton(translation=translation, **values))
+
+    @staticmethod
+    def _set_fields(instance, values, new_instances, changed_instances):
+        changed = False
+        for field, value in values.items():
+            if isinstance(value, (dict, list)):
+                value = as_char(value)
+            if getattr(instance, field) != value:
+                setattr(instance, field, value)
+                changed = True
+
+        if changed and instance.pk is not None:
+            changed_instances[instance.uuid] = instance
+
+    def save(self):
+        """Writes the pending changes with bulk queries in one transaction."""
+        if not self.has_changes:
+            return
+
+        with transaction.atomic():
+            self._bulk_create(TemplateMessage, self.new_templates)
+            self._bulk_update(
+                TemplateMessage, self.changed_templates.values(), ["category"]
+            )
+            self._bulk_create(TemplateTranslation, self.new_translations)
+            self._bulk_update(
+                TemplateTranslation,
+                self.changed_translations.values(),
+                TRANSLATION_SYNC_FIELDS,
+            )
+            self._bulk_create(TemplateHeader, self.new_headers)
+            self._bulk_update(
+                TemplateHeader, self.changed_headers.values(), HEADER_SYNC_FIELDS
+            )
+            self._bulk_create(TemplateButton, self.new_buttons)
+
+        self._reset_changes()
+
+    def _bulk_create(self, model, instances):
+        if not instances:
+            return
+
+        model.objects.bulk_create(instances, batch_size=self.bulk_batch_size)
+
+        # Databases that cannot return the inserted rows leave the primary keys
+        # unset, they are needed to create the related rows.
+        missing_pk = [instance for instance in instances if instance.pk is None]
+        if missing_pk:
+            pks = dict(
+                model.objects.filter(
+                    uuid__in=[instance.uuid for instance in missing_pk]
+                ).values_list("uuid", "pk")
+            )
+            for instance in missing_pk:
+                instance.pk = pks[instance.uuid]
+
+    def _bulk_update(self, model, instances, fields):
+        instances = list(instances)
+        if instances:
+            model.objects.bulk_update(
+                instances, fields, batch_size=self.bulk_batch_size
+            )
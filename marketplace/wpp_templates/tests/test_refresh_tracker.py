@@ -0,0 +1,120 @@
+import uuid
+
+from datetime import timedelta
+from unittest.mock import MagicMock, patch
+
+from django.test import SimpleTestCase, override_settings
+from django.utils import timezone
+
+from marketplace.wpp_templates.refresh_tracker import (
+    TemplateRefreshTracker,
+    get_app_waba_id,
+)
+
+
+@override_settings(
+    WHATSAPP_TEMPLATES_STALE_AFTER=24 * 60 * 60,
+    WHATSAPP_TEMPLATES_SAFETY_CRAWL_INTERVAL=7 * 24 * 60 * 60,
+)
+class TemplateRefreshTrackerTestCase(SimpleTestCase):
+    def setUp(self):
+        self.redis = MagicMock()
+        self.tracker = TemplateRefreshTracker(self.redis)
+        self.now = timezone.now()
+
+    def is_due(self, last_refresh, last_webhook=None, last_change=None):
+        ago = (
+            lambda hours: None if hours is None else self.now - timedelta(hours=hours)
+        )  # noqa: E731
+        return self.tracker.is_due(
+            self.now, ago(last_refresh), ago(last_webhook), ago(last_change)
+        )
+
+    def test_never_refreshed_app_is_due(self):
+        self.assertTrue(self.is_due(None))
+
+    def test_app_without_webhooks_is_due_when_stale(self):
+        self.assertFalse(self.is_due(23))
+        self.assertTrue(self.is_due(25))
+
+    def test_app_receiving_webhooks_waits_for_safety_crawl(self):
+        self.assertFalse(self.is_due(25, last_webhook=2))
+        self.assertFalse(self.is_due(24 * 6, last_webhook=2))
+        self.assertTrue(self.is_due(24 * 7, last_webhook=2))
+
+    def test_app_is_due_after_template_change(self):
+        self.assertTrue(self.is_due(2, last_webhook=1, last_change=1))
+        self.assertFalse(self.is_due(1, last_webhook=2, last_change=2))
+
+    def test_get_due_apps_reads_state_in_bulk(self):
+        apps = [
+            MagicMock(uuid=uuid.uuid4(), config={"wa_waba_id": "waba-1"}),
+            MagicMock(uuid=uuid.uuid4(), config={"waba": {"id": "waba-2"}}),
+        ]
+        recent = (self.now - timedelta(hours=1)).isoformat().encode()
+        state = {
+            TemplateRefreshTracker.LAST_REFRESH_KEY: [recent, recent],
+            TemplateRefreshTracker.LAST_WEBHOOK_KEY: [None, None],
+            TemplateRefreshTracker.LAST_CHANGE_KEY: [None, self.now.isoformat()],
+        }
+        self.redis.hmget.side_effect = lambda key, fields: state[key]
+        self.redis.mget.return_value = [None, None]
+
+        with patch("django.utils.timezone.now", return_value=self.now):
+            due_apps = self.tracker.get_due_apps(apps)
+
+        self.assertEqual(due_apps, apps[1:])
+        self.assertEqual(self.redis.hmget.call_count, 3)
+        self.redis.hmget.assert_any_call(
+            TemplateRefreshTracker.LAST_CHANGE_KEY, ["waba-1", "waba-2"]
+        )
+
+        self.redis.mget.return_value = [None, b"scheduled"]
+        with patch("django.utils.timezone.now", return_value=self.now):
+            self.assertEqual(self.tracker.get_due_apps(apps), [])
+
+    def test_record_webhook(self):
+        self.tracker.record_webhook("waba-1")
+        self.redis.hset.assert_called_once()
+
+        self.redis.reset_mock()
+        self.tracker.record_webhook("waba-1", template_changed=True)
+        self.assertEqual(self.redis.hset.call_count, 2)
+
+    def test_get_last_refresh(self):
+        self.redis.hget.return_value = b"2024-05-01T10:00:00+00:00"
+
+        last_refresh = self.tracker.get_last_refresh("app-uuid")
+
+        self.assertEqual(last_refresh.isoformat(), "2024-05-01T10:00:00+00:00")
+
+    def test_get_app_waba_id(self):
+        self.assertEqual(get_app_waba_id(MagicMock(config={"wa_waba_id": "1"})), "1")
+        self.assertEqual(get_app_waba_id(MagicMock(config={"waba": {"id": "2"}})), "2")
+        self.assertIsNone(get_app_waba_id(MagicMock(config={})))
+
+    def test_is_app_due(self):
+        app = MagicMock(uuid=uuid.uuid4(), config={"wa_waba_id": "waba-1"})
+        self.redis.hget.return_value = None
+        self.assertTrue(self.tracker.is_app_due(app))
+
+        self.redis.hget.return_value = self.now.isoformat().encode()
+        self.assertFalse(self.tracker.is_app_due(app))
+
+    @override_settings(WHATSAPP_TEMPLATES_REFRESH_SCHEDULED_TTL=60)
+    def test_mark_and_clear_scheduled(self):
+        tracker = TemplateRefreshTracker(self.redis)
+        pipeline = self.redis.pipeline.return_value
+
+        tracker.mark_scheduled(["app-1", "app-2"])
+
+        pipeline.set.assert_any_call(
+            "refresh-whatsapp-templates-scheduled:app-1", "scheduled", ex=60
+        )
+        self.assertEqual(pipeline.set.call_count, 2)
+
+        tracker.clear_scheduled("app-1")
+
+        self.redis.delete.assert_called_once_with(
+            "refresh-whatsapp-templates-scheduled:app-1"
+        )
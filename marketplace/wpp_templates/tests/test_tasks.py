@@ -0,0 +1,365 @@
+import uuid
+
+from unittest.mock import MagicMock, patch
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from celery.exceptions import SoftTimeLimitExceeded
+
+from marketplace.applications.models import App
+from marketplace.wpp_templates.models import (
+    TemplateButton,
+    TemplateMessage,
+    TemplateTranslation,
+)
+from marketplace.wpp_templates.tasks import (
+    FacebookTemplateSyncService,
+    delete_unexistent_translations,
+    process_buffered_template_webhooks,
+    refresh_app_templates_from_facebook,
+    refresh_whatsapp_templates_from_facebook,
+)
+from marketplace.wpp_templates.refresh_tracker import TemplateRefreshTracker
+from marketplace.wpp_templates.template_graph import TemplateGraph
+from marketplace.wpp_templates.tests.test_template_graph import graph_template
+
+User = get_user_model()
+
+
+class FacebookTemplateSyncServiceTestCase(TestCase):
+    def setUp(self):
+        self.app = App.objects.create(
+            config=dict(wa_waba_id="432321321"),
+            project_uuid=uuid.uuid4(),
+            platform=App.PLATFORM_WENI_FLOWS,
+            code="wpp-cloud",
+            created_by=User.objects.get_admin_user(),
+        )
+
+        with patch.object(FacebookTemplateSyncService, "__init__", return_value=None):
+            self.service = FacebookTemplateSyncService(self.app)
+        self.service.app = self.app
+        self.service.template_service = MagicMock()
+        self.service.flows_client = MagicMock()
+
+    def test_sync_templates(self):
+        templates = [
+            graph_template(),
+            graph_template(template_id="1002", language="en_US"),
+            graph_template(template_id="1003", name="goodbye"),
+        ]
+        self.service.template_service.list_template_messages_pages.return_value = [
+            {"data": templates[:2]},
+            {"data": templates[2:]},
+        ]
+
+        self.service.sync_templates()
+
+        self.service.flows_client.update_facebook_templates.assert_called_once_with(
+            str(self.app.flow_object_uuid), templates
+        )
+        self.assertEqual(TemplateMessage.objects.filter(app=self.app).count(), 2)
+        self.assertEqual(
+            TemplateTranslation.objects.filter(template__app=self.app).count(), 3
+        )
+
+    def test_pages_are_stored_as_they_arrive(self):
+        def pages(waba_id):
+            yield {"data": [graph_template()]}
+            raise ConnectionError("listing interrupted")
+
+        self.service.template_service.list_template_messages_pages.side_effect = pages
+
+        with self.assertRaises(ConnectionError):
+            self.service.sync_templates()
+
+        self.assertTrue(TemplateMessage.objects.filter(app=self.app).exists())
+        self.service.flows_client.update_facebook_templates.assert_not_called()
+
+    def test_invalid_template_does_not_stop_sync(self):
+        self.service.template_service.list_template_messages_pages.return_value = [
+            {"data": [{"id": "999"}, graph_template()]}
+        ]
+
+        with patch(
+            "marketplace.wpp_templates.template_graph.TemplateGraph.update",
+            side_effect=[ValueError("invalid template"), None],
+        ), patch("marketplace.wpp_templates.tasks.capture_exception") as capture:
+            self.service.sync_templates()
+
+        capture.assert_called_once()
+
+    def test_error_response_updates_config(self):
+        error = {"code": 100, "error_subcode": 33, "message": "Unsupported"}
+        self.service.template_service.list_template_messages_pages.return_value = [
+            {"error": error}
+        ]
+
+        with patch(
+            "marketplace.wpp_templates.tasks.handle_error_and_update_config"
+        ) as handle_error:
+            self.service.sync_templates()
+
+        handle_error.assert_called_once_with(self.app, error)
+        self.assertFalse(TemplateMessage.objects.filter(app=self.app).exists())
+
+
+class RefreshWhatsappTemplatesTestCase(TestCase):
+    def setUp(self):
+        self.apps = [
+            App.objects.create(
+                config=dict(wa_waba_id=f"waba-{index}"),
+                project_uuid=uuid.uuid4(),
+                platform=App.PLATFORM_WENI_FLOWS,
+                code="wpp-cloud",
+                created_by=User.objects.get_admin_user(),
+            )
+            for index in range(5)
+        ]
+        App.objects.create(
+            config=dict(wa_waba_id="ignored", ignores_meta_sync={"code": 100}),
+            project_uuid=uuid.uuid4(),
+            platform=App.PLATFORM_WENI_FLOWS,
+            code="wpp-cloud",
+            created_by=User.objects.get_admin_user(),
+        )
+        self.app_uuid = str(self.apps[0].uuid)
+
+        self.redis = MagicMock()
+        self.redis.hget.return_value = None
+        self.redis.mget.side_effect = lambda keys: [None] * len(keys)
+        self.redis.hmget.side_effect = lambda key, fields: [None] * len(fields)
+        redis_patcher = patch(
+            "marketplace.wpp_templates.tasks.get_redis_connection",
+            return_value=self.redis,
+        )
+        redis_patcher.start()
+        self.addCleanup(redis_patcher.stop)
+        tracker_redis_patcher = patch(
+            "marketplace.wpp_templates.refresh_tracker.get_redis_connection",
+            return_value=self.redis,
+        )
+        tracker_redis_patcher.start()
+        self.addCleanup(tracker_redis_patcher.stop)
+
+    @override_settings(WHATSAPP_TEMPLATES_REFRESH_QUEUE="templates")
+    @patch("marketplace.wpp_templates.tasks.refresh_app_templates_from_facebook.si")
+    def test_refresh_is_dispatched_per_app_to_its_queue(self, mock_signature):
+        refresh_whatsapp_templates_from_facebook()
+
+        dispatched = [call.args[0] for call in mock_signature.call_args_list]
+        self.assertEqual(sorted(dispatched), sorted(str(app.uuid) for app in self.apps))
+        self.assertEqual(mock_signature.return_value.apply_async.call_count, 5)
+        mock_signature.return_value.apply_async.assert_called_with(queue="templates")
+
+    @patch("marketplace.wpp_templates.tasks.refresh_app_templates_from_facebook.si")
+    def test_scheduled_apps_are_not_dispatched_again(self, mock_signature):
+        pipeline = self.redis.pipeline.return_value
+        scheduled = {self.app_uuid}
+        self.redis.mget.side_effect = lambda keys: [
+            "scheduled" if key.endswith(tuple(scheduled)) else None for key in keys
+        ]
+
+        refresh_whatsapp_templates_from_facebook()
+
+        self.assertEqual(mock_signature.call_count, 4)
+        self.assertNotIn(
+            self.app_uuid, [c.args[0] for c in mock_signature.call_args_list]
+        )
+        self.assertEqual(pipeline.set.call_count, 4)
+        pipeline.execute.assert_called_once()
+
+    @patch("marketplace.wpp_templates.tasks.refresh_app_templates_from_facebook.si")
+    def test_only_due_apps_are_refreshed(self, mock_signature):
+        with patch(
+            "marketplace.wpp_templates.tasks.TemplateRefreshTracker.get_due_apps",
+            return_value=self.apps[:1],
+        ) as get_due_apps:
+            refresh_whatsapp_templates_from_facebook()
+
+        self.assertEqual(len(get_due_apps.call_args.args[0]), 5)
+        mock_signature.assert_called_once_with(self.app_uuid)
+
+    @patch("marketplace.wpp_templates.tasks.FacebookTemplateSyncService")
+    def test_app_refresh_records_last_success(self, mock_service):
+        self.redis.set.return_value = True
+        mock_service.return_value.sync_templates.return_value = True
+
+        refresh_app_templates_from_facebook(self.app_uuid)
+
+        mock_service.return_value.sync_templates.assert_called_once()
+        self.redis.hset.assert_called_once()
+        self.assertEqual(self.redis.hset.call_args.args[1], self.app_uuid)
+        self.redis.delete.assert_any_call(
+            TemplateRefreshTracker.SCHEDULED_KEY.format(app_uuid=self.app_uuid)
+        )
+        self.assertEqual(self.redis.delete.call_count, 2)
+
+    @patch("marketplace.wpp_templates.tasks.FacebookTemplateSyncService")
+    def test_app_refresh_is_skipped_when_no_longer_due(self, mock_service):
+        self.redis.set.return_value = True
+        self.redis.hget.return_value = timezone.now().isoformat().encode()
+
+        refresh_app_templates_from_facebook(self.app_uuid)
+
+        mock_service.assert_not_called()
+        self.assertEqual(self.redis.delete.call_count, 2)
+
+    @patch("marketplace.wpp_templates.tasks.FacebookTemplateSyncService")
+    def test_app_refresh_is_skipped_when_locked(self, mock_service):
+        self.redis.set.return_value = False
+
+        refresh_app_templates_from_facebook(self.app_uuid)
+
+        mock_service.assert_not_called()
+        self.redis.delete.assert_not_called()
+
+    @patch("marketplace.wpp_templates.tasks.FacebookTemplateSyncService")
+    def test_app_refresh_errors_are_not_raised(self, mock_service):
+        self.redis.set.return_value = True
+        mock_service.return_value.sync_templates.side_effect = SoftTimeLimitExceeded()
+
+        refresh_app_templates_from_facebook(self.app_uuid)
+
+        self.redis.hset.assert_not_called()
+        self.assertEqual(self.redis.delete.call_count, 2)
+
+
+class DeleteUnexistentTranslationsTestCase(TestCase):
+    def setUp(self):
+        self.app = App.objects.create(
+            config=dict(wa_waba_id="432321321"),
+            project_uuid=uuid.uuid4(),
+            platform=App.PLATFORM_WENI_FLOWS,
+            code="wpp-cloud",
+            created_by=User.objects.get_admin_user(),
+        )
+        other_app = App.objects.create(
+            config=dict(wa_waba_id="999"),
+            project_uuid=uuid.uuid4(),
+            platform=App.PLATFORM_WENI_FLOWS,
+            code="wpp-cloud",
+            created_by=User.objects.get_admin_user(),
+        )
+
+        graph = TemplateGraph(self.app)
+        graph.update(graph_template(template_id="1"))
+        graph.update(graph_template(template_id="2", language="en_US"))
+        graph.update(graph_template(template_id="3", name="goodbye"))
+        graph.save()
+        TemplateMessage.objects.create(app=self.app, name="without_translations")
+
+        graph = TemplateGraph(other_app)
+        graph.update(graph_template(template_id="4"))
+        graph.save()
+
+    def test_missing_translations_and_empty_templates_are_deleted(self):
+        with self.assertNumQueries(9):
+            delete_unexistent_translations(self.app, [{"id": "1"}, {"id": 3}])
+
+        self.assertEqual(
+            set(
+                TemplateTranslation.objects.values_list(
+                    "template__name", "message_template_id"
+                )
+            ),
+            {("welcome", "1"), ("goodbye", "3"), ("welcome", "4")},
+        )
+        self.assertFalse(
+            TemplateMessage.objects.filter(name="without_translations").exists()
+        )
+        self.assertFalse(
+            TemplateButton.objects.filter(translation__message_template_id="2")
+        )
+
+    def test_templates_without_any_seen_translation_are_deleted(self):
+        delete_unexistent_translations(self.app, [{"id": "3"}])
+
+        self.assertEqual(
+            list(
+                TemplateMessage.objects.filter(app=self.app).values_list(
+                    "name", flat=True
+                )
+            ),
+            ["goodbye"],
+        )
+
+
+class ProcessBufferedTemplateWebhooksTestCase(TestCase):
+    def setUp(self):
+        buffer_patcher = patch("marketplace.wpp_templates.tasks.TemplateWebhookBuffer")
+        self.mock_buffer = buffer_patcher.start().return_value
+        self.addCleanup(buffer_patcher.stop)
+
+        tracker_patcher = patch(
+            "marketplace.wpp_templates.tasks.TemplateRefreshTracker"
+        )
+        self.mock_tracker = tracker_patcher.start().return_value
+        self.addCleanup(tracker_patcher.stop)
+
+    @patch(
+        "marketplace.wpp_templates.tasks.WebhookEventProcessor.process_template_status_updates"
+    )
+    def test_status_updates_are_processed_as_one_batch(self, mock_process):
+        mock_process.return_value = []
+        self.mock_buffer.claim.return_value = [
+            {
+                "field": "message_template_status_update",
+                "value": {"event": "APPROVED"},
+                "webhook": {"entry": 1},
+            },
+            {
+                "field": "message_template_status_update",
+                "value": {"event": "REJECTED", "reason": "INVALID"},
+                "webhook": {"entry": 2},
+            },
+            {"field": "message_template_quality_update", "value": {}, "webhook": {}},
+        ]
+
+        process_buffered_template_webhooks("waba-1")
+
+        mock_process.assert_called_once_with(
+            "waba-1",
+            [
+                ({"event": "APPROVED", "reason": ""}, {"entry": 1}),
+                ({"event": "REJECTED", "reason": "INVALID"}, {"entry": 2}),
+            ],
+        )
+        self.mock_tracker.record_webhook.assert_called_once_with("waba-1", False)
+        self.mock_buffer.ack.assert_called_once_with("waba-1")
+
+    @patch(
+        "marketplace.wpp_templates.tasks.WebhookEventProcessor.process_template_status_updates"
+    )
+    def test_events_are_kept_when_processing_fails(self, mock_process):
+        mock_process.side_effect = Exception("database is down")
+        self.mock_buffer.claim.return_value = [
+            {"field": "message_template_status_update", "value": {}, "webhook": {}},
+        ]
+
+        with self.assertRaises(Exception):
+            process_buffered_template_webhooks("waba-1")
+
+        self.mock_buffer.ack.assert_not_called()
+
+    @patch(
+        "marketplace.wpp_templates.tasks.WebhookEventProcessor.process_template_status_updates"
+    )
+    def test_change_events_mark_waba_as_changed(self, mock_process):
+        mock_process.return_value = [{"message_template_id": "3"}]
+        self.mock_buffer.claim.return_value = [
+            {"field": "message_template_status_update", "value": {}, "webhook": {}},
+        ]
+
+        process_buffered_template_webhooks("waba-1")
+
+        self.mock_tracker.record_webhook.assert_called_once_with("waba-1", True)
+
+    def test_empty_buffer(self):
+        self.mock_buffer.claim.return_value = []
+
+        process_buffered_template_webhooks("waba-1")
+
+        self.mock_tracker.record_webhook.assert_not_called()
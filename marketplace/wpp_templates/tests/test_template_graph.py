@@ -0,0 +1,168 @@
+import uuid
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+
+from marketplace.applications.models import App
+from marketplace.wpp_templates.models import (
+    TemplateMessage,
+    TemplateTranslation,
+    TemplateButton,
+    TemplateHeader,
+)
+from marketplace.wpp_templates.template_graph import TemplateGraph
+
+User = get_user_model()
+
+
+def graph_template(
+    template_id="1001",
+    name="welcome",
+    language="pt_BR",
+    status="APPROVED",
+    body="Hello",
+    buttons=None,
+):
+    return {
+        "id": template_id,
+        "name": name,
+        "language": language,
+        "status": status,
+        "category": "UTILITY",
+        "components": [
+            {"type": "HEADER", "format": "TEXT", "text": "Header"},
+            {"type": "BODY", "text": body},
+            {"type": "FOOTER", "text": "Footer"},
+            {
+                "type": "BUTTONS",
+                "buttons": buttons
+                or [{"type": "URL", "text": "Open", "url": "https://weni.ai"}],
+            },
+        ],
+    }
+
+
+class TemplateGraphTestCase(TestCase):
+    def setUp(self):
+        self.app = App.objects.create(
+            config=dict(wa_waba_id="432321321"),
+            project_uuid=uuid.uuid4(),
+            platform=App.PLATFORM_WENI_FLOWS,
+            code="wpp-cloud",
+            created_by=User.objects.get_admin_user(),
+        )
+
+    def sync(self, templates):
+        graph = TemplateGraph(self.app)
+        for template in templates:
+            graph.update(template)
+        graph.save()
+        return graph
+
+    def test_creates_template_graph(self):
+        self.sync(
+            [
+                graph_template(),
+                graph_template(template_id="1002", language="en_US"),
+            ]
+        )
+
+        template = TemplateMessage.objects.get(app=self.app)
+        self.assertEqual(template.name, "welcome")
+        self.assertEqual(template.category, "UTILITY")
+        self.assertEqual(
+            set(template.translations.values_list("language", "message_template_id")),
+            {("pt_BR", "1001"), ("en_US", "1002")},
+        )
+
+        translation = template.translations.get(language="pt_BR")
+        self.assertEqual(translation.body, "Hello")
+        self.assertEqual(translation.footer, "Footer")
+        self.assertEqual(translation.status, "APPROVED")
+        self.assertEqual(translation.headers.get().text, "Header")
+        self.assertEqual(translation.buttons.get().url, "https://weni.ai")
+
+    def test_sync_without_changes_does_not_write(self):
+        self.sync([graph_template()])
+
+        graph = TemplateGraph(self.app)
+        graph.update(graph_template())
+
+        self.assertFalse(graph.has_changes)
+        with self.assertNumQueries(0):
+            graph.save()
+
+    def test_updates_only_changed_rows(self):
+        self.sync([graph_template()])
+
+        graph = TemplateGraph(self.app)
+        graph.update(graph_template(status="REJECTED", body="Hi"))
+
+        self.assertEqual(len(graph.changed_translations), 1)
+        self.assertFalse(graph.changed_templates)
+        self.assertFalse(graph.changed_headers)
+        graph.save()
+
+        translation = TemplateTranslation.objects.get(template__app=self.app)
+        self.assertEqual(translation.status, "REJECTED")
+        self.assertEqual(translation.body, "Hi")
+        self.assertEqual(TemplateHeader.objects.count(), 1)
+        self.assertEqual(TemplateButton.objects.count(), 1)
+
+    def test_translation_is_found_by_message_template_id(self):
+        self.sync([graph_template()])
+
+        self.sync([graph_template(name="renamed")])
+
+        self.assertEqual(TemplateMessage.objects.get(app=self.app).name, "welcome")
+        self.assertEqual(TemplateTranslation.objects.count(), 1)
+
+    def test_new_buttons_are_added(self):
+        self.sync([graph_template()])
+
+        self.sync(
+            [
+                graph_template(
+                    buttons=[
+                        {"type": "URL", "text": "Open", "url": "https://weni.ai"},
+                        {"type": "QUICK_REPLY", "text": "Yes"},
+                    ]
+                )
+            ]
+        )
+
+        self.assertEqual(
+            set(TemplateButton.objects.values_list("button_type", "text")),
+            {("URL", "Open"), ("QUICK_REPLY", "Yes")},
+        )
+
+    def test_load_uses_constant_number_of_queries(self):
+        self.sync(
+            [
+                graph_template(template_id=str(index), name=f"template_{index}")
+                for index in range(20)
+            ]
+        )
+
+        with self.assertNumQueries(4):
+            TemplateGraph(self.app)
+
+    def test_invalid_template_is_refused_without_changing_the_graph(self):
+        invalid = graph_template(template_id="1002", name="invalid")
+        invalid["components"][2]["text"] = "x" * 61
+        without_category = graph_template(template_id="1003", name="no_category")
+        without_category["category"] = None
+
+        graph = TemplateGraph(self.app)
+        for template in [invalid, without_category]:
+            with self.assertRaises(ValueError):
+                graph.update(template)
+
+        self.assertFalse(graph.has_changes)
+
+        graph.update(graph_template())
+        graph.save()
+
+        self.assertEqual(
+            list(TemplateMessage.objects.values_list("name", flat=True)), ["welcome"]
+        )
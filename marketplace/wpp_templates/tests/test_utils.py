@@ -1,6 +1,9 @@
+import uuid
+
 from unittest.mock import patch, MagicMock
 from datetime import datetime
 
+from django.contrib.auth import get_user_model
 from django.test import TestCase
 from django.db.models.query import QuerySet
 
@@ -8,17 +11,27 @@ from marketplace.wpp_templates.utils import WebhookEventProcessor
 from marketplace.wpp_templates.utils import extract_template_data
 from marketplace.wpp_templates.utils import handle_error_and_update_config
 from marketplace.applications.models import App
+from marketplace.wpp_templates.models import TemplateTranslation
+from marketplace.wpp_templates.template_graph import TemplateGraph
+from marketplace.wpp_templates.tests.test_template_graph import graph_template
+
+User = get_user_model()
 
 
 class TestWebhookEventProcessor(TestCase):
+    @patch(
+        "marketplace.applications.meta_index.AppsByWabaCache.get_app_ids",
+        return_value=[],
+    )
     @patch("marketplace.applications.models.App.objects.filter")
-    def test_process_template_status_update_no_apps(self, mock_filter):
+    def test_process_template_status_update_no_apps(self, mock_filter, mock_app_ids):
         mock_query_set = MagicMock(spec=QuerySet)
         mock_query_set.exists.return_value = False
         mock_filter.return_value = mock_query_set
 
         WebhookEventProcessor.process_template_status_update("123", {}, {})
-        mock_filter.assert_called_once_with(config__wa_waba_id="123")
+        mock_app_ids.assert_called_once_with("123")
+        mock_filter.assert_called_once_with(id__in=[])
 
     @patch(
         "marketplace.services.flows.service.FlowsService.update_facebook_templates_webhook"
@@ -350,3 +363,84 @@ class TestHandleErrorAndUpdateConfig(TestCase):
 
         self.assertEqual(self.app.config, {})
         mock_save.assert_not_called()
+
+
+class TestProcessTemplateStatusUpdates(TestCase):
+    def setUp(self):
+        self.app = App.objects.create(
+            config=dict(wa_waba_id="waba-1"),
+            project_uuid=uuid.uuid4(),
+            platform=App.PLATFORM_WENI_FLOWS,
+            code="wpp-cloud",
+            created_by=User.objects.get_admin_user(),
+        )
+        graph = TemplateGraph(self.app)
+        graph.update(graph_template(template_id="1", status="PENDING"))
+        graph.update(graph_template(template_id="2", language="en_US"))
+        graph.save()
+
+        flows_patcher = patch(
+            "marketplace.wpp_templates.utils.FlowsService.update_facebook_templates_webhook"
+        )
+        self.mock_flows = flows_patcher.start()
+        self.addCleanup(flows_patcher.stop)
+
+        app_ids_patcher = patch(
+            "marketplace.applications.meta_index.AppsByWabaCache.get_app_ids",
+            return_value=[self.app.id],
+        )
+        app_ids_patcher.start()
+        self.addCleanup(app_ids_patcher.stop)
+
+    def event(self, status, template_id="1", language="pt_BR", name="welcome"):
+        return (
+            {
+                "event": status,
+                "message_template_name": name,
+                "message_template_language": language,
+                "message_template_id": template_id,
+            },
+            {"webhook": status},
+        )
+
+    def test_only_latest_status_of_each_translation_is_applied(self):
+        missing = WebhookEventProcessor.process_template_status_updates(
+            "waba-1",
+            [
+                self.event("APPROVED"),
+                self.event("REJECTED"),
+                self.event("APPROVED", template_id="2", language="en_US"),
+                self.event("APPROVED", template_id="3", name="unknown"),
+            ],
+        )
+
+        self.assertEqual(
+            dict(
+                TemplateTranslation.objects.values_list("message_template_id", "status")
+            ),
+            {"1": "REJECTED", "2": "APPROVED"},
+        )
+        self.assertEqual([value["message_template_id"] for value in missing], ["3"])
+        self.mock_flows.assert_called_once()
+        self.assertEqual(
+            self.mock_flows.call_args.kwargs["webhook"], {"webhook": "REJECTED"}
+        )
+        self.assertEqual(self.mock_flows.call_args.kwargs["template_name"], "welcome")
+
+    def test_queries_do_not_grow_with_events(self):
+        events = [self.event("APPROVED"), self.event("REJECTED")] * 20
+
+        with self.assertNumQueries(5):
+            WebhookEventProcessor.process_template_status_updates("waba-1", events)
+
+    def test_no_apps_linked_to_waba(self):
+        with patch(
+            "marketplace.applications.meta_index.AppsByWabaCache.get_app_ids",
+            return_value=[],
+        ):
+            result = WebhookEventProcessor.process_template_status_updates(
+                "waba-2", [self.event("APPROVED")]
+            )
+
+        self.assertIsNone(result)
+        self.mock_flows.assert_not_called()
@@ -0,0 +1,75 @@
+import json
+
+from unittest.mock import MagicMock
+
+from django.test import SimpleTestCase
+
+from marketplace.wpp_templates.webhook_buffer import TemplateWebhookBuffer
+
+
+def webhook(*waba_ids):
+    return {
+        "entry": [
+            {
+                "id": waba_id,
+                "changes": [
+                    {
+                        "field": "message_template_status_update",
+                        "value": {"event": "APPROVED"},
+                    }
+                ],
+            }
+            for waba_id in waba_ids
+        ]
+    }
+
+
+class TemplateWebhookBufferTestCase(SimpleTestCase):
+    def setUp(self):
+        self.redis = MagicMock()
+        self.pipeline = self.redis.pipeline.return_value
+        self.buffer = TemplateWebhookBuffer(redis=self.redis, window=5)
+
+    def test_add_schedules_only_wabas_without_pending_batch(self):
+        self.redis.set.side_effect = [True, False]
+
+        to_schedule = self.buffer.add(webhook("waba-1", "waba-2"))
+
+        self.assertEqual(to_schedule, ["waba-1"])
+        self.assertEqual(self.pipeline.lpush.call_count, 2)
+        key, event = self.pipeline.lpush.call_args_list[0].args
+        self.assertEqual(key, "template-webhooks:waba-1")
+        self.assertEqual(json.loads(event)["field"], "message_template_status_update")
+        self.redis.set.assert_any_call(
+            "template-webhooks-scheduled:waba-1", "scheduled", nx=True, ex=60
+        )
+
+    def test_entries_without_changes_are_ignored(self):
+        self.assertEqual(self.buffer.add({"entry": [{"id": "waba-1"}]}), [])
+        self.redis.set.assert_not_called()
+
+    def test_claim_moves_events_to_processing_list(self):
+        old = {"field": "template_category_update", "value": {}, "webhook": {}}
+        new = {"field": "message_template_status_update", "value": {}, "webhook": {}}
+        self.redis.llen.return_value = 1
+        self.pipeline.execute.return_value = [
+            b"event",
+            True,
+            [json.dumps(new).encode(), json.dumps(old).encode()],
+        ]
+
+        events = self.buffer.claim("waba-1")
+
+        self.assertEqual(events, [old, new])
+        self.redis.delete.assert_called_once_with("template-webhooks-scheduled:waba-1")
+        self.pipeline.rpoplpush.assert_called_once_with(
+            "template-webhooks:waba-1", "template-webhooks-processing:waba-1"
+        )
+        self.pipeline.lrange.assert_called_once_with(
+            "template-webhooks-processing:waba-1", 0, -1
+        )
+
+    def test_ack_removes_processing_list(self):
+        self.buffer.ack("waba-1")
+
+        self.redis.delete.assert_called_once_with("template-webhooks-processing:waba-1")
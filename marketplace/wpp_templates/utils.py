@@ -1,13 +1,14 @@
 import logging
 import ast
 
+from collections import defaultdict
 from datetime import datetime
 
 from marketplace.applications.models import App
 from marketplace.clients.flows.client import FlowsClient
 from marketplace.services.flows.service import FlowsService
 
-from .models import TemplateMessage
+from .models import TemplateMessage, TemplateTranslation
 
 
 logger = logging.getLogger(__name__)
@@ -16,22 +17,27 @@ logger = logging.getLogger(__name__)
 class WebhookEventProcessor:
     @staticmethod
     def get_apps_by_waba_id(whatsapp_business_account_id):
-        return App.objects.filter(config__wa_waba_id=whatsapp_business_account_id)
+        return App.get_apps_by_waba_id(whatsapp_business_account_id)
 
     @staticmethod
     def process_template_status_update(whatsapp_business_account_id, value, webhook):
+        """
+        Updates the status of the template in the apps linked to the WABA.
+        Returns whether the template was found, or None when no app is linked.
+        """
         apps = WebhookEventProcessor.get_apps_by_waba_id(whatsapp_business_account_id)
         if not apps.exists():
             logger.info(
                 f"There are no applications linked to waba: {whatsapp_business_account_id}"
             )
-            return
+            return None
 
         status = value.get("event")
         template_name = value.get("message_template_name")
         template_language = value.get("message_template_language")
         message_template_id = value.get("message_template_id")
 
+        found = False
         for app in apps:
             try:
                 template = TemplateMessage.objects.filter(
@@ -39,6 +45,7 @@ class WebhookEventProcessor:
                 ).first()
 
                 if template:
+                    found = True
                     # Process template status update
                     translations = template.translations.filter(
                         language=template_language,
@@ -84,10 +91,102 @@ class WebhookEventProcessor:
                     f"Unexpected error processing template status update by webhook for App {str(app.uuid)}: {e}"
                 )
 
+        return found
+
+    @staticmethod
+    def process_template_status_updates(whatsapp_business_account_id, events):
+        """
+        Applies a batch of status updates received for the WABA, given as
+        (value, webhook) pairs. Apps are resolved once, only the latest event of
+        each translation is applied, translations are updated with one query
+        and Flows is notified once per changed translation.
+        Returns the values whose template is not stored, or None when no app
+        is linked to the WABA.
+        """
+        latest_events = {}
+        for value, webhook in events:
+            key = (
+                value.get("message_template_name"),
+                value.get("message_template_language"),
+                str(value.get("message_template_id")),
+            )
+            latest_events[key] = (value, webhook)
+
+        apps = list(
+            WebhookEventProcessor.get_apps_by_waba_id(whatsapp_business_account_id)
+        )
+        if not apps:
+            logger.info(
+                f"There are no applications linked to waba: {whatsapp_business_account_id}"
+            )
+            return None
+
+        translations = defaultdict(list)
+        for translation in (
+            TemplateTranslation.objects.filter(
+                template__app__in=apps,
+                template__name__in={key[0] for key in latest_events},
+                message_template_id__in={key[2] for key in latest_events},
+            )
+            .select_related("template__app")
+            .prefetch_related("headers", "buttons")
+        ):
+            key = (
+                translation.template.name,
+                translation.language,
+                translation.message_template_id,
+            )
+            translations[key].append(translation)
+
+        missing = []
+        changed = []
+        for key, (value, webhook) in latest_events.items():
+            if key not in translations:
+                missing.append(value)
+                continue
+
+            status = value.get("event")
+            for translation in translations[key]:
+                if translation.status == status:
+                    logger.info(
+                        f"The template status: {status} is already updated for this App: "
+                        f"{str(translation.template.app.uuid)}"
+                    )
+                    continue
+
+                translation.status = status
+                changed.append((translation, webhook))
+
+        TemplateTranslation.objects.bulk_update(
+            [translation for translation, _ in changed], ["status"]
+        )
+
+        flows_service = FlowsService(FlowsClient())
+        for translation, webhook in changed:
+            template = translation.template
+            try:
+                flows_service.update_facebook_templates_webhook(
+                    flow_object_uuid=str(template.app.flow_object_uuid),
+                    webhook=webhook,
+                    template_data=extract_template_data(translation),
+                    template_name=template.name,
+                )
+            except Exception as e:
+                logger.error(
+                    f"Fail to sends template update: {template.name}, translation: {translation.language},"
+                    f"translation ID: {translation.message_template_id}. Error: {e}"
+                )
+
+        logger.info(
+            f"Applied {len(changed)} template status updates from {len(events)} events "
+            f"for waba: {whatsapp_business_account_id}"
+        )
+        return missing
+
     @staticmethod
     def process_event(whatsapp_business_account_id, value, event_type, webhook):
         if event_type == "message_template_status_update":
-            WebhookEventProcessor.process_template_status_update(
+            return WebhookEventProcessor.process_template_status_update(
                 whatsapp_business_account_id, value, webhook
             )
         elif event_type == "template_category_update":
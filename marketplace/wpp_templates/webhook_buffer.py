@@ -0,0 +1,97 @@
+import json
+
+from typing import List
+
+from django.conf import settings
+from django_redis import get_redis_connection
+
+
+class TemplateWebhookBuffer:
+    """
+    Buffers the changes of Meta template webhooks per WABA in Redis, so the
+    events received for a WABA during a short window are processed together.
+
+    `add` returns the WABAs that had no pending batch, for which the caller
+    must schedule `process_buffered_template_webhooks` after `window` seconds.
+
+    Lists keep the newest event at the head. `claim` moves the events to a
+    processing list, which `ack` removes once they are processed, so the
+    events of a failed batch are processed again with the next one.
+    """
+
+    EVENTS_KEY = "template-webhooks:{waba_id}"
+    PROCESSING_KEY = "template-webhooks-processing:{waba_id}"
+    SCHEDULED_KEY = "template-webhooks-scheduled:{waba_id}"
+
+    # Events left behind by a lost batch are discarded after this many seconds
+    events_ttl = 24 * 60 * 60
+
+    def __init__(self, redis=None, window: int = None):
+        self.redis = redis or get_redis_connection()
+        self.window = (
+            window if window is not None else settings.TEMPLATE_WEBHOOKS_BUFFER_WINDOW
+        )
+
+    def add(self, webhook_data: dict) -> List[str]:
+        to_schedule = []
+        for entry in webhook_data.get("entry", []):
+            waba_id = entry.get("id")
+            changes = entry.get("changes", [])
+            if not (waba_id and changes):
+                continue
+
+            events_key = self.EVENTS_KEY.format(waba_id=waba_id)
+            pipeline = self.redis.pipeline()
+            for change in changes:
+                pipeline.lpush(
+                    events_key,
+                    json.dumps(
+                        {
+                            "field": change.get("field"),
+                            "value": change.get("value"),
+                            "webhook": webhook_data,
+                        }
+                    ),
+                )
+            pipeline.expire(events_key, self.events_ttl)
+            pipeline.execute()
+
+            # The key outlives the window, so a batch is not scheduled twice
+            # while the scheduled one waits for a worker
+            if self.redis.set(
+                self.SCHEDULED_KEY.format(waba_id=waba_id),
+                "scheduled",
+                nx=True,
+                ex=max(self.window * 10, 60),
+            ):
+                to_schedule.append(waba_id)
+
+        return to_schedule
+
+    def claim(self, waba_id: str) -> List[dict]:
+        """
+        Moves the events buffered for the WABA to its processing list and
+        returns the events in it, oldest first.
+        """
+        # Released first, so events that arrive from now on schedule a new batch
+        self.unschedule(waba_id)
+
+        events_key = self.EVENTS_KEY.format(waba_id=waba_id)
+        processing_key = self.PROCESSING_KEY.format(waba_id=waba_id)
+        pipeline = self.redis.pipeline(transaction=True)
+        for _ in range(self.redis.llen(events_key)):
+            # The oldest event is moved to the head of the processing list,
+            # so events left by a failed batch stay behind the new ones
+            pipeline.rpoplpush(events_key, processing_key)
+        pipeline.expire(processing_key, self.events_ttl)
+        pipeline.lrange(processing_key, 0, -1)
+        events = pipeline.execute()[-1]
+
+        return [json.loads(event) for event in reversed(events)]
+
+    def ack(self, waba_id: str):
+        """Removes the events claimed for the WABA, once they are processed."""
+        self.redis.delete(self.PROCESSING_KEY.format(waba_id=waba_id))
+
+    def unschedule(self, waba_id: str):
+        self.redis.delete(self.SCHEDULED_KEY.format(waba_id=waba_id))